@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark comparing Board.clone() with copy.deepcopy(board)
+for py-four-in-a-row.
+
+Usage:
+    python -m benchmarks.bench_board_clone [--number N]
+"""
+import argparse
+import copy
+import timeit
+from engines.ai_player_random import AiPlayerRandom
+from modules.bitboard import BitBoard
+from modules.board import Board
+
+MIDGAME_MOVES = [3, 3, 2, 4, 2, 2, 4, 1, 5, 3, 6, 0]
+
+
+def make_board(board_class):
+    """Create a midgame board with players attached.
+
+    Args:
+        board_class (type): Board implementation to create.
+    Returns:
+        Board: The board holding a fixed midgame position.
+    """
+    players = [AiPlayerRandom(name="Bench 1", symbol="X", player_id=1),
+               AiPlayerRandom(name="Bench 2", symbol="O", player_id=2)]
+    board = board_class(players=players)
+    for move in MIDGAME_MOVES:
+        board.play_move(move)
+    return board
+
+
+def run(number=20000) -> dict:
+    """Time clone() and deepcopy for each board implementation.
+
+    Args:
+        number (int): Number of copies timed per variant.
+    Returns:
+        dict: Microseconds per copy, keyed by variant name.
+    """
+    results = {}
+    for board_class in (Board, BitBoard):
+        board = make_board(board_class)
+        variants = {
+            "deepcopy": lambda b=board: copy.deepcopy(b),
+            "clone": lambda b=board: b.clone(),
+            "clone(history_limit=0)": lambda b=board: b.clone(0),
+        }
+        for name, func in variants.items():
+            seconds = timeit.timeit(func, number=number)
+            results[f"{board_class.__name__}.{name}"] = \
+                seconds / number * 1e6
+    return results
+
+
+def main() -> int:
+    """Run the microbenchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000,
+                        help="number of copies timed per variant")
+    args = parser.parse_args()
+    results = run(args.number)
+    for name, usec in results.items():
+        print(f"{name:<36} {usec:8.2f} us/copy")
+    for board_class in (Board, BitBoard):
+        prefix = board_class.__name__
+        speedup = results[f"{prefix}.deepcopy"] / results[f"{prefix}.clone"]
+        print(f"{prefix}: clone() is {speedup:.1f}x faster than deepcopy")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
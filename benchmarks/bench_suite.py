@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite for board operations and MCTS throughput
+of py-four-in-a-row.
+
+All metrics are measured on fixed, seeded positions. Results are
+written as JSON and can be compared against a saved baseline; the
+suite exits with status 1 if a metric regresses past the threshold.
+
+Usage:
+    python -m benchmarks.bench_suite [--scale X] [--output FILE]
+        [--baseline FILE] [--threshold FRACTION]
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from engines.ai_player_uct_mcts import AiPlayerUctMcts
+from engines.batch_rollout import BatchRollout, np
+from engines.rollout_policies import (HeuristicRollout, RandomRollout,
+                                      ThreatRollout)
+from modules.bitboard import BitBoard
+from modules.board import Board
+
+SEED = 20251018
+BOARD_CLASSES = (Board, BitBoard)
+ROLLOUT_POLICIES = (RandomRollout(), HeuristicRollout(), ThreatRollout())
+
+# Metrics where a smaller value is better; all others are rates
+LOWER_IS_BETTER = frozenset(["mcts.peak_memory_kib"])
+
+
+def make_positions(board_class, count=32, seed=SEED) -> list:
+    """Create fixed positions by seeded random play.
+
+    The positions are spread over the opening and middlegame. None
+    of them is decided or has an immediate win for the player to move,
+    so searches and rollouts from them do not end at once.
+
+    Args:
+        board_class (type): Board implementation to create.
+        count (int): Number of positions.
+        seed (int): Seed of the random games.
+    Returns:
+        list[Board]: The positions.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = board_class()
+        for _ in range(rng.randrange(4, 24)):
+            board.play_move(rng.choice(board.get_legal_moves()))
+            if board.is_game_over():
+                break
+        if not board.is_game_over() and \
+                not _has_immediate_win(board):
+            positions.append(board)
+    return positions
+
+
+def _has_immediate_win(board) -> bool:
+    """Check whether the player to move can win at once.
+
+    Args:
+        board (Board): The position to check.
+    Returns:
+        bool: True if a legal move wins the game.
+    """
+    for move in board.get_legal_moves():
+        board.play_move(move)
+        won = board.get_winner() != 0
+        board.undo_move()
+        if won:
+            return True
+    return False
+
+
+def _rate(func, operations, repeat=5) -> float:
+    """Measure the best rate of a function over several runs.
+
+    Args:
+        func (callable): Runs the benchmarked operations once.
+        operations (int): Number of operations performed by one call.
+        repeat (int): Number of timed runs.
+    Returns:
+        float: Operations per second of the fastest run.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return operations / best
+
+
+def bench_board(board_class, scale=1.0) -> dict:
+    """Measure the rates of the basic board operations.
+
+    Args:
+        board_class (type): Board implementation to measure.
+        scale (float): Multiplier of the number of operations.
+    Returns:
+        dict: Operations per second keyed by metric name.
+    """
+    positions = make_positions(board_class)
+    rounds = max(1, int(200 * scale))
+    # Queries are much cheaper than moves, time more of them
+    query_rounds = 10 * rounds
+    prefix = board_class.__name__
+
+    def play_undo():
+        for _ in range(rounds):
+            for board in positions:
+                for move in board.get_legal_moves():
+                    board.play_move(move)
+                    board.undo_move()
+
+    def legal_moves():
+        for _ in range(query_rounds):
+            for board in positions:
+                board.get_legal_moves()
+
+    def check_winner():
+        for _ in range(query_rounds):
+            for board in positions:
+                board.check_winner()
+
+    play_undo_ops = rounds * sum(len(board.get_legal_moves())
+                                 for board in positions)
+    return {
+        f"{prefix}.play_undo_per_sec": _rate(play_undo, play_undo_ops),
+        f"{prefix}.get_legal_moves_per_sec":
+            _rate(legal_moves, query_rounds * len(positions)),
+        f"{prefix}.check_winner_per_sec":
+            _rate(check_winner, query_rounds * len(positions)),
+    }
+
+
+def bench_rollouts(scale=1.0) -> dict:
+    """Measure the rollout rate of each rollout policy.
+
+    With NumPy installed, the playout rate of BatchRollout is measured
+    as well.
+
+    Args:
+        scale (float): Multiplier of the number of rollouts.
+    Returns:
+        dict: Rollouts per second keyed by metric name.
+    """
+    positions = make_positions(BitBoard)
+    rounds = max(1, int(5 * scale))
+    results = {}
+    for policy in ROLLOUT_POLICIES:
+        rng = random.Random(SEED)
+
+        def rollouts(policy=policy, rng=rng):
+            for _ in range(rounds):
+                for board in positions:
+                    plies = policy.rollout(board, rng)
+                    for _ in range(plies):
+                        board.undo_move()
+
+        results[f"rollouts.{type(policy).__name__}_per_sec"] = \
+            _rate(rollouts, rounds * len(positions))
+    if np is not None:
+        batch = BatchRollout()
+        rng = random.Random(SEED)
+
+        def batch_rollouts():
+            for _ in range(rounds):
+                for board in positions:
+                    batch.run(board, rng)
+
+        results["rollouts.BatchRollout_per_sec"] = _rate(
+            batch_rollouts, rounds * len(positions) * batch.playouts_)
+    return results
+
+
+def bench_get_move(scale=1.0) -> dict:
+    """Measure the simulation rate and peak memory of the MCTS search.
+
+    The search of get_move is run without early stopping, so every
+    run performs exactly the requested number of simulations.
+
+    Args:
+        scale (float): Multiplier of the number of simulations.
+    Returns:
+        dict: Simulations per second and peak memory in KiB.
+    """
+    simulations = max(1, int(1000 * scale))
+    board = make_positions(Board, count=1)[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        player = AiPlayerUctMcts(simulations=simulations,
+                                 player_id=board.get_current_player(),
+                                 reuse_tree=False)
+
+    def search():
+        # pylint: disable=protected-access
+        player._search_stats(board.clone(history_limit=0), simulations,
+                             random.Random(SEED))
+
+    rate = _rate(search, simulations)
+    tracemalloc.start()
+    try:
+        search()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"mcts.simulations_per_sec": rate,
+            "mcts.peak_memory_kib": peak / 1024}
+
+
+def run(scale=1.0) -> dict:
+    """Run the whole suite.
+
+    Args:
+        scale (float): Multiplier of the amount of work per benchmark.
+    Returns:
+        dict: Result document with "metrics" and "environment".
+    """
+    metrics = {}
+    for board_class in BOARD_CLASSES:
+        metrics.update(bench_board(board_class, scale))
+    metrics.update(bench_rollouts(scale))
+    metrics.update(bench_get_move(scale))
+    return {
+        "metrics": metrics,
+        "environment": {"python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "scale": scale},
+    }
+
+
+def compare(results, baseline, threshold=0.25) -> list:
+    """Compare results against a baseline.
+
+    Metrics missing from either document are ignored.
+
+    Args:
+        results (dict): Result document of the current run.
+        baseline (dict): Result document of the baseline run.
+        threshold (float): Tolerated relative regression, e.g. 0.25.
+    Returns:
+        list[str]: A message per regressed metric, empty if none.
+    """
+    regressions = []
+    for name, base in baseline["metrics"].items():
+        value = results["metrics"].get(name)
+        if value is None or base <= 0:
+            continue
+        change = (value - base) / base
+        if name in LOWER_IS_BETTER:
+            change = -change
+        if change < -threshold:
+            regressions.append(f"{name}: {value:.1f} vs baseline "
+                               f"{base:.1f} ({-change:.1%} worse)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Run the suite, save and compare the results.
+
+    Returns:
+        int: 0 if no metric regressed, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark board operations and MCTS throughput.")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiplier of the work per benchmark")
+    parser.add_argument("--output", default=None,
+                        help="write the results as JSON to this file")
+    parser.add_argument("--baseline", default=None,
+                        help="compare against this JSON result file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="tolerated relative regression (default 0.25)")
+    args = parser.parse_args(argv)
+    results = run(args.scale)
+    for name, value in results["metrics"].items():
+        print(f"{name:<36} {value:14.1f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
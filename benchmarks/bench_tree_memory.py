@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memory benchmark comparing the Node tree with the array-backed
+TreeStore of py-four-in-a-row.
+
+Usage:
+    python -m benchmarks.bench_tree_memory [--sizes N [N ...]]
+"""
+import argparse
+import gc
+import tracemalloc
+from engines.ai_player_uct_mcts import Node
+from engines.mcts_tree import NO_NODE, TreeStore
+
+COLS = 7
+
+
+class _Position:
+    """Stand-in position offering all columns as legal moves."""
+
+    def get_legal_moves(self):
+        """Get a list of all legal moves."""
+        return list(range(COLS))
+
+    def is_game_over(self):
+        """Check if the game is over."""
+        return False
+
+
+def build_nodes(size):
+    """Build a tree of Node objects, filling it level by level.
+
+    Args:
+        size (int): Number of nodes.
+    Returns:
+        Node: The root node.
+    """
+    position = _Position()
+    nodes = [Node(position)]
+    for index in range(1, size):
+        parent = nodes[(index - 1) // COLS]
+        nodes.append(parent.add_child((index - 1) % COLS, position))
+    return nodes[0]
+
+
+def build_store(size):
+    """Build a TreeStore of the same shape as build_nodes.
+
+    Args:
+        size (int): Number of nodes.
+    Returns:
+        TreeStore: The tree store.
+    """
+    legal_moves = list(range(COLS))
+    tree = TreeStore()
+    tree.add_node(NO_NODE, -1, legal_moves)
+    for index in range(1, size):
+        tree.add_node((index - 1) // COLS, (index - 1) % COLS, legal_moves)
+    return tree
+
+
+def measure(build, size) -> float:
+    """Measure the memory held by a tree.
+
+    Args:
+        build (callable): Builds a tree of the given size.
+        size (int): Number of nodes.
+    Returns:
+        float: Traced bytes per node while the tree is alive.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tree = build(size)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del tree
+    return current / size
+
+
+def run(sizes=(10 ** 5, 10 ** 6)) -> dict:
+    """Measure both tree implementations at each size.
+
+    Args:
+        sizes (tuple[int]): Numbers of nodes.
+    Returns:
+        dict: Bytes per node keyed by variant name.
+    """
+    results = {}
+    for size in sizes:
+        results[f"Node.{size}"] = measure(build_nodes, size)
+        results[f"TreeStore.{size}"] = measure(build_store, size)
+    return results
+
+
+def main() -> int:
+    """Run the memory benchmark and print the results."""
+    parser = argparse.ArgumentParser(
+        description="Compare the memory of Node trees and TreeStore.")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10 ** 5, 10 ** 6],
+                        help="numbers of nodes to build")
+    args = parser.parse_args()
+    results = run(args.sizes)
+    for name, per_node in results.items():
+        print(f"{name:<20} {per_node:8.1f} bytes/node")
+    for size in args.sizes:
+        ratio = results[f"Node.{size}"] / results[f"TreeStore.{size}"]
+        print(f"{size} nodes: TreeStore uses {ratio:.1f}x less memory")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ai Player for py-four-in-a-row: A Python implementation of
+the classic Four in a Row game.
+This player plays from an opening book while the position is in the
+book, and asks another engine for its moves afterwards.
+"""
+from engines.abstract_player import AbstractPlayer
+from modules.opening_book import OpeningBook
+
+
+class AiPlayerBook(AbstractPlayer):
+    """AI Player consulting an opening book before its engine."""
+
+    def __init__(self, engine, book_path, name=None, symbol="X",
+                 player_id: int = 1):
+        """Initialize the book player.
+        Args:
+            engine (AbstractPlayer): The player searching positions which
+                are not in the book.
+            book_path (str): Path of the opening book file, see
+                modules.opening_book.
+            name (str): Name of the player. None uses the engine's name.
+            symbol (str): Symbol representing the player on the board.
+            player_id (int): The ID assigned to this player.
+        """
+        self.engine_ = engine
+        self.book_path_ = book_path
+        self.book_ = None
+        self.last_entry_ = None
+        super().__init__(name or engine.name_, symbol, player_id=player_id)
+
+    def __getstate__(self):
+        """Return the state for pickling, without the mapped book."""
+        state = self.__dict__.copy()
+        state["book_"] = None
+        return state
+
+    def set_player_id(self, player_id: int):
+        """Set the player ID for this player and its engine.
+        Args:
+            player_id (int): The ID assigned to this player.
+        """
+        super().set_player_id(player_id)
+        self.engine_.set_player_id(player_id)
+
+    def get_move(self, board) -> int:
+        """Play the book move, or the engine's move if out of book.
+        Args:
+            board (Board): The current game board.
+        Returns:
+            int: The selected column index for the move.
+        """
+        if self.book_ is None:
+            self.book_ = OpeningBook(self.book_path_)
+        entry = self.book_.lookup(board)
+        if entry is not None and board.is_legal_move(entry[0]):
+            self.last_entry_ = entry
+            return entry[0]
+        self.last_entry_ = None
+        return self.engine_.get_move(board)
+
+    def get_most_likely_variant(self) -> list[int]:
+        """Return the book move, or the engine's variant if out of book.
+        Returns:
+            List[int]: The sequence of moves representing the most
+            likely variant.
+        """
+        if self.last_entry_ is not None:
+            return [self.last_entry_[0]]
+        return self.engine_.get_most_likely_variant()
+
+    def get_likelihood_for_win(self) -> float:
+        """Return the likelihood of winning from the current position.
+        Returns:
+            float: Likelihood of winning (0.0 to 1.0). For book moves
+            1.0 if the book score is a win, 0.0 for a loss, else 0.5.
+        """
+        if self.last_entry_ is not None:
+            score = self.last_entry_[1]
+            return 1.0 if score > 0 else 0.0 if score < 0 else 0.5
+        return self.engine_.get_likelihood_for_win()
+
+    def reset(self):
+        """Reset any internal state of the player and its engine.
+
+        The book stays mapped.
+        """
+        self.last_entry_ = None
+        self.engine_.reset()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("This is the AiPlayerBook module.")
@@ -13,14 +13,17 @@ from engines.abstract_player import AbstractPlayer
 class AiPlayerRandom(AbstractPlayer):
     """AI Player using Random Choice strategy for Four in a Row."""
 
-    def __init__(self, name="Random", symbol="X", player_id: int = 1):
+    def __init__(self, name="Random", symbol="X", player_id: int = 1,
+                 seed=None):
         """Initialize the Random Choice player.
 
         Args:
             name (str): Name of the player.
             symbol (str): Symbol representing the player on the board.
             player_id (int): The ID assigned to this player.
+            seed (int): Seed for reproducible moves.
         """
+        self.rng_ = random.Random(seed)
         super().__init__(name, symbol, player_id=player_id)
 
     def get_move(self, board) -> int:
@@ -33,7 +36,7 @@ class AiPlayerRandom(AbstractPlayer):
                  -1 if no legal moves are available.
         """
         legal_moves = board.get_legal_moves()
-        return random.choice(legal_moves) if legal_moves else -1
+        return self.rng_.choice(legal_moves) if legal_moves else -1
 
     def get_most_likely_variant(self) -> list[int]:
         """Return the most likely variant of the game.
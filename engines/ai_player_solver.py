@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ai Player for py-four-in-a-row: A Python implementation of
+the classic Four in a Row game.
+This player uses an exact solver: iterative-deepening negamax with
+alpha-beta pruning, center-first move ordering and a bounded
+transposition table, within a time limit per move.
+
+Scores are given from the view of the player to move. A win scores
+the number of empty cells left after the winning move plus one, so
+faster wins score higher; a loss scores the negated value of the
+opponent's win. Zero is a draw, or a position not decided within the
+search depth.
+"""
+import sys
+import time
+from engines.abstract_player import AbstractPlayer
+from modules.bitboard import BitBoard
+from modules.transposition_table import REPLACE_PRIORITY, TranspositionTable
+
+# Bound types of transposition table entries
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time limit is reached."""
+
+
+class AiPlayerSolver(AbstractPlayer):
+    """AI Player solving Four in a Row positions by alpha-beta search."""
+
+    def __init__(self, name="Solver", symbol="X",
+                 player_id: int = 1,
+                 time_limit_ms=1000,
+                 max_depth=None,
+                 board_class=BitBoard,
+                 tt_capacity: int = 1 << 18):
+        """Initialize the solver player.
+        Args:
+            name (str): Name of the player.
+            symbol (str): Symbol representing the player on the board.
+            player_id (int): The ID assigned to this player.
+            time_limit_ms (float): Wall-clock budget per move in
+                milliseconds. The deepest completed iteration is used.
+                None means no time limit.
+            max_depth (int): Maximum search depth in plies. None searches
+                to the end of the game.
+            board_class (type): Board implementation used for the search.
+                None searches on a clone of the board as given.
+            tt_capacity (int): Maximum number of positions in the table.
+        """
+        self.time_limit_ms_ = time_limit_ms
+        self.max_depth_ = max_depth
+        self.board_class_ = board_class
+        self.tt_capacity_ = tt_capacity
+        self.table_ = None
+        self.deadline_ = None
+        self.state_ = None
+        self.order_ = []
+        self.cells_ = 0
+        self.nodes_ = 0
+        self.score_ = 0
+        self.depth_ = 0
+        self.exact_ = False
+        self.variant_ = []
+        super().__init__(name, symbol, player_id=player_id)
+
+    def get_move(self, board) -> int:
+        """Search the position and select the best move.
+        Args:
+            board (Board): The current game board.
+        Returns:
+            int: The selected column index for the move.
+        """
+        print(f"{self.name_} is thinking... ", end="")
+        sys.stdout.flush()
+        move = self.solve(board)
+        print(f"Score {self.score_} at depth {self.depth_} "
+              f"({self.nodes_} nodes)")
+        print("Done")
+        return move
+
+    def solve(self, board) -> int:
+        """Run the iterative deepening search on a position.
+
+        The search deepens one ply at a time until the position is
+        decided, the end of the game or max_depth is reached, or the
+        time runs out. The result of the deepest completed iteration
+        is kept in score_, depth_, exact_ and variant_.
+
+        Args:
+            board (Board): The game board. It is not modified.
+        Returns:
+            int: The best move, or -1 if the game is over.
+        """
+        if self.table_ is None:
+            self.table_ = TranspositionTable(
+                self.tt_capacity_, REPLACE_PRIORITY,
+                priority=lambda entry: entry[0])
+        # Deep entries of earlier moves not reached again give way
+        self.table_.new_generation()
+        if self.board_class_ is not None:
+            # The search never undoes the moves leading to the position,
+            # so it is rebuilt from its discs, whatever the history
+            state = self.board_class_.from_key(
+                board.get_key(), rows=board.rows_, cols=board.cols_,
+                connect=board.connect_,
+                current_player=board.get_current_player())
+        else:
+            state = board.clone(history_limit=0)
+        self.state_ = state
+        self.cells_ = state.rows_ * state.cols_
+        center = (state.cols_ - 1) / 2
+        self.order_ = sorted(range(state.cols_),
+                             key=lambda col: abs(col - center))
+        self.nodes_ = 0
+        self.score_ = 0
+        self.depth_ = 0
+        self.exact_ = False
+        self.variant_ = []
+        if state.is_game_over():
+            return -1
+
+        remaining = self.cells_ - state.ply_
+        max_depth = remaining if self.max_depth_ is None else \
+            min(self.max_depth_, remaining)
+        start = time.perf_counter()
+        best_move = self._ordered_moves(state, None)[0]
+        for depth in range(1, max_depth + 1):
+            # The first iteration always completes, so there is a move
+            self.deadline_ = None if depth == 1 or \
+                self.time_limit_ms_ is None else \
+                start + self.time_limit_ms_ / 1000
+            try:
+                score, move = self._search_root(depth)
+            except SearchTimeout:
+                break
+            best_move = move
+            self.score_ = score
+            self.depth_ = depth
+            # A win or loss within the depth is proven
+            self.exact_ = score != 0 or depth == remaining
+            if self.exact_:
+                break
+        self.variant_ = self._principal_variation(best_move)
+        return best_move
+
+    def _search_root(self, depth) -> tuple:
+        """Search all moves of the root position to the given depth.
+        Args:
+            depth (int): Search depth in plies.
+        Returns:
+            tuple: (score, move) of the best move.
+        """
+        state = self.state_
+        entry = self.table_.lookup(state.get_key())
+        alpha = -self.cells_
+        best_score = -self.cells_ - 1
+        best_move = -1
+        for move in self._ordered_moves(state, entry):
+            state.play_move(move)
+            try:
+                if state.get_winner():
+                    score = self.cells_ + 1 - state.ply_
+                else:
+                    score = -self._negamax(depth - 1, -self.cells_, -alpha)
+            finally:
+                state.undo_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                alpha = max(alpha, score)
+        self.table_.store(state.get_key(),
+                          (depth, best_score, EXACT, best_move))
+        return best_score, best_move
+
+    def _negamax(self, depth, alpha, beta) -> int:
+        """Score the position of the scratch board by negamax search.
+        Args:
+            depth (int): Remaining search depth in plies.
+            alpha (int): Lower bound of the search window.
+            beta (int): Upper bound of the search window.
+        Returns:
+            int: The score from the view of the player to move, exact
+                if it lies within the window, else a bound.
+        """
+        self.nodes_ += 1
+        if self.deadline_ is not None and not self.nodes_ & 1023 and \
+                time.perf_counter() >= self.deadline_:
+            raise SearchTimeout()
+        state = self.state_
+        legal_moves = state.get_legal_moves()
+        if not legal_moves:
+            return 0
+        if self._winning_move(state, legal_moves) >= 0:
+            return self.cells_ - state.ply_
+        if depth <= 1:
+            return 0
+
+        # Without an immediate win, the earliest win is two plies later
+        best_possible = self.cells_ - 1 - state.ply_ - 1
+        if beta > best_possible:
+            beta = best_possible
+            if alpha >= beta:
+                return beta
+        key = state.get_key()
+        entry = self.table_.lookup(key)
+        if entry is not None and entry[0] >= depth:
+            _, score, bound, _ = entry
+            if bound == EXACT:
+                return score
+            if bound == LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+
+        original_alpha = alpha
+        best_score = -self.cells_ - 1
+        best_move = -1
+        for move in self._ordered_moves(state, entry, legal_moves):
+            state.play_move(move)
+            try:
+                score = -self._negamax(depth - 1, -beta, -alpha)
+            finally:
+                state.undo_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        if best_score <= original_alpha:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table_.store(key, (depth, best_score, bound, best_move))
+        return best_score
+
+    @staticmethod
+    def _winning_move(state, legal_moves) -> int:
+        """Find a move winning at once.
+        Args:
+            state (Board): The game state. It is unchanged on return.
+            legal_moves (list[int]): The legal moves in the state.
+        Returns:
+            int: A winning move, or -1 if there is none.
+        """
+        for move in legal_moves:
+            state.play_move(move)
+            won = state.get_winner() != 0
+            state.undo_move()
+            if won:
+                return move
+        return -1
+
+    def _ordered_moves(self, state, entry, legal_moves=None) -> list:
+        """Order the legal moves for the search.
+
+        The best move stored for the position comes first, the other
+        moves follow from the center outwards.
+
+        Args:
+            state (Board): The game state.
+            entry (tuple): The table entry of the position, or None.
+            legal_moves (list[int]): The legal moves, if already known.
+        Returns:
+            list[int]: The legal moves in search order.
+        """
+        if legal_moves is None:
+            legal_moves = state.get_legal_moves()
+        moves = [col for col in self.order_ if col in legal_moves]
+        if entry is not None and entry[3] in moves:
+            moves.remove(entry[3])
+            moves.insert(0, entry[3])
+        return moves
+
+    def _principal_variation(self, first_move) -> list:
+        """Follow the best moves stored in the table from the root.
+        Args:
+            first_move (int): The best move of the root position.
+        Returns:
+            list[int]: The expected sequence of moves.
+        """
+        state = self.state_
+        variant = []
+        move = first_move
+        while move in state.get_legal_moves():
+            state.play_move(move)
+            variant.append(move)
+            if state.is_game_over():
+                break
+            # Immediate wins end the search without a table entry
+            move = self._winning_move(state, state.get_legal_moves())
+            if move < 0:
+                entry = self.table_.lookup(state.get_key())
+                move = -1 if entry is None else entry[3]
+        for _ in variant:
+            state.undo_move()
+        return variant
+
+    def get_most_likely_variant(self) -> list[int]:
+        """Return the principal variation of the last search.
+        Returns:
+            List[int]: The sequence of moves expected by the solver,
+            starting with its move.
+        """
+        return list(self.variant_)
+
+    def get_likelihood_for_win(self) -> float:
+        """Return the likelihood of winning from the last searched position.
+        Returns:
+            float: 1.0 for a proven win, 0.0 for a proven loss, and 0.5
+            for a draw or an undecided position.
+        """
+        if self.score_ > 0:
+            return 1.0
+        if self.score_ < 0:
+            return 0.0
+        return 0.5
+
+    def reset(self):
+        """Reset any internal state of the player.
+
+        Drops the transposition table and the result of the last search.
+        """
+        self.table_ = None
+        self.score_ = 0
+        self.depth_ = 0
+        self.exact_ = False
+        self.variant_ = []
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("This is the AiPlayerSolver module.")
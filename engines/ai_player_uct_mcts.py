@@ -6,40 +6,98 @@ the classic Four in a Row game.
 This player uses UCT MCTS (Upper Confidence Bound applied to Trees -
 Monte Carlo Tree Search) to determine its moves.
 """
-import copy
 import math
 import random
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from engines.abstract_player import AbstractPlayer
+from engines.mcts_tree import NO_NODE, TreeStore, mask_moves, moves_mask
+from engines.rollout_policies import ThreatRollout
+
+
+# Preference of proven values when choosing the move: wins first,
+# then unproven moves and draws, proven losses last
+_PROOF_RANKS = {1: 2, None: 1, 0: 1, -1: 0}
 
 
 class Node:
-    """A node in the UCT MCTS tree."""
+    """A node in the UCT MCTS tree.
+
+    A node keeps only the move leading to it and its statistics.
+    The position is reconstructed by playing the moves from the root
+    on a single scratch board, so no board copy is stored per node.
+
+    Wins are counted for the player who moved into the node, draws
+    count half. A proven node holds its game-theoretic value for that
+    player: 1 for a win, 0 for a draw, -1 for a loss.
+
+    The untried moves are kept as a bitmask of columns. It is only
+    generated when the node is first selected for expansion, so leaf
+    nodes never ask the board for its legal moves.
+    """
+
+    __slots__ = ("parent_", "move_", "children_",
+                 "visits_", "wins_", "untried_", "proven_")
 
     def __init__(self, state, parent=None, move=None):
         """Initialize the node.
         Args:
-            state (Board): The game state at this node.
+            state (Board): The game state at this node. It is only
+                inspected for the end of the game, it is not kept.
+                A terminal child node is proven at once, a root node
+                is always searched.
             parent (Node): The parent node.
             move (int): The move that led to this state.
         """
-        self.state_ = state
         self.parent_ = parent
         self.move_ = move
         self.children_ = []
         self.visits_ = 0
         self.wins_ = 0
-        self.untried_moves_ = state.get_legal_moves()
+        if parent is not None and state.is_game_over():
+            self.untried_ = 0
+            self.proven_ = 1 if state.get_winner() else 0
+        else:
+            # Generated by untried_mask on the first expansion
+            self.untried_ = None
+            self.proven_ = None
+
+    def untried_mask(self, state) -> int:
+        """Get the bitmask of the untried moves.
+
+        The mask is generated from the legal moves on the first call.
+
+        Args:
+            state (Board): The game state at this node.
+        Returns:
+            int: The mask with bit i set if column i is untried.
+        """
+        if self.untried_ is None:
+            self.untried_ = moves_mask(state.get_legal_moves())
+        return self.untried_
+
+    def untried_moves(self, state) -> list:
+        """Get the untried moves.
+        Args:
+            state (Board): The game state at this node.
+        Returns:
+            list[int]: The untried moves in ascending order.
+        """
+        return mask_moves(self.untried_mask(state))
 
     def uct_select_child(self):
         """Select a child node using the UCT formula.
 
+        Proven children are skipped, their value is known.
+
         Returns:
             Node: The selected child node.
         """
         # UCT formula: win_rate + sqrt(2 * log(parent_visits) / child_visits)
         return max(
-            self.children_,
+            (c for c in self.children_ if c.proven_ is None),
             key=lambda c: c.wins_ / c.visits_ +
             math.sqrt(2 * math.log(self.visits_) / c.visits_)
         )
@@ -53,35 +111,139 @@ class Node:
             Node: The newly created child node.
         """
         child = Node(state, parent=self, move=move)
-        self.untried_moves_.remove(move)
+        if self.untried_ is not None:
+            self.untried_ &= ~(1 << move)
         self.children_.append(child)
         return child
 
-    def update(self, result):
+    def update(self, result, visits=1):
         """Update this node's statistics.
         Args:
-            result (int): The result of the simulation (1 for win, 0 for loss).
+            result (float): The result of the simulation (1 for win,
+                0.5 for draw, 0 for loss), or the sum of the results of
+                a batch of playouts.
+            visits (int): Number of playouts the result counts.
         """
-        self.visits_ += 1
+        self.visits_ += visits
         self.wins_ += result
 
+    def update_proof(self):
+        """Derive the proven value of this node from its children.
+
+        The player to move wins if any child is a proven win for them.
+        Once all moves are expanded and proven, the node's value is the
+        negated value of the best child.
+
+        Returns:
+            bool: True if the node is proven.
+        """
+        values = [child.proven_ for child in self.children_]
+        if 1 in values:
+            self.proven_ = -1
+        elif self.untried_ == 0 and values and None not in values:
+            self.proven_ = -max(values)
+        return self.proven_ is not None
+
 
 class AiPlayerUctMcts(AbstractPlayer):
     """AI Player using UCT MCTS strategy for Four in a Row."""
 
     def __init__(self, name="UCT_MCTS", symbol="X",
                  simulations=1000,
-                 player_id: int = 1):
+                 player_id: int = 1,
+                 board_class=None,
+                 workers: int = 1,
+                 seed=None,
+                 time_limit_ms=None,
+                 reuse_tree: bool = True,
+                 rollout_policy=None,
+                 compact_tree: bool = False,
+                 batch_rollout=None,
+                 ponder: bool = False,
+                 ponder_simulations=None,
+                 ponder_time_limit_ms=None):
         """Initialize the UCT MCTS player.
         Args:
             name (str): Name of the player.
             simulations (int): Number of simulations to run per move.
+                With a time limit this is a cap, None means no cap.
+            board_class (type): Board implementation used for the search,
+                e.g. BitBoard. None searches on the board as given.
+            workers (int): Number of worker processes. With more than one
+                worker the simulations are split across independent
+                root-parallel searches whose root statistics are merged.
+            seed (int): Seed for reproducible searches. None seeds from
+                system randomness.
+            time_limit_ms (float): Wall-clock budget per move in
+                milliseconds. None means no time limit.
+            reuse_tree (bool): Keep the search tree between moves and
+                continue from the subtree of the position reached.
+                Only used by serial searches.
+            rollout_policy (RolloutPolicy): Policy playing out the games
+                in the simulation phase. None uses ThreatRollout.
+            compact_tree (bool): Keep the search tree in an array-backed
+                TreeStore instead of Node objects, for large searches.
+                The tree is not reused between moves.
+            batch_rollout (BatchRollout): Engine playing out each leaf
+                in a batch of vectorized playouts, whose win counts are
+                backpropagated at once. None plays one rollout per leaf
+                with the rollout policy.
+            ponder (bool): Keep growing the tree in a background thread
+                during the opponent's turn, from the position after the
+                selected move. Needs a serial search with tree reuse.
+            ponder_simulations (int): Maximum number of simulations per
+                pondering phase. None uses simulations, or no cap if
+                only a time limit is given.
+            ponder_time_limit_ms (float): Wall-clock budget per pondering
+                phase in milliseconds. None uses time_limit_ms, or no
+                time limit if only simulations are given.
         """
-        super().__init__(name, symbol, player_id=player_id)
+        if simulations is None and time_limit_ms is None:
+            raise ValueError("Either simulations or time_limit_ms "
+                             "must be given.")
+        if ponder and (workers > 1 or compact_tree or not reuse_tree):
+            raise ValueError("Pondering needs a serial search with "
+                             "tree reuse.")
         self.simulations_ = simulations
+        self.time_limit_ms_ = time_limit_ms
+        self.board_class_ = board_class
+        self.workers_ = workers
+        self.rng_ = random.Random(seed)
+        self.reuse_tree_ = reuse_tree
+        self.rollout_policy_ = rollout_policy or ThreatRollout()
+        self.compact_tree_ = compact_tree
+        self.batch_rollout_ = batch_rollout
+        self.ponder_ = ponder
+        self.ponder_simulations_ = ponder_simulations or simulations
+        self.ponder_time_limit_ms_ = ponder_time_limit_ms or time_limit_ms
+        self.ponder_thread_ = None
+        self.ponder_stop_ = None
+        self.executor_ = None
+        self.root_ = None
+        self.root_position_ = None
+        self.root_key_ = None
+        self.root_ply_ = None
+        self.analysis_ = None
+        super().__init__(name, symbol, player_id=player_id)
+
+    def __getstate__(self):
+        """Return the state for pickling, without worker pool, tree and
+        pondering thread."""
+        state = self.__dict__.copy()
+        state["executor_"] = None
+        state["root_"] = None
+        state["root_position_"] = None
+        state["ponder_thread_"] = None
+        state["ponder_stop_"] = None
+        return state
 
     def get_move(self, board) -> int:
         """Perform UCT MCTS to select the best move.
+
+        All simulations play and undo their moves on one scratch
+        clone of the board. With pondering, the search continues in the
+        background after the move is selected.
+
         Args:
             board (Board): The current game board.
         Returns:
@@ -89,113 +251,711 @@ class AiPlayerUctMcts(AbstractPlayer):
         """
         print(f"{self.name_} is thinking... ", end="")
         sys.stdout.flush()
-        root = Node(copy.deepcopy(board))
-        for _ in range(self.simulations_):
-            node = root
-            state = copy.deepcopy(board)
-
-            # Selection
-            while node.untried_moves_ == [] and node.children_:
-                node = node.uct_select_child()
-                # state.play_move(node.move_, state.get_current_player())
-                state.play_move(node.move_)
-
-            # Expansion
-            if node.untried_moves_:
-                move = random.choice(node.untried_moves_)
-                state.play_move(move)
-                node = node.add_child(move, copy.deepcopy(state))
-
-            # Simulation (improved): check for immediate win/loss, else random
-            while not state.is_game_over():
-                legal_moves = state.get_legal_moves()
-                current_player = state.get_current_player()
-                # Try to win immediately
-                for move in legal_moves:
-                    temp_state = copy.deepcopy(state)
-                    temp_state.play_move(move)
-                    if temp_state.is_game_over() and \
-                            temp_state.get_winner() == current_player:
-                        state.play_move(move)
-                        break
-                else:
-                    # Try to block opponent's immediate win
-                    opponent = 2 if current_player == 1 else 1
-                    blocked = False
-                    for move in legal_moves:
-                        temp_state = copy.deepcopy(state)
-                        temp_state.play_move(move)
-                        # After this move, check if opponent can win next
-                        opp_moves = temp_state.get_legal_moves()
-                        for opp_move in opp_moves:
-                            temp_state2 = copy.deepcopy(temp_state)
-                            temp_state2.play_move(opp_move)
-                            if temp_state2.is_game_over() and \
-                                    temp_state2.get_winner() == opponent:
-                                # This move allows opponent to win, so try next
-                                break
-                        else:
-                            # No immediate win for opponent after this move
-                            state.play_move(move)
-                            blocked = True
-                            break
-                    if not blocked:
-                        # No immediate win or block, play random
-                        state.play_move(random.choice(legal_moves))
-
-            # Backpropagation
-            winner = state.get_winner()
-            # Assume self is maximizing player
-            result = 1 if winner == self.player_id_ else 0
-            # current_player = self.player_id_
-            while node is not None:
-                node.update(result)
-                node = node.parent_
-                # Alternate the reward for each player as we move up the tree
-                result = 1 - result
+        analysis = self.analyze(board)
+        moves = analysis["moves"]
 
         # Print an overview of the visits for each move,
         # sorted by visits (max to min)
-        sorted_children = sorted(root.children_, key=lambda c: c.visits_,
-                                 reverse=True)
+        sorted_moves = sorted(moves, key=lambda m: moves[m]["visits"],
+                              reverse=True)
         print("Move visit counts (sorted): ", end="")
-        for child in sorted_children:
-            print(f"[move {child.move_}: {child.visits_}]", end=" ")
+        for move in sorted_moves:
+            print(f"[move {move}: {moves[move]['visits']}]", end=" ")
         print()
+        best_move = analysis["best_move"]
 
-        # Print total amount of simulations
-        # total_visits = sum(child.visits_ for child in root.children_)
-        # print(f"Total simulations: {total_visits}")
+        print("Done")
+        if self.ponder_:
+            self._start_pondering(board, best_move)
+        return best_move
 
-        # Choose the move with the most visits
-        best_child = max(root.children_, key=lambda c: c.visits_)
+    def analyze(self, board, simulations=None, time_limit_ms=None) -> dict:
+        """Search a position and report the evaluation of each move.
 
-        print("Done")
-        return best_child.move_
+        Nothing is printed. The result is kept, so get_most_likely_variant
+        and get_likelihood_for_win answer from the same search, and a
+        kept tree is reused like in get_move.
+
+        Args:
+            board (Board): The game board to analyze.
+            simulations (int): Maximum number of simulations to run.
+            time_limit_ms (float): Wall-clock budget in milliseconds.
+                If neither budget is given, the player's budget is used.
+        Returns:
+            dict: The analysis with keys "player" (the player to move),
+                "moves" (per column a dict of "visits", "win_rate" and
+                "proven"; in a symmetric position a column pruned by the
+                search shares the statistics of its mirrored column),
+                "best_move", "variant" (the principal
+                variation, following the most visited children) and
+                "win_probability" (of the player to move).
+        """
+        if simulations is None and time_limit_ms is None:
+            simulations = self.simulations_
+            time_limit_ms = self.time_limit_ms_
+        self.stop_pondering()
+        if self.workers_ > 1:
+            stats = self._search_parallel(board, simulations, time_limit_ms)
+            variant = None
+        else:
+            stats, variant = self._search_serial(board, simulations,
+                                                 time_limit_ms)
+        best_move = self._best_move(stats)
+        stats = self._mirror_stats(board, stats)
+        if best_move is None:
+            win_probability = 0.0 if board.get_winner() else 0.5
+        elif stats[best_move][2] is not None:
+            win_probability = (stats[best_move][2] + 1) / 2
+        else:
+            win_probability = stats[best_move][1] / stats[best_move][0]
+        self.analysis_ = {
+            "player": board.get_current_player(),
+            "moves": {move: {"visits": visits,
+                             "win_rate": wins / visits if visits else 0.0,
+                             "proven": proven}
+                      for move, (visits, wins, proven) in stats.items()},
+            "best_move": best_move,
+            "variant": variant if variant is not None else
+            [best_move] if best_move is not None else [],
+            "win_probability": win_probability,
+        }
+        return self.analysis_
+
+    @staticmethod
+    def _mirror_stats(board, stats) -> dict:
+        """Add the columns pruned as mirrored duplicates to root statistics.
+
+        Args:
+            board (Board): The game board searched.
+            stats (dict): (visits, wins, proven) per searched move.
+        Returns:
+            dict: The statistics of all searched moves and of the legal
+                moves mirroring them, by column.
+        """
+        if not stats or not board.is_symmetric():
+            return stats
+        return {move: stats[move] if move in stats
+                else stats[board.mirror_move(move)]
+                for move in board.get_legal_moves()
+                if move in stats or board.mirror_move(move) in stats}
+
+    @staticmethod
+    def _best_move(stats):
+        """Choose the best move from the root statistics.
+
+        A proven win comes first, else the move with the most visits
+        that is not a proven loss.
+
+        Args:
+            stats (dict): (visits, wins, proven) per move.
+        Returns:
+            int: The best move, or None if there are no statistics.
+        """
+        if not stats:
+            return None
+        return max(stats, key=lambda m: (_PROOF_RANKS[stats[m][2]],
+                                         stats[m][0]))
+
+    def _start_pondering(self, board, move):
+        """Start growing the subtree of the selected move in the background.
+
+        The next get_move stops the thread and continues from the
+        subtree of the position reached, found by _find_subtree.
+
+        Args:
+            board (Board): The game board before the move.
+            move (int): The selected move, None if the game is over.
+        """
+        if move is None:
+            return
+        child = next((child for child in self.root_.children_
+                      if child.move_ == move), None)
+        if child is None:
+            return
+        state = self._scratch_state(board)
+        state.play_move(move)
+        if state.is_game_over():
+            return
+        rng = random.Random(self.rng_.getrandbits(64))
+        stop = threading.Event()
+
+        def ponder():
+            self._run_simulations(
+                lambda: stop.is_set() or self._simulate(child, state, rng),
+                None, self.ponder_simulations_, self.ponder_time_limit_ms_)
+
+        self.ponder_stop_ = stop
+        self.ponder_thread_ = threading.Thread(
+            target=ponder, name=f"{self.name_} pondering", daemon=True)
+        self.ponder_thread_.start()
+
+    def stop_pondering(self):
+        """Stop the pondering thread, if any, and wait for it to end."""
+        if self.ponder_thread_ is not None:
+            self.ponder_stop_.set()
+            self.ponder_thread_.join()
+            self.ponder_thread_ = None
+            self.ponder_stop_ = None
+
+    def _scratch_state(self, board):
+        """Create the scratch board the search plays and undoes moves on.
+        Args:
+            board (Board): The current game board.
+        Returns:
+            Board: A copy of the position, of the configured board class.
+        """
+        if self.board_class_ is not None:
+            return self.board_class_.from_board(board)
+        return board.clone(history_limit=0)
+
+    def _search_serial(self, board, simulations, time_limit_ms) -> tuple:
+        """Search the position in this process.
+        Args:
+            board (Board): The current game board.
+            simulations (int): Maximum number of simulations to run.
+            time_limit_ms (float): Wall-clock budget in milliseconds.
+        Returns:
+            tuple: (visits, wins, proven) of the root children per move,
+                and the principal variation.
+        """
+        state = self._scratch_state(board)
+        if self.compact_tree_:
+            tree, root = self._grow_compact(state, simulations, self.rng_,
+                                            time_limit_ms, early_stop=True)
+            return self._compact_stats(tree, root), \
+                self._compact_variant(tree, root)
+        position = self._position_of(board)
+        root = self._find_subtree(board, position) if self.reuse_tree_ \
+            else None
+        root = self._search(state, simulations, self.rng_, time_limit_ms,
+                            early_stop=True, root=root)
+        if self.reuse_tree_:
+            self.root_ = root
+            self.root_position_ = position
+            self.root_key_ = board.get_key()
+            self.root_ply_ = board.ply_
+        return self._root_stats(root), self._variant(root)
+
+    def _search_stats(self, state, simulations, rng,
+                      time_limit_ms=None) -> dict:
+        """Run an independent search, as done by a root-parallel worker.
+        Args:
+            state (Board): The scratch game state.
+            simulations (int): Maximum number of simulations to run.
+            rng (random.Random): Source of randomness for the search.
+            time_limit_ms (float): Wall-clock budget in milliseconds.
+        Returns:
+            dict: (visits, wins, proven) of the root children per move.
+        """
+        if self.compact_tree_:
+            return self._search_compact(state, simulations, rng,
+                                        time_limit_ms)
+        root = self._search(state, simulations, rng, time_limit_ms)
+        return self._root_stats(root)
+
+    @staticmethod
+    def _root_stats(root) -> dict:
+        """Collect the statistics of the root children.
+        Args:
+            root (Node): The root node of the search tree.
+        Returns:
+            dict: (visits, wins, proven) per move, proven being the
+                proven value of the move for the player to move at the
+                root, or None.
+        """
+        return {child.move_: (child.visits_, child.wins_, child.proven_)
+                for child in root.children_}
+
+    @staticmethod
+    def _variant(root) -> list:
+        """Follow the best child from the root down to a leaf.
+        Args:
+            root (Node): The root node of the search tree.
+        Returns:
+            list[int]: The moves of the principal variation.
+        """
+        variant = []
+        node = root
+        while node.children_:
+            node = max(node.children_,
+                       key=lambda c: (_PROOF_RANKS[c.proven_], c.visits_))
+            variant.append(node.move_)
+        return variant
+
+    @staticmethod
+    def _position_of(board) -> tuple:
+        """Describe the position on the board by its known history.
+
+        The position before the known moves is given by its key and
+        player to move, so boards with a truncated or no history, see
+        Board.clone and Board.from_bytes, are described as well.
+
+        Args:
+            board (Board): The game board.
+        Returns:
+            tuple: Board size, connect length, key and player to move of
+                the position before the known moves, and the known moves.
+        """
+        base = board.clone()
+        while base.undo_move():
+            pass
+        return (board.rows_, board.cols_, board.connect_, base.get_key(),
+                base.get_current_player(), list(board.moves_))
+
+    def _find_subtree(self, board, position):
+        """Find the subtree of the kept tree matching the given position.
+
+        The moves played since the last search are followed from the
+        kept root. The tree is only reused if these moves lead from the
+        position of the kept root to the position on the board. The
+        matching node becomes the new root and is detached from its
+        parent, so the rest of the tree is released.
+
+        Args:
+            board (Board): The current game board.
+            position (tuple): The position as returned by _position_of.
+        Returns:
+            Node: The matching node, or None if the tree cannot be reused.
+        """
+        if self.root_ is None:
+            return None
+        last = self.root_position_
+        if position[:5] != last[:5] or \
+                position[5][:len(last[5])] != last[5]:
+            return None
+        moves = position[5][len(last[5]):]
+        previous = board.clone(history_limit=len(moves))
+        for _ in moves:
+            previous.undo_move()
+        if previous.get_key() != self.root_key_ or \
+                previous.ply_ != self.root_ply_:
+            return None
+        node = self.root_
+        for move in moves:
+            node = next((child for child in node.children_
+                         if child.move_ == move), None)
+            if node is None:
+                return None
+        node.parent_ = None
+        return node
+
+    def _search(self, state, simulations, rng, time_limit_ms=None,
+                early_stop=False, root=None) -> Node:
+        """Run UCT MCTS simulations from the given state.
+
+        The search ends when the simulation cap or the time limit is
+        reached, whichever comes first, or once the root is proven.
+
+        Args:
+            state (Board): The scratch game state. It is restored to the
+                root position after each simulation.
+            simulations (int): Maximum number of simulations to run.
+                None means no cap.
+            rng (random.Random): Source of randomness for the search.
+            time_limit_ms (float): Wall-clock budget in milliseconds.
+                None means no time limit.
+            early_stop (bool): Stop as soon as the most visited root child
+                can no longer be overtaken in the remaining budget.
+            root (Node): Root node of a tree to continue, which must match
+                the state. None starts a new tree.
+        Returns:
+            Node: The root node of the search tree.
+        """
+        if root is None:
+            root = Node(state)
+        root.untried_ = moves_mask(
+            self._unique_moves(state, root.untried_moves(state)))
+        # A kept root may be left with proven children only
+        root.update_proof()
+        self._run_simulations(
+            lambda: self._simulate(root, state, rng),
+            lambda: [child.visits_ for child in root.children_],
+            simulations, time_limit_ms, early_stop)
+        return root
+
+    @staticmethod
+    def _unique_moves(state, moves) -> list:
+        """Drop the moves mirroring other moves of a symmetric position.
+
+        In a position equal to its mirror image, such as the empty board,
+        a move and its mirrored move have the same value, so only the
+        moves left of or on the middle column need to be searched.
+
+        Args:
+            state (Board): The game state.
+            moves (list[int]): Moves of the state.
+        Returns:
+            list[int]: The moves without mirrored duplicates.
+        """
+        if len(moves) < 2 or not state.is_symmetric():
+            return moves
+        return [move for move in moves if move <= state.mirror_move(move)]
+
+    def _run_simulations(self, simulate, root_visits, simulations,
+                         time_limit_ms=None, early_stop=False):
+        """Run simulations until the simulation cap or the time limit
+        is reached, whichever comes first.
+        Args:
+            simulate (callable): Runs a single simulation. Returns True
+                once the root is proven, which ends the search.
+            root_visits (callable): Returns the visit counts of the
+                root moves.
+            simulations (int): Maximum number of simulations to run.
+                None means no cap.
+            time_limit_ms (float): Wall-clock budget in milliseconds.
+                None means no time limit.
+            early_stop (bool): Stop as soon as the most visited root move
+                can no longer be overtaken in the remaining budget.
+        """
+        start = time.perf_counter()
+        deadline = None if time_limit_ms is None else \
+            start + time_limit_ms / 1000
+        done = 0
+        while simulations is None or done < simulations:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if simulate():
+                break
+            done += 1
+            if early_stop:
+                remaining = math.inf if simulations is None else \
+                    simulations - done
+                if deadline is not None:
+                    now = time.perf_counter()
+                    rate = done / max(now - start, 1e-9)
+                    remaining = min(remaining, rate * (deadline - now))
+                if self.batch_rollout_ is not None:
+                    # Every simulation adds a batch of playouts
+                    remaining *= self.batch_rollout_.playouts_
+                if self._is_decided(root_visits(), remaining):
+                    break
+
+    def _simulate(self, root, state, rng):
+        """Run a single simulation from the root node.
+        Args:
+            root (Node): The root node of the search tree.
+            state (Board): The scratch game state at the root position.
+                It is restored to the root position on return.
+            rng (random.Random): Source of randomness for the simulation.
+        Returns:
+            bool: True if the root is proven.
+        """
+        if root.proven_ is not None:
+            return True
+        node = root
+        plies = 0
+
+        # Selection
+        while not node.untried_mask(state) and node.children_:
+            node = node.uct_select_child()
+            state.play_move(node.move_)
+            plies += 1
+
+        # Expansion
+        if node.untried_:
+            move = rng.choice(mask_moves(node.untried_))
+            state.play_move(move)
+            plies += 1
+            node = node.add_child(move, state)
+
+        # Simulation
+        rollout_plies, result, visits = self._evaluate_leaf(state, rng)
+        plies += rollout_plies
+
+        # Backpropagation
+        leaf = node
+        while node is not None:
+            node.update(result, visits)
+            node = node.parent_
+            # Alternate the reward for each player as we move up the tree
+            result = visits - result
+
+        # Propagate proven values towards the root
+        node = leaf
+        while node.proven_ is not None and node.parent_ is not None and \
+                node.parent_.update_proof():
+            node = node.parent_
+
+        # Restore the scratch board to the root position
+        for _ in range(plies):
+            state.undo_move()
+        return root.proven_ is not None
+
+    def _search_compact(self, state, simulations, rng, time_limit_ms=None,
+                        early_stop=False) -> dict:
+        """Run UCT MCTS simulations on an array-backed tree.
+        Args:
+            state (Board): The scratch game state. It is restored to the
+                root position after each simulation.
+            simulations (int): Maximum number of simulations to run.
+                None means no cap.
+            rng (random.Random): Source of randomness for the search.
+            time_limit_ms (float): Wall-clock budget in milliseconds.
+                None means no time limit.
+            early_stop (bool): Stop as soon as the most visited root child
+                can no longer be overtaken in the remaining budget.
+        Returns:
+            dict: (visits, wins, proven) of the root children per move.
+        """
+        tree, root = self._grow_compact(state, simulations, rng,
+                                        time_limit_ms, early_stop)
+        return self._compact_stats(tree, root)
+
+    def _grow_compact(self, state, simulations, rng, time_limit_ms=None,
+                      early_stop=False) -> tuple:
+        """Grow a new array-backed tree from the given state.
+
+        The arguments are those of _search_compact.
+
+        Returns:
+            tuple: The TreeStore and the ID of its root.
+        """
+        tree = TreeStore(capacity=4096 if simulations is None
+                         else simulations + 1)
+        root = tree.add_node(NO_NODE, -1,
+                             self._unique_moves(state,
+                                                state.get_legal_moves()))
+        self._run_simulations(
+            lambda: self._simulate_compact(tree, root, state, rng),
+            lambda: [tree.visits_[child] for child in tree.children(root)],
+            simulations, time_limit_ms, early_stop)
+        return tree, root
+
+    @staticmethod
+    def _compact_stats(tree, root) -> dict:
+        """Collect the statistics of the root children of a TreeStore.
+        Args:
+            tree (TreeStore): The search tree.
+            root (int): ID of the root node.
+        Returns:
+            dict: (visits, wins, proven) per move.
+        """
+        return {tree.move_[child]: (tree.visits_[child], tree.wins_[child],
+                                    tree.proven(child))
+                for child in tree.children(root)}
+
+    @staticmethod
+    def _compact_variant(tree, root) -> list:
+        """Follow the best child from the root of a TreeStore to a leaf.
+        Args:
+            tree (TreeStore): The search tree.
+            root (int): ID of the root node.
+        Returns:
+            list[int]: The moves of the principal variation.
+        """
+        variant = []
+        node = root
+        while tree.first_child_[node] != NO_NODE:
+            node = max(tree.children(node),
+                       key=lambda c: (_PROOF_RANKS[tree.proven(c)],
+                                      tree.visits_[c]))
+            variant.append(tree.move_[node])
+        return variant
+
+    def _simulate_compact(self, tree, root, state, rng):
+        """Run a single simulation from the root of an array-backed tree.
+        Args:
+            tree (TreeStore): The search tree.
+            root (int): ID of the root node.
+            state (Board): The scratch game state at the root position.
+                It is restored to the root position on return.
+            rng (random.Random): Source of randomness for the simulation.
+        Returns:
+            bool: True if the root is proven.
+        """
+        if tree.proven(root) is not None:
+            return True
+        node = root
+        plies = 0
+
+        # Selection
+        while tree.untried_[node] == 0 and \
+                tree.first_child_[node] != NO_NODE:
+            node = tree.select_child(node)
+            state.play_move(tree.move_[node])
+            plies += 1
+
+        # Expansion
+        if tree.untried_[node]:
+            move = rng.choice(tree.untried_moves(node))
+            state.play_move(move)
+            plies += 1
+            node = tree.add_node(node, move, state.get_legal_moves())
+            if state.is_game_over():
+                tree.prove(node, 1 if state.get_winner() else 0)
+
+        # Simulation
+        rollout_plies, result, visits = self._evaluate_leaf(state, rng)
+        plies += rollout_plies
+
+        # Backpropagation
+        leaf = node
+        while node != NO_NODE:
+            tree.update(node, result, visits)
+            node = tree.parent_[node]
+            # Alternate the reward for each player as we move up the tree
+            result = visits - result
+
+        # Propagate proven values towards the root
+        node = leaf
+        while tree.proven(node) is not None and \
+                tree.parent_[node] != NO_NODE and \
+                tree.update_proof(tree.parent_[node]):
+            node = tree.parent_[node]
+
+        # Restore the scratch board to the root position
+        for _ in range(plies):
+            state.undo_move()
+        return tree.proven(root) is not None
+
+    @staticmethod
+    def _is_decided(visits, remaining) -> bool:
+        """Check whether the most visited root move is certain to stay so.
+        Args:
+            visits (list[int]): Visit counts of the root moves.
+            remaining (float): Estimated number of simulations left.
+        Returns:
+            bool: True if no other move can catch up in visits.
+        """
+        visits = sorted(visits, reverse=True)
+        if not visits:
+            return False
+        runner_up = visits[1] if len(visits) > 1 else 0
+        return visits[0] - runner_up > remaining
+
+    def _search_parallel(self, board, simulations, time_limit_ms) -> dict:
+        """Run root-parallel searches in the worker pool.
+
+        Each worker rebuilds the position from its key and player to
+        move, see Board.from_key, and grows an independent tree. Visits
+        and wins of the root children are summed up per move.
+
+        Args:
+            board (Board): The current game board.
+            simulations (int): Maximum number of simulations to run in
+                total.
+            time_limit_ms (float): Wall-clock budget in milliseconds.
+        Returns:
+            dict: Merged (visits, wins, proven) of the root children
+                per move. A move proven by any worker is proven.
+        """
+        if self.executor_ is None:
+            self.executor_ = ProcessPoolExecutor(max_workers=self.workers_)
+        board_class = self.board_class_ or board.__class__
+        if simulations is None:
+            shares = [None] * self.workers_
+        else:
+            shares = [simulations // self.workers_ +
+                      (1 if i < simulations % self.workers_ else 0)
+                      for i in range(self.workers_)]
+        seeds = [self.rng_.getrandbits(64) for _ in shares]
+        stats = {}
+        for worker_stats in self.executor_.map(
+                _search_worker,
+                [(self, board_class, board.rows_, board.cols_,
+                  board.connect_, board.get_key(),
+                  board.get_current_player(), share, time_limit_ms, seed)
+                 for share, seed in zip(shares, seeds)]):
+            for move, (visits, wins, proven) in worker_stats.items():
+                total = stats.get(move, (0, 0, None))
+                stats[move] = (total[0] + visits, total[1] + wins,
+                               proven if total[2] is None else total[2])
+        return stats
+
+    def _evaluate_leaf(self, state, rng) -> tuple:
+        """Evaluate a leaf by one rollout or a batch of playouts.
+        Args:
+            state (Board): The game state at the leaf. A single rollout
+                leaves it at the end of the game.
+            rng (random.Random): Source of randomness for the rollouts.
+        Returns:
+            tuple: (plies, result, visits), the number of moves played
+                on the state, the sum of the results for the player who
+                moved into the leaf, draws counting half, and the number
+                of playouts.
+        """
+        mover = 2 if state.get_current_player() == 1 else 1
+        if self.batch_rollout_ is not None:
+            wins = self.batch_rollout_.run(state, rng)
+            return 0, wins[mover] + 0.5 * wins[0], \
+                self.batch_rollout_.playouts_
+        plies = self._rollout(state, rng)
+        winner = state.get_winner()
+        result = 1 if winner == mover else 0.5 if winner == 0 else 0
+        return plies, result, 1
+
+    def _rollout(self, state, rng=random) -> int:
+        """Play out the game from the given state with the rollout policy.
+        Args:
+            state (Board): The game state to play out. It is left at
+                the end of the game.
+            rng (random.Random): Source of randomness for the rollout.
+        Returns:
+            int: The number of moves played.
+        """
+        return self.rollout_policy_.rollout(state, rng)
 
     def get_most_likely_variant(self) -> list[int]:
         """Return the most likely variant of the game based on the MCTS tree.
+
+        The variant follows the most visited children of the last
+        search, starting with the selected move.
+
         Returns:
             List[int]: The sequence of moves representing the most
-            likely variant.
+            likely variant, empty before the first search.
         """
-        # This method can be implemented to return the
-        # most likely sequence of moves based on the MCTS tree.
-        # For simplicity, we return an empty list here.
-        return []
+        if self.analysis_ is None:
+            return []
+        return list(self.analysis_["variant"])
 
     def get_likelihood_for_win(self) -> float:
         """Return the likelihood of winning from the current position.
+
+        The likelihood is the win rate of the best move of the last
+        search, or its proven value, for this player.
+
         Returns:
-            float: Likelihood of winning (0.0 to 1.0).
+            float: Likelihood of winning (0.0 to 1.0), 0.0 before the
+            first search.
         """
-        # This method can be implemented to return the
-        # likelihood of winning based on the MCTS statistics.
-        # For simplicity, we return 0.0 here.
-        return 0.0
+        if self.analysis_ is None:
+            return 0.0
+        probability = self.analysis_["win_probability"]
+        if self.analysis_["player"] != self.player_id_:
+            return 1.0 - probability
+        return probability
 
     def reset(self):
-        """Reset any internal state of the player."""
-        # No internal state to reset for this AI player.
-        # pass
-        return
+        """Reset any internal state of the player.
+
+        Stops pondering, drops the kept search tree and shuts down the
+        worker pool, it is recreated on demand.
+        """
+        self.stop_pondering()
+        self.root_ = None
+        self.root_position_ = None
+        self.root_key_ = None
+        self.root_ply_ = None
+        self.analysis_ = None
+        if self.executor_ is not None:
+            self.executor_.shutdown()
+            self.executor_ = None
+
+
+def _search_worker(args) -> dict:
+    """Run one independent search of a root-parallel MCTS in a worker.
+    Args:
+        args (tuple): The player, board class, rows, columns, connect
+            length, position key, player to move, simulation cap, time
+            limit in milliseconds and seed.
+    Returns:
+        dict: (visits, wins, proven) of the root children per move.
+    """
+    (player, board_class, rows, cols, connect, key, current_player,
+     simulations, time_limit_ms, seed) = args
+    state = board_class.from_key(key, rows=rows, cols=cols, connect=connect,
+                                 current_player=current_player)
+    # pylint: disable=protected-access
+    return player._search_stats(state, simulations, random.Random(seed),
+                                time_limit_ms)
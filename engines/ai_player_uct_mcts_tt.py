@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ai Player for py-four-in-a-row: A Python implementation of
+the classic Four in a Row game.
+This player uses UCT MCTS over a directed acyclic graph of positions.
+Statistics are kept in a bounded transposition table keyed by the
+canonical position key, so all move orders reaching a position, and
+its mirror image, share them.
+"""
+import math
+from operator import itemgetter
+from engines.ai_player_uct_mcts import AiPlayerUctMcts
+from modules.transposition_table import REPLACE_PRIORITY, TranspositionTable
+
+
+class AiPlayerUctMctsTT(AiPlayerUctMcts):
+    """AI Player using UCT MCTS with a transposition table."""
+
+    def __init__(self, name="UCT_MCTS_TT", symbol="X",
+                 simulations=1000,
+                 player_id: int = 1,
+                 board_class=None,
+                 workers: int = 1,
+                 seed=None,
+                 time_limit_ms=None,
+                 tt_capacity: int = 1 << 18,
+                 replacement=REPLACE_PRIORITY):
+        """Initialize the UCT MCTS player with a transposition table.
+        Args:
+            name (str): Name of the player.
+            simulations (int): Number of simulations to run per move.
+                With a time limit this is a cap, None means no cap.
+            board_class (type): Board implementation used for the search,
+                e.g. BitBoard. None searches on the board as given.
+            workers (int): Number of worker processes for root-parallel
+                searches, each with a table of its own.
+            seed (int): Seed for reproducible searches.
+            time_limit_ms (float): Wall-clock budget per move in
+                milliseconds. None means no time limit.
+            tt_capacity (int): Maximum number of positions in the table.
+            replacement (str): Replacement policy of the table.
+                REPLACE_PRIORITY keeps the more visited position,
+                REPLACE_ALWAYS keeps the most recent one.
+        """
+        self.tt_capacity_ = tt_capacity
+        self.replacement_ = replacement
+        self.table_ = None
+        super().__init__(name, symbol, simulations=simulations,
+                         player_id=player_id, board_class=board_class,
+                         workers=workers, seed=seed,
+                         time_limit_ms=time_limit_ms, reuse_tree=False)
+
+    def __getstate__(self):
+        """Return the state for pickling, without the table."""
+        state = super().__getstate__()
+        state["table_"] = None
+        return state
+
+    def _new_table(self) -> TranspositionTable:
+        """Create an empty transposition table.
+
+        Entries are [visits, wins] lists, wins being counted for the
+        player who moved into the position.
+
+        Returns:
+            TranspositionTable: The new table.
+        """
+        return TranspositionTable(self.tt_capacity_, self.replacement_,
+                                  priority=itemgetter(0))
+
+    def _search_serial(self, board, simulations, time_limit_ms) -> tuple:
+        """Search the position in this process.
+
+        The table is kept between moves, so statistics of positions
+        reached again are reused.
+
+        Args:
+            board (Board): The current game board.
+            simulations (int): Maximum number of simulations to run.
+            time_limit_ms (float): Wall-clock budget in milliseconds.
+        Returns:
+            tuple: (visits, wins, proven) of the root children per move,
+                and the principal variation.
+        """
+        state = self._scratch_state(board)
+        stats = self._search_table(state, simulations, self.rng_,
+                                   time_limit_ms, early_stop=True)
+        return stats, self._table_variant(state)
+
+    def _table_variant(self, state) -> list:
+        """Follow the most visited positions in the table from a state.
+        Args:
+            state (Board): The game state. It is unchanged on return.
+        Returns:
+            list[int]: The moves of the principal variation.
+        """
+        variant = []
+        stats = self._child_stats(state)
+        while stats:
+            move = max(stats, key=lambda m: stats[m][0])
+            state.play_move(move)
+            variant.append(move)
+            stats = self._child_stats(state)
+        for _ in variant:
+            state.undo_move()
+        return variant
+
+    def _search_stats(self, state, simulations, rng,
+                      time_limit_ms=None) -> dict:
+        """Run an independent search, as done by a root-parallel worker.
+        Args:
+            state (Board): The scratch game state.
+            simulations (int): Maximum number of simulations to run.
+            rng (random.Random): Source of randomness for the search.
+            time_limit_ms (float): Wall-clock budget in milliseconds.
+        Returns:
+            dict: (visits, wins, proven) of the root children per move.
+        """
+        if self.table_ is None:
+            self.table_ = self._new_table()
+        return self._search_table(state, simulations, rng, time_limit_ms)
+
+    def _search_table(self, state, simulations, rng, time_limit_ms=None,
+                      early_stop=False) -> dict:
+        """Run UCT MCTS simulations from the given state.
+        Args:
+            state (Board): The scratch game state. It is restored to the
+                root position after each simulation.
+            simulations (int): Maximum number of simulations to run.
+                None means no cap.
+            rng (random.Random): Source of randomness for the search.
+            time_limit_ms (float): Wall-clock budget in milliseconds.
+                None means no time limit.
+            early_stop (bool): Stop as soon as the most visited root move
+                can no longer be overtaken in the remaining budget.
+        Returns:
+            dict: (visits, wins, proven) of the root children per move.
+        """
+        # Entries of earlier searches not reached by this one give way
+        self.table_.new_generation()
+        root_key = state.get_canonical_key()
+        root_entry = self.table_.lookup(root_key)
+        if root_entry is None:
+            root_entry = [0, 0]
+            self.table_.store(root_key, root_entry)
+        self._run_simulations(
+            lambda: self._simulate_table(root_entry, state, rng),
+            lambda: [visits for visits, _, _ in
+                     self._child_stats(state).values()],
+            simulations, time_limit_ms, early_stop)
+        return self._child_stats(state)
+
+    def _child_stats(self, state) -> dict:
+        """Collect the statistics of the positions after each legal move.
+        Args:
+            state (Board): The game state.
+        Returns:
+            dict: (visits, wins, proven) per move, for visited positions
+                only. Positions are never proven in the table. Mirrored
+                duplicates of moves in symmetric positions are left out.
+        """
+        stats = {}
+        for move in self._unique_moves(state, state.get_legal_moves()):
+            state.play_move(move)
+            entry = self.table_.lookup(state.get_canonical_key())
+            state.undo_move()
+            if entry is not None and entry[0] > 0:
+                stats[move] = (entry[0], entry[1], None)
+        return stats
+
+    def _simulate_table(self, root_entry, state, rng):
+        """Run a single simulation through the position graph.
+        Args:
+            root_entry (list): The [visits, wins] entry of the root.
+            state (Board): The scratch game state at the root position.
+                It is restored to the root position on return.
+            rng (random.Random): Source of randomness for the simulation.
+        """
+        root_player = state.get_current_player()
+        path = [root_entry]
+        plies = 0
+
+        # Selection and expansion
+        while not state.is_game_over():
+            explored = []
+            unexplored = []
+            for move in state.get_legal_moves():
+                state.play_move(move)
+                key = state.get_canonical_key()
+                entry = self.table_.lookup(key)
+                # A position the table would reject is left out: it has
+                # no entry to keep statistics in, and expanding it again
+                # and again would starve the rest of the search
+                if entry is None and self.table_.accepts(key, [0, 0]) or \
+                        entry is not None and entry[0] == 0:
+                    unexplored.append(move)
+                elif entry is not None:
+                    explored.append((move, entry))
+                state.undo_move()
+            if unexplored:
+                state.play_move(rng.choice(unexplored))
+                plies += 1
+                entry = [0, 0]
+                self.table_.store(state.get_canonical_key(), entry)
+                path.append(entry)
+                break
+            if not explored:
+                # No child can be stored, this position is the leaf
+                break
+            # UCT formula: win_rate + sqrt(2 * log(parent_visits) / visits)
+            log_visits = math.log(max(path[-1][0], 1))
+            move, entry = max(
+                explored,
+                key=lambda item: item[1][1] / item[1][0] +
+                math.sqrt(2 * log_visits / item[1][0]))
+            state.play_move(move)
+            plies += 1
+            path.append(entry)
+
+        # Simulation
+        plies += self._rollout(state, rng)
+
+        # Backpropagation: each entry counts the wins of the player who
+        # moved into its position, draws count half
+        winner = state.get_winner()
+        opponent = 2 if root_player == 1 else 1
+        for depth, entry in enumerate(path):
+            mover = root_player if depth % 2 == 1 else opponent
+            entry[0] += 1
+            entry[1] += 1 if winner == mover else 0.5 if winner == 0 else 0
+
+        # Restore the scratch board to the root position
+        for _ in range(plies):
+            state.undo_move()
+
+    def reset(self):
+        """Reset any internal state of the player.
+
+        Clears the transposition table and shuts down the worker pool.
+        """
+        super().reset()
+        self.table_ = self._new_table()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("This is the AiPlayerUctMctsTT module.")
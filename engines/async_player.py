@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Asynchronous players for the py-four-in-a-row game engine.
+
+AsyncPlayer is the awaitable counterpart of AbstractPlayer, used by
+the asyncio game loop in modules/async_game.py to run many games in
+one process:
+
+- ExecutorPlayer runs a synchronous player's get_move in an executor
+  shared by all games, so CPU-bound engines do not block the loop.
+- QueuePlayer awaits its moves from an asyncio.Queue, fed by a human
+  interface or a remote connection.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+
+
+class AsyncPlayer(ABC):
+    """Abstract base class for a player with an awaitable get_move."""
+
+    def __init__(self, name, symbol, player_id: int = 1):
+        """Initialize the player with a name.
+        Args:
+            name (str): The name of the player.
+            symbol (str): Symbol representing the player on the board.
+            player_id (int): The ID assigned to this player.
+        """
+        self.name_ = name
+        self.symbol_ = symbol
+        self.player_id_ = player_id
+
+    def set_player_id(self, player_id: int):
+        """Set the player ID for this player.
+        Args:
+            player_id (int): The ID assigned to this player.
+        """
+        self.player_id_ = player_id
+
+    @abstractmethod
+    async def get_move(self, board):
+        """Return the move to be played on the given board.
+
+        The board must not be changed while the move is awaited.
+
+        Args:
+            board (Board): The current game board.
+        Returns:
+            int: The column index where the player wants to play.
+        """
+        # pass
+
+    def reset(self):
+        """Reset any internal state of the player."""
+        # No internal state by default
+        return
+
+
+def _get_move(player, board) -> int:
+    """Call a synchronous player's get_move, possibly in a worker process.
+    Args:
+        player (AbstractPlayer): The player.
+        board (Board): A copy of the game board.
+    Returns:
+        int: The selected column index for the move.
+    """
+    return player.get_move(board)
+
+
+class ExecutorPlayer(AsyncPlayer):
+    """Adapter running a synchronous player in an executor."""
+
+    def __init__(self, player, executor=None):
+        """Wrap a synchronous player.
+
+        Args:
+            player (AbstractPlayer): The player to run.
+            executor (concurrent.futures.Executor): Executor shared by
+                the games, None for the default executor of the event
+                loop. With a thread pool the player keeps its state
+                between moves, e.g. the MCTS tree. With a process pool
+                each move is searched by a pickled copy of the player.
+        """
+        self.player_ = player
+        self.executor_ = executor
+        super().__init__(player.name_, player.symbol_,
+                         player_id=player.player_id_)
+
+    def set_player_id(self, player_id: int):
+        """Set the player ID for this player and the wrapped player.
+        Args:
+            player_id (int): The ID assigned to this player.
+        """
+        super().set_player_id(player_id)
+        self.player_.set_player_id(player_id)
+
+    async def get_move(self, board) -> int:
+        """Run the wrapped player's get_move in the executor.
+        Args:
+            board (Board): The current game board. The player searches
+                a copy of it, without the players: they may hold the
+                executor, which cannot be sent to a worker process.
+        Returns:
+            int: The selected column index for the move.
+        """
+        copy = board.clone()
+        copy.players = None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor_, _get_move,
+                                          self.player_, copy)
+
+    def reset(self):
+        """Reset the wrapped player."""
+        self.player_.reset()
+
+
+class QueuePlayer(AsyncPlayer):
+    """Player awaiting its moves from a queue."""
+
+    def __init__(self, name="Remote", symbol="O", player_id: int = 1,
+                 queue=None):
+        """Initialize the player.
+
+        Args:
+            name (str): The name of the player.
+            symbol (str): Symbol representing the player on the board.
+            player_id (int): The ID assigned to this player.
+            queue (asyncio.Queue): Queue of the moves, None creates one.
+        """
+        self.queue_ = queue if queue is not None else asyncio.Queue()
+        super().__init__(name, symbol, player_id=player_id)
+
+    async def get_move(self, board) -> int:
+        """Await the next legal move from the queue.
+
+        Illegal moves are dropped, the player is asked again.
+
+        Args:
+            board (Board): The current game board.
+        Returns:
+            int: The column index where the player wants to play.
+        """
+        while True:
+            move = await self.queue_.get()
+            if board.is_legal_move(move):
+                return move
+            print(f"Illegal move: {move}. Try again.")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("This is the AsyncPlayer module.")
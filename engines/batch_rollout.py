@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch rollouts for the MCTS players of py-four-in-a-row:
+A Python implementation of the classic Four in a Row game.
+
+This module defines the BatchRollout class, which plays many playouts
+from one leaf position at once with NumPy. The playouts are kept as
+arrays of bitboards (one uint64 mask per player and playout), each
+step choosing and playing a move in all unfinished playouts, and wins
+are detected with vectorized shift-and line checks.
+
+NumPy is an optional dependency, only needed by this module:
+    pip install numpy
+"""
+import random
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class BatchRollout:
+    """Vectorized playouts of one position with NumPy."""
+
+    def __init__(self, playouts=64, guided=True):
+        """Initialize the batch rollout engine.
+
+        Args:
+            playouts (int): Number of playouts per leaf position.
+            guided (bool): Play an immediate win, else block an immediate
+                win of the opponent, else a random move. False plays
+                uniformly random moves.
+        """
+        if np is None:
+            raise ImportError("BatchRollout requires NumPy, "
+                              "install it with 'pip install numpy'.")
+        self.playouts_ = playouts
+        self.guided_ = guided
+
+    def run(self, state, rng=random) -> dict:
+        """Play out the position of the state in a batch of games.
+
+        Args:
+            state (Board): The leaf position. It is not modified.
+            rng (random.Random): Source of the seed of the batch.
+        Returns:
+            dict: Number of playouts won per player (1 and 2), and
+                drawn (0).
+        """
+        playouts = self.playouts_
+        if state.is_game_over():
+            counts = {0: 0, 1: 0, 2: 0}
+            counts[state.get_winner()] = playouts
+            return counts
+        rows, cols, connect = state.rows_, state.cols_, state.connect_
+        stride = rows + 1
+        if stride * cols > 64:
+            raise ValueError(f"A {rows}x{cols} board does not fit "
+                             "into 64-bit masks.")
+        generator = np.random.default_rng(rng.getrandbits(64))
+
+        # The position key holds the masks of both players
+        key = state.get_key()
+        mask1 = key & ((1 << (cols * stride)) - 1)
+        mask2 = key >> (cols * stride)
+        column = (1 << stride) - 1
+        heights = np.array(
+            [[c * stride + bin((mask1 | mask2) >> (c * stride) & column)
+              .count("1") for c in range(cols)]] * playouts, dtype=np.uint64)
+        tops = np.arange(cols, dtype=np.uint64) * np.uint64(stride) + \
+            np.uint64(rows)
+        masks = [None, np.full(playouts, mask1, dtype=np.uint64),
+                 np.full(playouts, mask2, dtype=np.uint64)]
+        winners = np.zeros(playouts, dtype=np.int8)
+        active = np.ones(playouts, dtype=bool)
+        games = np.arange(playouts)
+        one = np.uint64(1)
+
+        player = state.get_current_player()
+        for _ in range(rows * cols - state.ply_):
+            legal = (heights < tops) & active[:, None]
+            if not legal.any():
+                break
+            # Bits of the next free cell per column; full columns point
+            # at the always empty sentinel bit
+            bits = one << heights
+            scores = generator.random((playouts, cols))
+            if self.guided_:
+                own = masks[player][:, None] | bits
+                other = masks[3 - player][:, None] | bits
+                scores += 2 * self._has_line(other, stride, connect)
+                scores += 4 * self._has_line(own, stride, connect)
+            scores[~legal] = -1
+            moves = scores.argmax(axis=1)
+            played = np.where(active, bits[games, moves], np.uint64(0))
+            masks[player] |= played
+            heights[games, moves] += active.astype(np.uint64)
+            won = active & self._has_line(masks[player], stride, connect)
+            winners[won] = player
+            active &= ~won
+            player = 3 - player
+        return {0: int(np.count_nonzero(winners == 0)),
+                1: int(np.count_nonzero(winners == 1)),
+                2: int(np.count_nonzero(winners == 2))}
+
+    @staticmethod
+    def _has_line(masks, stride, connect):
+        """Check an array of masks for connect aligned discs.
+
+        Args:
+            masks (numpy.ndarray): Bitmasks of one player, any shape.
+            stride (int): Number of bits per column.
+            connect (int): Number of aligned discs needed to win.
+        Returns:
+            numpy.ndarray: Boolean array of the same shape, True where
+                connect discs are aligned in any direction.
+        """
+        found = np.zeros(masks.shape, dtype=bool)
+        # Vertical, horizontal, and both diagonal directions
+        for shift in (1, stride, stride + 1, stride - 1):
+            runs = masks
+            length = 1
+            while 2 * length <= connect:
+                runs = runs & (runs >> np.uint64(length * shift))
+                length *= 2
+            if length < connect:
+                runs = runs & (runs >> np.uint64((connect - length) * shift))
+            found |= runs != 0
+        return found
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("This is the BatchRollout module.")
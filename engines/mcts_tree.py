@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Array-backed MCTS tree store for py-four-in-a-row:
+A Python implementation of the classic Four in a Row game.
+
+This module defines the TreeStore class, an alternative to a tree of
+Node objects. Nodes are integer IDs into parallel array.array buffers
+holding visits, wins, parent, move, first child, next sibling, a
+bitmask of the untried moves and the proven value. The buffers are
+preallocated and grow by doubling, so a node costs a few dozen bytes
+instead of a Python object with a list of children.
+"""
+import math
+from array import array
+
+NO_NODE = -1
+# Marks a node whose game-theoretic value is not known yet
+NOT_PROVEN = 2
+
+
+def moves_mask(moves) -> int:
+    """Get the bitmask of a list of moves.
+    Args:
+        moves (list[int]): Column indices.
+    Returns:
+        int: The mask with bit i set for column i.
+    """
+    mask = 0
+    for move in moves:
+        mask |= 1 << move
+    return mask
+
+
+def mask_moves(mask) -> list:
+    """Get the moves of a bitmask.
+    Args:
+        mask (int): The mask with bit i set for column i.
+    Returns:
+        list[int]: The columns in ascending order.
+    """
+    moves = []
+    while mask:
+        low = mask & -mask
+        moves.append(low.bit_length() - 1)
+        mask ^= low
+    return moves
+
+
+class TreeStore:
+    """MCTS tree stored in parallel arrays, addressed by node IDs."""
+
+    def __init__(self, capacity=1024):
+        """Initialize an empty store.
+
+        Args:
+            capacity (int): Number of nodes preallocated. The store
+                grows beyond it as needed.
+        """
+        self.count_ = 0
+        self.capacity_ = 0
+        self.visits_ = array("I")
+        self.wins_ = array("d")
+        self.parent_ = array("i")
+        self.move_ = array("b")
+        self.first_child_ = array("i")
+        self.next_sibling_ = array("i")
+        self.untried_ = array("Q")
+        self.proven_ = array("b")
+        self._grow(max(capacity, 1))
+
+    def _grow(self, capacity):
+        """Extend all buffers to the given capacity, zero filled.
+        Args:
+            capacity (int): The new number of node slots.
+        """
+        extra = capacity - self.capacity_
+        for buffer in (self.visits_, self.wins_, self.parent_, self.move_,
+                       self.first_child_, self.next_sibling_, self.untried_,
+                       self.proven_):
+            buffer.frombytes(bytes(extra * buffer.itemsize))
+        self.capacity_ = capacity
+
+    def add_node(self, parent, move, legal_moves) -> int:
+        """Add a node as the last child of its parent.
+
+        Args:
+            parent (int): ID of the parent node, NO_NODE for a root.
+            move (int): The move leading to the node, -1 for a root.
+            legal_moves (list[int]): The legal moves in the position
+                of the node, all of them untried.
+        Returns:
+            int: ID of the new node.
+        """
+        if self.count_ == self.capacity_:
+            self._grow(2 * self.capacity_)
+        node = self.count_
+        self.count_ += 1
+        self.visits_[node] = 0
+        self.wins_[node] = 0
+        self.parent_[node] = parent
+        self.move_[node] = move
+        self.first_child_[node] = NO_NODE
+        self.next_sibling_[node] = NO_NODE
+        self.untried_[node] = moves_mask(legal_moves)
+        self.proven_[node] = NOT_PROVEN
+        if parent != NO_NODE:
+            self.untried_[parent] &= ~(1 << move)
+            child = self.first_child_[parent]
+            if child == NO_NODE:
+                self.first_child_[parent] = node
+            else:
+                while self.next_sibling_[child] != NO_NODE:
+                    child = self.next_sibling_[child]
+                self.next_sibling_[child] = node
+        return node
+
+    def untried_moves(self, node) -> list:
+        """Get the untried moves of a node.
+        Args:
+            node (int): ID of the node.
+        Returns:
+            list[int]: The untried moves in ascending order.
+        """
+        return mask_moves(self.untried_[node])
+
+    def children(self, node) -> list:
+        """Get the children of a node.
+        Args:
+            node (int): ID of the node.
+        Returns:
+            list[int]: IDs of the children, in order of expansion.
+        """
+        children = []
+        child = self.first_child_[node]
+        while child != NO_NODE:
+            children.append(child)
+            child = self.next_sibling_[child]
+        return children
+
+    def select_child(self, node) -> int:
+        """Select an unproven child node using the UCT formula.
+        Args:
+            node (int): ID of a node with children.
+        Returns:
+            int: ID of the selected child.
+        """
+        visits = self.visits_
+        wins = self.wins_
+        log_visits = math.log(visits[node])
+        best = NO_NODE
+        best_value = -math.inf
+        child = self.first_child_[node]
+        proven = self.proven_
+        while child != NO_NODE:
+            if proven[child] == NOT_PROVEN:
+                # UCT formula: win_rate + sqrt(2 * log(parent_visits) / visits)
+                value = wins[child] / visits[child] + \
+                    math.sqrt(2 * log_visits / visits[child])
+                if value > best_value:
+                    best = child
+                    best_value = value
+            child = self.next_sibling_[child]
+        return best
+
+    def update(self, node, result, visits=1):
+        """Update the statistics of a node.
+        Args:
+            node (int): ID of the node.
+            result (float): The result of the simulation for the node.
+            visits (int): Number of playouts the result counts.
+        """
+        self.visits_[node] += visits
+        self.wins_[node] += result
+
+    def proven(self, node):
+        """Get the proven value of a node.
+        Args:
+            node (int): ID of the node.
+        Returns:
+            int: 1, 0 or -1 for a proven win, draw or loss of the player
+                who moved into the node, None if not proven.
+        """
+        value = self.proven_[node]
+        return None if value == NOT_PROVEN else value
+
+    def prove(self, node, value):
+        """Set the proven value of a node.
+        Args:
+            node (int): ID of the node.
+            value (int): 1, 0 or -1 for a win, draw or loss of the player
+                who moved into the node.
+        """
+        self.proven_[node] = value
+
+    def update_proof(self, node) -> bool:
+        """Derive the proven value of a node from its children.
+
+        The player to move wins if any child is a proven win for them.
+        Once all moves are expanded and proven, the node's value is the
+        negated value of the best child.
+
+        Args:
+            node (int): ID of the node.
+        Returns:
+            bool: True if the node is proven.
+        """
+        values = [self.proven_[child] for child in self.children(node)]
+        if 1 in values:
+            self.proven_[node] = -1
+        elif self.untried_[node] == 0 and NOT_PROVEN not in values:
+            self.proven_[node] = -max(values)
+        return self.proven_[node] != NOT_PROVEN
+
+    def __len__(self):
+        """Number of nodes in the store."""
+        return self.count_
+
+    def nbytes(self) -> int:
+        """Number of bytes allocated by the buffers.
+
+        Returns:
+            int: The allocated buffer size, including unused capacity.
+        """
+        return sum(buffer.itemsize * len(buffer) for buffer in
+                   (self.visits_, self.wins_, self.parent_, self.move_,
+                    self.first_child_, self.next_sibling_, self.untried_,
+                    self.proven_))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("This is the MCTS tree store module.")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rollout policies for the MCTS players of py-four-in-a-row:
+A Python implementation of the classic Four in a Row game.
+
+A rollout policy plays out a game from a position to its end during
+the simulation phase of MCTS. Policies are interchangeable, so their
+speed and strength can be compared:
+
+- RandomRollout plays uniformly random moves.
+- HeuristicRollout wins or blocks immediate threats, detected by
+  playing and undoing trial moves.
+- ThreatRollout plays the same moves as HeuristicRollout, but keeps
+  the threats of both players incrementally from the line index of
+  the board size, so win and block decisions are set lookups.
+"""
+import random
+from abc import ABC, abstractmethod
+from modules.lines import line_table
+
+
+class RolloutPolicy(ABC):
+    """Abstract base class for rollout policies."""
+
+    @abstractmethod
+    def rollout(self, state, rng=random) -> int:
+        """Play out the game from the given state.
+
+        Args:
+            state (Board): The game state to play out. It is left at
+                the end of the game; the caller undoes the moves.
+            rng (random.Random): Source of randomness for the rollout.
+        Returns:
+            int: The number of moves played.
+        """
+        # pass
+
+
+class RandomRollout(RolloutPolicy):
+    """Rollout policy playing uniformly random legal moves."""
+
+    def rollout(self, state, rng=random) -> int:
+        """Play random moves until the game is over.
+
+        Args:
+            state (Board): The game state to play out.
+            rng (random.Random): Source of randomness for the rollout.
+        Returns:
+            int: The number of moves played.
+        """
+        plies = 0
+        while not state.is_game_over():
+            state.play_move(rng.choice(state.get_legal_moves()))
+            plies += 1
+        return plies
+
+
+class HeuristicRollout(RolloutPolicy):
+    """Rollout policy checking for immediate wins and losses by trial moves.
+
+    Trial moves are played and undone on the state itself.
+    """
+
+    def rollout(self, state, rng=random) -> int:
+        """Play out the game: check for immediate win/loss, else play random.
+
+        Args:
+            state (Board): The game state to play out.
+            rng (random.Random): Source of randomness for the rollout.
+        Returns:
+            int: The number of moves played.
+        """
+        plies = 0
+        while not state.is_game_over():
+            legal_moves = state.get_legal_moves()
+            current_player = state.get_current_player()
+            state.play_move(self.select_move(
+                state, legal_moves, current_player, rng))
+            plies += 1
+        return plies
+
+    @staticmethod
+    def select_move(state, legal_moves, current_player, rng=random) -> int:
+        """Select the next rollout move.
+        Args:
+            state (Board): The game state. It is unchanged on return.
+            legal_moves (list[int]): The legal moves in the state.
+            current_player (int): The player to move.
+            rng (random.Random): Source of randomness for the move.
+        Returns:
+            int: The selected column index for the move.
+        """
+        # Try to win immediately
+        for move in legal_moves:
+            state.play_move(move)
+            winner = state.get_winner()
+            state.undo_move()
+            if winner == current_player:
+                return move
+        # Try to block opponent's immediate win
+        opponent = 2 if current_player == 1 else 1
+        for move in legal_moves:
+            state.play_move(move)
+            # After this move, check if opponent can win next
+            for opp_move in state.get_legal_moves():
+                state.play_move(opp_move)
+                winner = state.get_winner()
+                state.undo_move()
+                if winner == opponent:
+                    # This move allows opponent to win, so try next
+                    break
+            else:
+                # No immediate win for opponent after this move
+                state.undo_move()
+                return move
+            state.undo_move()
+        # No immediate win or block, play random
+        return rng.choice(legal_moves)
+
+
+class ThreatRollout(RolloutPolicy):
+    """Rollout policy keeping the threats of both players incrementally.
+
+    A threat of a player is an empty cell completing one of their lines.
+    The disc counts per line and the threat sets are set up once per
+    rollout and updated after each move, so the policy needs no trial
+    moves. It selects the same moves as HeuristicRollout.
+    """
+
+    def rollout(self, state, rng=random) -> int:
+        """Play out the game: win or block by threat lookups, else random.
+
+        Args:
+            state (Board): The game state to play out.
+            rng (random.Random): Source of randomness for the rollout.
+        Returns:
+            int: The number of moves played.
+        """
+        if state.is_game_over():
+            return 0
+        rows = state.rows_
+        table = line_table(rows, state.cols_, state.connect_)
+        lines = table.lines_
+        cell_lines = table.cell_lines_
+        # A line is a threat once all but one of its cells are owned
+        needed = state.connect_ - 1
+        owners, heights = state.get_cells()
+        counts = [None, [0] * len(lines), [0] * len(lines)]
+        for cell, owner in enumerate(owners):
+            if owner:
+                for index in cell_lines[cell]:
+                    counts[owner][index] += 1
+        threats = [None, set(), set()]
+        for index, line in enumerate(lines):
+            for player in (1, 2):
+                if counts[player][index] == needed and \
+                        counts[3 - player][index] == 0:
+                    threats[player].update(
+                        cell for cell in line if not owners[cell])
+
+        plies = 0
+        player = state.get_current_player()
+        while not state.is_game_over():
+            move = self._select_move(heights, rows, threats[player],
+                                     threats[3 - player], rng)
+            state.play_move(move)
+            plies += 1
+            cell = move * rows + heights[move]
+            heights[move] += 1
+            owners[cell] = player
+            threats[1].discard(cell)
+            threats[2].discard(cell)
+            own = counts[player]
+            other = counts[3 - player]
+            for index in cell_lines[cell]:
+                own[index] += 1
+                if own[index] == needed and other[index] == 0:
+                    threats[player].update(
+                        c for c in lines[index] if not owners[c])
+            player = 3 - player
+        return plies
+
+    @staticmethod
+    def _select_move(heights, rows, own_threats, opponent_threats,
+                     rng) -> int:
+        """Select the next rollout move from the threat sets.
+
+        A move is safe if the opponent cannot win right after it. The
+        first safe move is played unless a move wins at once.
+
+        Args:
+            heights (list[int]): Disc count per column.
+            rows (int): Number of rows of the board.
+            own_threats (set[int]): Threat cells of the player to move.
+            opponent_threats (set[int]): Threat cells of the opponent.
+            rng (random.Random): Source of randomness for the move.
+        Returns:
+            int: The selected column index for the move.
+        """
+        legal_moves = [col for col, height in enumerate(heights)
+                       if height < rows]
+        for col in legal_moves:
+            if col * rows + heights[col] in own_threats:
+                return col
+        blocks = [col for col in legal_moves
+                  if col * rows + heights[col] in opponent_threats]
+        if len(blocks) <= 1:
+            # With an opponent threat to block, only the block is safe
+            for col in blocks or legal_moves:
+                above = heights[col] + 1
+                if above >= rows or \
+                        col * rows + above not in opponent_threats:
+                    return col
+        return rng.choice(legal_moves)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("This is the rollout policies module.")
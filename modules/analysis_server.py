@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analysis server module for py-four-in-a-row:
+A Python implementation of the classic Four in a Row game.
+
+This module runs a long-lived server evaluating positions with warm
+engines, so analysing many positions pays the interpreter start-up,
+the imports and the engine set-up only once. Clients connect over a
+Unix or TCP socket and send one request per line, either
+
+- a JSON object: {"id": ..., "moves": [3, 3, 4] or "334",
+  "simulations": N, "time_limit_ms": MS}, all keys but "moves"
+  optional, or
+- a compact move string: the columns played as digits, e.g. "334".
+  The string itself is the id of the request.
+
+Requests are pipelined: a client may send any number of lines without
+waiting. The server answers each with one JSON line as soon as its
+position is evaluated, so the answers may arrive out of order and
+carry the id of their request. An answer holds the analysis of
+AiPlayerUctMcts.analyze, with the columns as string keys of "moves",
+and "cached" telling whether it came from the result cache, which
+also joins requests for a position already being evaluated. Invalid
+requests and failed evaluations are answered by
+{"id": ..., "error": "..."}, lines longer than the limit of the stream
+reader (64 KiB) by an error with id null.
+
+Usage:
+    python -m modules.analysis_server (--socket PATH | --port PORT)
+        [--host HOST] [--engine SPEC] [--workers N] [--cache-size N]
+
+    SPEC is "mcts[:SIMULATIONS]" or "mcts_tt[:SIMULATIONS]".
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from engines.ai_player_uct_mcts import AiPlayerUctMcts
+from modules.board import Board
+from modules.self_play import make_player, parse_spec
+
+# The warm engine of a worker, created once by _init_worker
+_ENGINE = None
+
+
+def _init_worker(spec):
+    """Create the engine of a worker.
+    Args:
+        spec (tuple): (player_class, kwargs) of the engine.
+    """
+    global _ENGINE  # pylint: disable=global-statement
+    with contextlib.redirect_stdout(io.StringIO()):
+        _ENGINE = make_player(spec, 1)
+
+
+def _analyze_worker(args) -> dict:
+    """Analyze one position with the worker's engine.
+    Args:
+        args (tuple): Moves played, simulations, time limit in
+            milliseconds, rows, columns and connect length.
+    Returns:
+        dict: The analysis, see AiPlayerUctMcts.analyze.
+    """
+    moves, simulations, time_limit_ms, rows, cols, connect = args
+    board = Board(rows=rows, cols=cols, connect=connect)
+    for move in moves:
+        board.play_move(move)
+    return _ENGINE.analyze(board, simulations, time_limit_ms)
+
+
+def parse_request(line) -> dict:
+    """Parse one request line.
+
+    Args:
+        line (str | bytes): A JSON object or a compact move string.
+    Returns:
+        dict: The request with keys "id", "moves" (list of columns),
+            "simulations" and "time_limit_ms".
+    Raises:
+        ValueError: If the line is not a valid request.
+    """
+    if isinstance(line, bytes):
+        line = line.decode()
+    line = line.strip()
+    if line.startswith("{"):
+        request = json.loads(line)
+        moves = request.get("moves")
+        request_id = request.get("id")
+    else:
+        request = {}
+        moves = line
+        request_id = line
+    if isinstance(moves, str):
+        if not moves.isdigit() and moves:
+            raise ValueError(f"Invalid move string: {moves!r}")
+        moves = [int(move) for move in moves]
+    if not isinstance(moves, list) or \
+            not all(isinstance(move, int) for move in moves):
+        raise ValueError("Missing or invalid moves.")
+    simulations = request.get("simulations")
+    time_limit_ms = request.get("time_limit_ms")
+    if simulations is not None and (
+            not isinstance(simulations, int) or
+            isinstance(simulations, bool) or simulations < 0):
+        raise ValueError(f"Invalid simulations: {simulations!r}")
+    if time_limit_ms is not None and (
+            not isinstance(time_limit_ms, (int, float)) or
+            isinstance(time_limit_ms, bool) or not time_limit_ms >= 0):
+        raise ValueError(f"Invalid time_limit_ms: {time_limit_ms!r}")
+    return {"id": request_id, "moves": moves, "simulations": simulations,
+            "time_limit_ms": time_limit_ms}
+
+
+class AnalysisServer:
+    """Server evaluating positions with warm engines in a worker pool."""
+
+    def __init__(self, spec=(AiPlayerUctMcts, {}), workers=1,
+                 cache_size=4096, max_pending=64, rows=6, cols=7,
+                 connect=4):
+        """Initialize the server.
+
+        Args:
+            spec (tuple): (player_class, kwargs) of the engine. The class
+                must provide analyze, like AiPlayerUctMcts.
+            workers (int): Number of worker processes, each with an
+                engine of its own. 0 analyzes in a thread of this
+                process, None uses one process per CPU.
+            cache_size (int): Maximum number of cached answers, 0 for
+                no cache.
+            max_pending (int): Maximum number of requests of one
+                connection in progress. Further lines are read once an
+                answer has been sent.
+            rows (int): Number of rows of the board.
+            cols (int): Number of columns of the board.
+            connect (int): Number of aligned discs needed to win.
+        """
+        if not hasattr(spec[0], "analyze"):
+            raise ValueError(f"{spec[0].__name__} cannot analyze positions.")
+        self.spec_ = spec
+        self.workers_ = workers
+        self.cache_size_ = cache_size
+        self.max_pending_ = max_pending
+        self.rows_ = rows
+        self.cols_ = cols
+        self.connect_ = connect
+        self.cache_ = OrderedDict()
+        self.connections_ = {}
+        self.executor_ = None
+        self.server_ = None
+
+    async def start(self, path=None, host="127.0.0.1", port=0):
+        """Start the worker pool and listen for connections.
+
+        Args:
+            path (str): Path of a Unix socket. None listens on TCP.
+            host (str): Host of the TCP socket.
+            port (int): Port of the TCP socket, 0 picks a free one.
+        Returns:
+            The socket address, the path or a (host, port) tuple.
+        """
+        if self.workers_ == 0:
+            self.executor_ = ThreadPoolExecutor(
+                max_workers=1, initializer=_init_worker,
+                initargs=(self.spec_,))
+        else:
+            self.executor_ = ProcessPoolExecutor(
+                max_workers=self.workers_, initializer=_init_worker,
+                initargs=(self.spec_,))
+        if path is not None:
+            self.server_ = await asyncio.start_unix_server(
+                self._serve_connection, path=path)
+        else:
+            self.server_ = await asyncio.start_server(
+                self._serve_connection, host=host, port=port)
+        return self.server_.sockets[0].getsockname()
+
+    async def close(self):
+        """Stop listening, close the connections and shut down the pool.
+
+        Requests in progress are still evaluated, their answers dropped.
+        """
+        if self.server_ is not None:
+            self.server_.close()
+            await self.server_.wait_closed()
+            self.server_ = None
+        for writer in self.connections_.values():
+            writer.close()
+        await asyncio.gather(*self.connections_)
+        if self.executor_ is not None:
+            self.executor_.shutdown()
+            self.executor_ = None
+
+    async def serve_forever(self):
+        """Serve connections until cancelled."""
+        await self.server_.serve_forever()
+
+    async def evaluate(self, request) -> dict:
+        """Evaluate the position of a parsed request.
+
+        Args:
+            request (dict): The request, see parse_request.
+        Returns:
+            dict: The answer, the analysis with "id" and "cached".
+        Raises:
+            ValueError: If a move is illegal.
+        """
+        board = Board(rows=self.rows_, cols=self.cols_,
+                      connect=self.connect_)
+        for move in request["moves"]:
+            if board.is_game_over() or not board.is_legal_move(move):
+                raise ValueError(f"Illegal move: {move}")
+            board.play_move(move)
+        # The cache holds futures, so a position requested again while it
+        # is evaluated waits for the running evaluation
+        key = (board.get_key(), request["simulations"],
+               request["time_limit_ms"])
+        future = self.cache_.get(key)
+        cached = future is not None
+        if cached:
+            self.cache_.move_to_end(key)
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self.executor_, _analyze_worker,
+                (request["moves"], request["simulations"],
+                 request["time_limit_ms"], self.rows_, self.cols_,
+                 self.connect_))
+            if self.cache_size_:
+                self.cache_[key] = future
+                if len(self.cache_) > self.cache_size_:
+                    self.cache_.popitem(last=False)
+        try:
+            analysis = await future
+        except Exception:
+            if self.cache_.get(key) is future:
+                del self.cache_[key]
+            raise
+        answer = {"id": request["id"], "cached": cached}
+        answer.update(analysis)
+        answer["moves"] = {str(move): stats
+                           for move, stats in analysis["moves"].items()}
+        return answer
+
+    async def _serve_connection(self, reader, writer):
+        """Answer the requests of one connection until it is closed.
+        Args:
+            reader (asyncio.StreamReader): The incoming lines.
+            writer (asyncio.StreamWriter): The outgoing answers.
+        """
+        pending = asyncio.Semaphore(self.max_pending_)
+        write_lock = asyncio.Lock()
+        tasks = set()
+        self.connections_[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as error:
+                    line = error.partial
+                except asyncio.LimitOverrunError as error:
+                    await self._skip_line(reader, error.consumed)
+                    await self._write({"id": None,
+                                       "error": "Request line too long."},
+                                      writer, write_lock)
+                    continue
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                await pending.acquire()
+                task = asyncio.create_task(
+                    self._answer(line, writer, write_lock, pending))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            del self.connections_[asyncio.current_task()]
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _answer(self, line, writer, write_lock, pending):
+        """Evaluate one request line and send its answer.
+        Args:
+            line (bytes): The request line.
+            writer (asyncio.StreamWriter): The outgoing answers.
+            write_lock (asyncio.Lock): Lock keeping answers apart.
+            pending (asyncio.Semaphore): Released once the answer is sent,
+                or if the request is abandoned.
+        """
+        request_id = None
+        try:
+            try:
+                request = parse_request(line)
+                request_id = request["id"]
+                answer = await self.evaluate(request)
+            except ValueError as error:
+                answer = {"id": request_id, "error": str(error)}
+            except Exception as error:  # pylint: disable=broad-except
+                # Every request is answered, or the client waits forever
+                answer = {"id": request_id,
+                          "error": f"{type(error).__name__}: {error}"}
+            await self._write(answer, writer, write_lock)
+        finally:
+            pending.release()
+
+    @staticmethod
+    async def _write(answer, writer, write_lock):
+        """Send one answer.
+        Args:
+            answer (dict): The answer.
+            writer (asyncio.StreamWriter): The outgoing answers.
+            write_lock (asyncio.Lock): Lock keeping answers apart.
+        """
+        async with write_lock:
+            writer.write(json.dumps(answer).encode() + b"\n")
+            await writer.drain()
+
+    @staticmethod
+    async def _skip_line(reader, consumed):
+        """Discard a line longer than the limit of the reader.
+        Args:
+            reader (asyncio.StreamReader): The incoming lines.
+            consumed (int): Number of buffered bytes of the line, see
+                asyncio.LimitOverrunError.
+        """
+        while True:
+            try:
+                await reader.readexactly(consumed)
+                await reader.readuntil(b"\n")
+                return
+            except asyncio.LimitOverrunError as error:
+                consumed = error.consumed
+            except asyncio.IncompleteReadError:
+                return
+
+
+async def analyze_remote(requests, path=None, host="127.0.0.1",
+                         port=None) -> list:
+    """Send requests to an analysis server and collect the answers.
+
+    All requests are sent at once, pipelined on one connection.
+
+    Args:
+        requests (list[dict | str]): JSON requests as dicts, or compact
+            move strings.
+        path (str): Path of the server's Unix socket. None uses TCP.
+        host (str): Host of the server's TCP socket.
+        port (int): Port of the server's TCP socket.
+    Returns:
+        list[dict]: The answers, in the order of their arrival.
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for request in requests:
+            line = request if isinstance(request, str) else \
+                json.dumps(request)
+            writer.write(line.encode() + b"\n")
+        await writer.drain()
+        return [json.loads(await reader.readline()) for _ in requests]
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def main(argv=None) -> int:
+    """Run an analysis server from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Serve position analyses over a local socket.")
+    address = parser.add_mutually_exclusive_group(required=True)
+    address.add_argument("--socket", help="path of a Unix socket")
+    address.add_argument("--port", type=int, help="port of a TCP socket")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="host of the TCP socket")
+    parser.add_argument("--engine", type=parse_spec, default="mcts",
+                        help="spec of the engine (default: mcts)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes (default: CPUs)")
+    parser.add_argument("--cache-size", type=int, default=4096,
+                        help="maximum number of cached answers")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = AnalysisServer(args.engine, workers=args.workers,
+                                cache_size=args.cache_size)
+        print(f"Serving analyses on "
+              f"{await server.start(args.socket, args.host, args.port)}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve())
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Asyncio game loop for py-four-in-a-row:
+A Python implementation of the classic Four in a Row game.
+
+This module plays games between AsyncPlayer instances as coroutines,
+so one process can host many concurrent games without a thread per
+game. CPU-bound engines are wrapped in ExecutorPlayer and share one
+executor; players waiting for human or remote input only await.
+"""
+import asyncio
+from modules.board import Board
+
+
+async def play_game_async(players, board_class=Board) -> dict:
+    """Play one game between two asynchronous players.
+
+    A player returning an illegal move forfeits the game.
+
+    Args:
+        players (list[AsyncPlayer]): The two players, player 1 first.
+        board_class (type): Board implementation to play on.
+    Returns:
+        dict: The game record with keys "winner" (0 for a draw),
+            "moves" (the columns played) and "forfeit" (bool).
+    """
+    board = board_class(current_player=1, players=players)
+    moves = []
+    forfeit = False
+    winner = 0
+    while not board.is_game_over():
+        player = board.get_current_player()
+        move = await players[player - 1].get_move(board)
+        if not board.is_legal_move(move):
+            forfeit = True
+            winner = 2 if player == 1 else 1
+            break
+        board.play_move(move)
+        moves.append(move)
+    if not forfeit:
+        winner = board.get_winner()
+    return {"winner": winner, "moves": moves, "forfeit": forfeit}
+
+
+async def run_games(pairings, board_class=Board, max_concurrent=None) -> list:
+    """Play many games concurrently.
+
+    Args:
+        pairings (list[list[AsyncPlayer]]): The two players of each game,
+            player 1 first. A player object takes part in one game only.
+        board_class (type): Board implementation to play on.
+        max_concurrent (int): Maximum number of games in progress at
+            once, None for no limit.
+    Returns:
+        list[dict]: The game records, in the order of the pairings.
+    """
+    limit = asyncio.Semaphore(max_concurrent or len(pairings) or 1)
+
+    async def limited(players):
+        async with limit:
+            return await play_game_async(players, board_class)
+
+    return await asyncio.gather(*(limited(players) for players in pairings))
+
+
+def play_games(pairings, board_class=Board, max_concurrent=None) -> list:
+    """Play many games concurrently from synchronous code.
+
+    Args:
+        pairings (list[list[AsyncPlayer]]): The two players of each game.
+        board_class (type): Board implementation to play on.
+        max_concurrent (int): Maximum number of games in progress at once.
+    Returns:
+        list[dict]: The game records, in the order of the pairings.
+    """
+    return asyncio.run(run_games(pairings, board_class, max_concurrent))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("This is the asyncio game loop module.")
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BitBoard module for py-four-in-a-row:
+A Python implementation of the classic Four in a Row game.
+
+This module defines the BitBoard class, a drop-in replacement for
+the Board class that stores the position as two integer masks (one per
+player) plus a height array per column. Each column uses (rows + 1)
+bits, the extra bit being a sentinel that keeps shifted lines from
+wrapping into the neighbouring column.
+"""
+from modules.board import Board
+from modules.lines import line_table
+
+
+class BitBoard(Board):
+    """Bitboard representation of the game board for Four in a Row.
+
+    Column heights are kept as the bit index of the next free cell.
+    """
+
+    __slots__ = ("stride_", "masks_")
+
+    _STATE = ("rows_", "cols_", "connect_", "lines_", "players", "stride_",
+              "current_player_", "masks_", "heights_", "ply_", "moves_",
+              "winner_", "winner_ply_")
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, rows=6, cols=7, current_player=1,
+                 players=None, connect=4):
+        """Initialize the board with given rows and columns.
+
+        Args:
+            rows (int): Number of rows of the board.
+            cols (int): Number of columns of the board.
+            current_player (int): The player to move first (1 or 2).
+            players (list[AbstractPlayer]): The players, for rendering.
+            connect (int): Number of aligned discs needed to win.
+        """
+        self.rows_ = rows
+        self.cols_ = cols
+        self.connect_ = connect
+        self.lines_ = line_table(rows, cols, connect)
+        self.players = players
+        self.stride_ = rows + 1
+        self.current_player_ = current_player
+        self.masks_ = [0, 0]
+        self.heights_ = [c * self.stride_ for c in range(cols)]
+        self.ply_ = 0
+        self.moves_ = []
+        self.winner_ = 0
+        self.winner_ply_ = 0
+
+    @property
+    def grid_(self):
+        """Grid view of the position, row 0 being the top row.
+
+        Returns:
+            list[list[int]]: Player number (1 or 2) per cell, 0 if empty.
+        """
+        grid = [[0 for _ in range(self.cols_)] for _ in range(self.rows_)]
+        for player, mask in enumerate(self.masks_, start=1):
+            for c in range(self.cols_):
+                for r in range(self.rows_):
+                    if mask >> (c * self.stride_ + r) & 1:
+                        grid[self.rows_ - 1 - r][c] = player
+        return grid
+
+    @property
+    def history_(self):
+        """History of moves played, as for the Board class.
+
+        Returns:
+            list[dict]: One {"row", "col", "player"} entry per move.
+        """
+        history = []
+        player = self.current_player_
+        heights = self.heights_[:]
+        # Walk back from the current position, so a history truncated
+        # by clone() still yields the right rows and players
+        for col in reversed(self.moves_):
+            player = 2 if player == 1 else 1
+            heights[col] -= 1
+            history.append({"row": self.rows_ - 1 -
+                            (heights[col] - col * self.stride_),
+                            "col": col,
+                            "player": player})
+        history.reverse()
+        return history
+
+    @property
+    def last_move_(self):
+        """The last move played, or None if no move was played yet."""
+        if not self.moves_:
+            return None
+        col = self.moves_[-1]
+        return {"row": self.rows_ - 1 - (self.heights_[col] - 1 -
+                                         col * self.stride_),
+                "col": col,
+                "player": 2 if self.current_player_ == 1 else 1}
+
+    def __getstate__(self):
+        """Return the state for pickling and copying.
+
+        The grid_ and key_ slots inherited from Board are left unset,
+        the grid and the key are derived from the masks.
+        """
+        return {name: getattr(self, name) for name in self._STATE}
+
+    def __setstate__(self, state):
+        """Restore the state saved by __getstate__."""
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def clone(self, history_limit=None):
+        """Create a copy of the position on this board.
+
+        Only the position state is copied. Players and any other
+        rendering metadata are shared with this board by reference.
+
+        Args:
+            history_limit (int): Maximum number of most recent moves kept
+                in the history of the clone. None keeps the full history.
+                Moves can only be undone as far as the history reaches.
+        Returns:
+            BitBoard: A new board holding the same position.
+        """
+        board = self.__class__.__new__(self.__class__)
+        board.rows_ = self.rows_
+        board.cols_ = self.cols_
+        board.connect_ = self.connect_
+        board.players = self.players
+        board.lines_ = self.lines_
+        board.stride_ = self.stride_
+        board.current_player_ = self.current_player_
+        board.masks_ = self.masks_[:]
+        board.heights_ = self.heights_[:]
+        board.ply_ = self.ply_
+        if history_limit is None:
+            board.moves_ = self.moves_[:]
+        elif history_limit > 0:
+            board.moves_ = self.moves_[-history_limit:]
+        else:
+            board.moves_ = []
+        board.winner_ = self.winner_
+        board.winner_ply_ = self.winner_ply_
+        return board
+
+    def get_key(self) -> int:
+        """Get a unique key of the position on the board.
+
+        Equal positions have equal keys, regardless of the move order
+        and of the board implementation.
+
+        Returns:
+            int: The position key.
+        """
+        return self.masks_[0] | self.masks_[1] << (self.cols_ * self.stride_)
+
+    def get_cells(self) -> tuple:
+        """Get the discs on the board by cell, as numbered by LineTable.
+
+        The cells are read from the set bits of the masks.
+
+        Returns:
+            tuple: (owners, heights), owners holding the player per cell
+                (0 if empty) and heights the disc count per column. Both
+                are fresh lists the caller may modify.
+        """
+        rows = self.rows_
+        stride = self.stride_
+        owners = [0] * (rows * self.cols_)
+        for player, mask in enumerate(self.masks_, start=1):
+            while mask:
+                low = mask & -mask
+                col, height = divmod(low.bit_length() - 1, stride)
+                owners[col * rows + height] = player
+                mask ^= low
+        heights = [bit - col * stride for col, bit in enumerate(self.heights_)]
+        return owners, heights
+
+    def get_legal_moves(self):
+        """Get a list of all legal moves (i.e., columns that
+        are not full).
+
+        Returns:
+            list[int]: List of column indices where a move can be played."""
+        if self.winner_ != 0:
+            return []
+        heights = self.heights_
+        tops = self.lines_.top_bits_
+        return [c for c in range(self.cols_) if heights[c] < tops[c]]
+
+    def is_legal_move(self, col):
+        """Check if a move in the given column is legal.
+
+        Args:
+            col (int): The column index to check.
+
+        Returns:
+            bool: True if the move is legal,
+                  False otherwise.
+        """
+        if col < 0 or col >= self.cols_:
+            return False
+        return self.heights_[col] < self.lines_.top_bits_[col]
+
+    def reset(self):
+        """Reset the board to the initial empty state."""
+        self.masks_ = [0, 0]
+        self.heights_ = [c * self.stride_ for c in range(self.cols_)]
+        self.ply_ = 0
+        self.moves_ = []
+        self.current_player_ = 1
+        self.winner_ = 0
+        self.winner_ply_ = 0
+
+    def undo_move(self):
+        """Undo the last move played on the board.
+
+        Returns:
+            bool: True if a move was undone,
+                  False if there was no move to undo.
+        """
+        if not self.moves_:
+            return False
+        if self.ply_ == self.winner_ply_:
+            self.winner_ = 0
+        self.ply_ -= 1
+        col = self.moves_.pop()
+        self.current_player_ = 2 if self.current_player_ == 1 else 1
+        self.heights_[col] -= 1
+        self.masks_[self.current_player_ - 1] ^= 1 << self.heights_[col]
+        return True
+
+    def play_move(self, col):
+        """Play a move for the given player in the specified column.
+
+        Args:
+            col (int): The column index where the player wants to play.
+        Returns:
+            bool: True if the move was successful, False if the column is full.
+        """
+        heights = self.heights_
+        bit = heights[col]
+        if bit >= self.lines_.top_bits_[col]:
+            return False
+        player = self.current_player_
+        masks = self.masks_
+        mask = masks[player - 1] | 1 << bit
+        masks[player - 1] = mask
+        heights[col] = bit + 1
+        self.ply_ += 1
+        self.moves_.append(col)
+        # A line needs connect discs of the player
+        if self.winner_ == 0 and mask.bit_count() >= self.connect_ and \
+                self._has_line(mask):
+            self.winner_ = player
+            self.winner_ply_ = self.ply_
+        self.current_player_ = 3 - player
+        return True
+
+    def _has_line(self, mask) -> bool:
+        """Check whether the given mask contains connect aligned discs.
+
+        Runs of aligned discs are found by shifting the mask onto itself,
+        doubling the run length per step, see LineTable.shift_steps_.
+
+        Args:
+            mask (int): Bitmask of one player's discs.
+        Returns:
+            bool: True if connect discs are aligned in any direction.
+        """
+        # Vertical, horizontal, and both diagonal directions
+        shift_steps = self.lines_.shift_steps_
+        if len(shift_steps[0]) == 2:
+            # Unrolled for connect 3 and 4, the common case
+            for first, second in shift_steps:
+                runs = mask & mask >> first
+                if runs & runs >> second:
+                    return True
+            return False
+        for steps in shift_steps:
+            runs = mask
+            for step in steps:
+                runs &= runs >> step
+            if runs:
+                return True
+        return False
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("This is the BitBoard module.")
@@ -6,22 +6,295 @@ A Python implementation of the classic Four in a Row game.
 
 This module defines the Board class, which represents the game board
 and provides methods to manipulate and query the board state.
+
+Positions are serialized as move strings, one character per column
+played, or as fixed-size binary records holding the position key (see
+Board.get_key) as POSITION_BYTES big-endian bytes.
 """
+from modules.lines import line_table
+
+# Characters of the columns in move strings
+MOVE_CHARS = "0123456789abcdefghijklmnopqrstuvwxyz"
+# Size of a binary position record
+POSITION_BYTES = 16
 
 
 class Board:
-    """Class representing the game board for Four in a Row."""
+    """Class representing the game board for Four in a Row.
+
+    Moves are recorded as their column only. The row and player of a
+    move follow from the column heights and the alternating players,
+    so history_ and last_move_ are derived on demand.
+    """
+
+    __slots__ = ("rows_", "cols_", "connect_", "lines_", "grid_",
+                 "heights_", "ply_", "key_", "moves_", "current_player_",
+                 "players", "winner_", "winner_ply_")
 
     def __init__(self, rows=6, cols=7, current_player=1,
-                 players=None):
-        """Initialize the board with given rows and columns."""
+                 players=None, connect=4):
+        """Initialize the board with given rows and columns.
+
+        Args:
+            rows (int): Number of rows of the board.
+            cols (int): Number of columns of the board.
+            current_player (int): The player to move first (1 or 2).
+            players (list[AbstractPlayer]): The players, for rendering.
+            connect (int): Number of aligned discs needed to win.
+        """
         self.rows_ = rows
         self.cols_ = cols
+        self.connect_ = connect
+        self.lines_ = line_table(rows, cols, connect)
         self.grid_ = [[0 for _ in range(cols)] for _ in range(rows)]
-        self.last_move_ = {"row": None, "col": None, "player": None}
-        self.history_ = []
+        self.heights_ = [0] * cols
+        self.ply_ = 0
+        self.key_ = 0
+        self.moves_ = []
         self.current_player_ = current_player
         self.players = players
+        self.winner_ = 0
+        self.winner_ply_ = 0
+
+    @property
+    def history_(self):
+        """History of moves played.
+
+        Returns:
+            list[dict]: One {"row", "col", "player"} entry per move.
+        """
+        history = []
+        player = self.current_player_
+        heights = self.heights_[:]
+        # Walk back from the current position, so a history truncated
+        # by clone() still yields the right rows and players
+        for col in reversed(self.moves_):
+            player = 2 if player == 1 else 1
+            heights[col] -= 1
+            history.append({"row": self.rows_ - 1 - heights[col],
+                            "col": col,
+                            "player": player})
+        history.reverse()
+        return history
+
+    @property
+    def last_move_(self):
+        """The last move played, or None if no move was played yet.
+
+        Returns:
+            dict: The {"row", "col", "player"} entry of the last move.
+        """
+        if not self.moves_:
+            return None
+        col = self.moves_[-1]
+        return {"row": self.rows_ - self.heights_[col],
+                "col": col,
+                "player": 2 if self.current_player_ == 1 else 1}
+
+    @classmethod
+    def from_board(cls, board):
+        """Create a board of this class holding the position of another board.
+
+        The position before the known history is rebuilt from its key,
+        see from_key, and the known moves are replayed on top of it, so
+        boards with a truncated or no history, see clone and from_bytes,
+        are converted as well. Any board implementation providing clone,
+        undo_move, get_key and moves_ can be converted.
+
+        Args:
+            board (Board): The board to convert.
+        Returns:
+            Board: A new board of this class with the same position and
+                the same known history.
+        """
+        base = board.clone()
+        while base.undo_move():
+            pass
+        new_board = cls.from_key(base.get_key(), rows=board.rows_,
+                                 cols=board.cols_, connect=board.connect_,
+                                 current_player=base.get_current_player(),
+                                 players=board.players)
+        for col in board.moves_:
+            new_board.play_move(col)
+        return new_board
+
+    @classmethod
+    def from_key(cls, key, rows=6, cols=7, connect=4, current_player=None,
+                 players=None):
+        """Create a board from a position key.
+
+        The board has no history, as after clone(history_limit=0).
+
+        Args:
+            key (int): The position key, see get_key.
+            rows (int): Number of rows of the board.
+            cols (int): Number of columns of the board.
+            connect (int): Number of aligned discs needed to win.
+            current_player (int): The player to move. None assumes that
+                player 1 moved first, so the player to move follows from
+                the number of discs.
+            players (list[AbstractPlayer]): The players, for rendering.
+        Returns:
+            Board: A new board of this class holding the position.
+        Raises:
+            ValueError: If the key is not a reachable position.
+        """
+        board = cls(rows=rows, cols=cols, players=players, connect=connect)
+        stride = rows + 1
+        half = cols * stride
+        masks = [key & ((1 << half) - 1), key >> half]
+        lead = masks[0].bit_count() - masks[1].bit_count()
+        if current_player is None:
+            current_player = 1 if lead == 0 else 2
+        # The player to move has no more discs than the opponent
+        valid_leads = (0, -1) if current_player == 1 else (0, 1)
+        if key < 0 or masks[1] >> half or masks[0] & masks[1] or \
+                current_player not in (1, 2) or lead not in valid_leads:
+            raise ValueError("Not a valid position key.")
+        discs = masks[0] | masks[1]
+        for col in range(cols):
+            # The discs of a column must be stacked from the bottom
+            stack = discs >> (col * stride) & ((1 << stride) - 1)
+            if stack & (stack + 1) or stack >> rows:
+                raise ValueError("Not a valid position key.")
+            for height in range(stack.bit_length()):
+                board.current_player_ = \
+                    1 if masks[0] >> (col * stride + height) & 1 else 2
+                board.play_move(col)
+        board.current_player_ = current_player
+        board.moves_ = []
+        return board
+
+    @classmethod
+    def from_moves(cls, moves, rows=6, cols=7, connect=4, players=None):
+        """Create a board by playing a sequence of moves, player 1 first.
+
+        Args:
+            moves (str | list[int]): A move string, see to_moves, or a
+                list of column indices.
+            rows (int): Number of rows of the board.
+            cols (int): Number of columns of the board.
+            connect (int): Number of aligned discs needed to win.
+            players (list[AbstractPlayer]): The players, for rendering.
+        Returns:
+            Board: A new board of this class with the moves played.
+        Raises:
+            ValueError: If a move is not a legal column.
+        """
+        board = cls(rows=rows, cols=cols, players=players, connect=connect)
+        for move in moves:
+            col = MOVE_CHARS.find(move) if isinstance(move, str) else move
+            if not board.is_legal_move(col):
+                raise ValueError(f"Illegal move: {move!r}")
+            board.play_move(col)
+        return board
+
+    def to_moves(self) -> str:
+        """Encode the moves played as a move string.
+
+        Each move is the character of its column in MOVE_CHARS, so
+        standard boards give strings of digits such as "3342".
+
+        Returns:
+            str: The move string.
+        Raises:
+            ValueError: If the history is incomplete, see clone, or the
+                board has too many columns.
+        """
+        if len(self.moves_) != self.ply_:
+            raise ValueError("The history of the board is incomplete.")
+        if self.cols_ > len(MOVE_CHARS):
+            raise ValueError(f"Move strings support at most "
+                             f"{len(MOVE_CHARS)} columns.")
+        return "".join(MOVE_CHARS[col] for col in self.moves_)
+
+    @classmethod
+    def from_bytes(cls, data, rows=6, cols=7, connect=4, players=None):
+        """Create a board from a binary position record.
+
+        The board has no history, as after clone(history_limit=0).
+        Player 1 is assumed to have moved first, so the player to move
+        follows from the number of discs.
+
+        Args:
+            data (bytes): The record, see to_bytes.
+            rows (int): Number of rows of the board.
+            cols (int): Number of columns of the board.
+            connect (int): Number of aligned discs needed to win.
+            players (list[AbstractPlayer]): The players, for rendering.
+        Returns:
+            Board: A new board of this class holding the position.
+        Raises:
+            ValueError: If the record is not a reachable position.
+        """
+        board = cls(rows=rows, cols=cols, players=players, connect=connect)
+        board._check_record_size()
+        if len(data) != POSITION_BYTES:
+            raise ValueError(f"A position record has {POSITION_BYTES} "
+                             f"bytes, not {len(data)}.")
+        try:
+            return cls.from_key(int.from_bytes(data, "big"), rows, cols,
+                                connect, players=players)
+        except ValueError:
+            raise ValueError("Not a valid position record.") from None
+
+    def to_bytes(self) -> bytes:
+        """Encode the position as a binary record.
+
+        The record is the position key as POSITION_BYTES big-endian
+        bytes, so records sort like keys. The history, the players and
+        the first player are not stored.
+
+        Returns:
+            bytes: The position record.
+        Raises:
+            ValueError: If the board is too large for a record.
+        """
+        self._check_record_size()
+        return self.get_key().to_bytes(POSITION_BYTES, "big")
+
+    def _check_record_size(self):
+        """Check that positions of the board size fit into a record.
+        Raises:
+            ValueError: If the key has more bits than a record.
+        """
+        if 2 * self.cols_ * (self.rows_ + 1) > 8 * POSITION_BYTES:
+            raise ValueError(f"A {self.rows_}x{self.cols_} board does not "
+                             f"fit into a position record.")
+
+    def clone(self, history_limit=None):
+        """Create a copy of the position on this board.
+
+        Only the position state is copied. Players and any other
+        rendering metadata are shared with this board by reference.
+
+        Args:
+            history_limit (int): Maximum number of most recent moves kept
+                in the history of the clone. None keeps the full history.
+                Moves can only be undone as far as the history reaches.
+        Returns:
+            Board: A new board holding the same position.
+        """
+        board = self.__class__.__new__(self.__class__)
+        board.rows_ = self.rows_
+        board.cols_ = self.cols_
+        board.connect_ = self.connect_
+        board.lines_ = self.lines_
+        board.grid_ = [row[:] for row in self.grid_]
+        board.heights_ = self.heights_[:]
+        board.ply_ = self.ply_
+        board.key_ = self.key_
+        if history_limit is None:
+            board.moves_ = self.moves_[:]
+        elif history_limit > 0:
+            board.moves_ = self.moves_[-history_limit:]
+        else:
+            board.moves_ = []
+        board.current_player_ = self.current_player_
+        board.players = self.players
+        board.winner_ = self.winner_
+        board.winner_ply_ = self.winner_ply_
+        return board
 
     def get_legal_moves(self):
         """Get a list of all legal moves (i.e., columns that
@@ -29,9 +302,9 @@ class Board:
 
         Returns:
             list[int]: List of column indices where a move can be played."""
-        if self.is_full() or self.check_winner() != 0:
+        if self.winner_ != 0 or self.is_full():
             return []
-        return [c for c in range(self.cols_) if self.grid_[0][c] == 0]
+        return [c for c in range(self.cols_) if self.heights_[c] < self.rows_]
 
     def is_legal_move(self, col):
         """Check if a move in the given column is legal.
@@ -45,9 +318,7 @@ class Board:
         """
         if col < 0 or col >= self.cols_:
             return False
-        if self.grid_[0][col] != 0:
-            return False
-        return True
+        return self.heights_[col] < self.rows_
 
     def is_game_over(self):
         """Check if the game is over (win or draw).
@@ -55,15 +326,19 @@ class Board:
         Returns:
             bool: True if the game is over, False otherwise.
         """
-        return self.check_winner() != 0 or self.is_full()
+        return self.winner_ != 0 or self.is_full()
 
     def reset(self):
         """Reset the board to the initial empty state."""
         self.grid_ = [[0 for _ in range(self.cols_)]
                       for _ in range(self.rows_)]
-        self.last_move_ = None
-        self.history_ = []
+        self.heights_ = [0] * self.cols_
+        self.ply_ = 0
+        self.key_ = 0
+        self.moves_ = []
         self.current_player_ = 1
+        self.winner_ = 0
+        self.winner_ply_ = 0
 
     def undo_move(self):
         """Undo the last move played on the board.
@@ -72,12 +347,18 @@ class Board:
             bool: True if a move was undone,
                   False if there was no move to undo.
         """
-        if not self.history_:
+        if not self.moves_:
             return False
-        history_entry = self.history_.pop()
-        self.grid_[history_entry["row"]][history_entry["col"]] = 0
-        self.current_player_ = history_entry["player"]
-        self.last_move_ = self.history_[-1] if self.history_ else None
+        if self.ply_ == self.winner_ply_:
+            self.winner_ = 0
+        col = self.moves_.pop()
+        player = 2 if self.current_player_ == 1 else 1
+        height = self.heights_[col] - 1
+        self.grid_[self.rows_ - 1 - height][col] = 0
+        self.heights_[col] = height
+        self.ply_ -= 1
+        self.key_ ^= self._key_bit(col, height, player)
+        self.current_player_ = player
         return True
 
     def play_move(self, col):
@@ -88,59 +369,166 @@ class Board:
         Returns:
             bool: True if the move was successful, False if the column is full.
         """
-        for r in reversed(range(self.rows_)):
-            if self.grid_[r][col] == 0:
-                self.grid_[r][col] = self.current_player_
-                self.last_move_ = {
-                        "row": r,
-                        "col": col,
-                        "player": self.current_player_
-                    }
-                self.history_.append(self.last_move_)
-                self.current_player_ = 2 if self.current_player_ == 1 else 1
-                return True
-        return False
+        if self.heights_[col] >= self.rows_:
+            return False
+        r = self.rows_ - 1 - self.heights_[col]
+        self.grid_[r][col] = self.current_player_
+        self.key_ |= self._key_bit(col, self.heights_[col],
+                                   self.current_player_)
+        self.heights_[col] += 1
+        self.ply_ += 1
+        self.moves_.append(col)
+        if self.winner_ == 0 and self._is_winning_disc(r, col):
+            self.winner_ = self.current_player_
+            self.winner_ply_ = self.ply_
+        self.current_player_ = 2 if self.current_player_ == 1 else 1
+        return True
 
     def is_full(self):
         """Check if the board is full."""
-        return all(self.grid_[0][c] != 0 for c in range(self.cols_))
+        return self.ply_ >= self.rows_ * self.cols_
+
+    def _key_bit(self, col, height, player) -> int:
+        """Get the key bit of a disc.
+
+        The key uses the BitBoard layout: (rows + 1) bits per column,
+        the discs of player 2 above those of player 1.
+
+        Args:
+            col (int): The column index of the disc.
+            height (int): The number of discs below it in the column.
+            player (int): The player owning the disc (1 or 2).
+        Returns:
+            int: The bit representing the disc in the position key.
+        """
+        return 1 << (col * (self.rows_ + 1) + height +
+                     (player - 1) * self.cols_ * (self.rows_ + 1))
+
+    def get_key(self) -> int:
+        """Get a unique key of the position on the board.
+
+        The key is maintained incrementally by play_move and undo_move.
+        Equal positions have equal keys, regardless of the move order
+        and of the board implementation.
+
+        Returns:
+            int: The position key.
+        """
+        return self.key_
+
+    def get_cells(self) -> tuple:
+        """Get the discs on the board by cell, as numbered by LineTable.
+
+        Returns:
+            tuple: (owners, heights), owners holding the player per cell
+                (0 if empty) and heights the disc count per column. Both
+                are fresh lists the caller may modify.
+        """
+        rows = self.rows_
+        owners = [0] * (rows * self.cols_)
+        for r, row in enumerate(self.grid_):
+            height = rows - 1 - r
+            for col, player in enumerate(row):
+                if player:
+                    owners[col * rows + height] = player
+        return owners, self.heights_[:]
+
+    def get_mirrored_key(self) -> int:
+        """Get the key of the position mirrored left to right.
+
+        Returns:
+            int: The position key with the columns in reverse order.
+        """
+        key = self.get_key()
+        stride = self.rows_ + 1
+        column = (1 << stride) - 1
+        # One column of both players at once, from the left
+        columns = column | column << (self.cols_ * stride)
+        shift = (self.cols_ - 1) * stride
+        mirrored = 0
+        while shift >= 0:
+            mirrored |= (key & columns) << shift
+            key >>= stride
+            shift -= stride
+        return mirrored
+
+    def get_canonical_key(self) -> int:
+        """Get a key shared by a position and its mirror image.
+
+        A position and its mirror image have the same value, with
+        mirrored moves, so they may share table or book entries.
+
+        Returns:
+            int: The smaller of the key and the mirrored key.
+        """
+        return min(self.get_key(), self.get_mirrored_key())
+
+    def get_symmetric_key(self) -> tuple:
+        """Get the canonical key and the reflection leading to it.
+
+        Moves stored under the canonical key are mapped back to this
+        board by mirror_move if the position was mirrored.
+
+        Returns:
+            tuple: (key, mirrored), the canonical key and True if it is
+                the key of the mirrored position.
+        """
+        key = self.get_key()
+        mirrored_key = self.get_mirrored_key()
+        if mirrored_key < key:
+            return mirrored_key, True
+        return key, False
+
+    def is_symmetric(self) -> bool:
+        """Check whether the position equals its mirror image.
+
+        Returns:
+            bool: True if the position is left-right symmetric.
+        """
+        return self.get_key() == self.get_mirrored_key()
+
+    def mirror_move(self, col) -> int:
+        """Mirror a column left to right.
+
+        Args:
+            col (int): The column index.
+        Returns:
+            int: The column index in the mirrored position.
+        """
+        return self.cols_ - 1 - col
+
+    def _is_winning_disc(self, row, col) -> bool:
+        """Check whether the disc at the given cell completes a line.
+
+        Only the lines passing through the given cell are inspected,
+        as listed by the line index of the board size.
+
+        Args:
+            row (int): The row index of the disc.
+            col (int): The column index of the disc.
+        Returns:
+            bool: True if the disc is part of connect aligned discs.
+        """
+        grid = self.grid_
+        player = grid[row][col]
+        for line in self.lines_.grid_lines_[row][col]:
+            for r, c in line:
+                if grid[r][c] != player:
+                    break
+            else:
+                return True
+        return False
 
     def check_winner(self) -> int:
         """Check for a winner.
 
+        The winner is detected incrementally by play_move and
+        cached until the winning move is undone.
+
         Returns:
             int: The player number (1 or 2) if there is a winner, 0 otherwise.
         """
-        # Check horizontal, vertical, and diagonal for a winner
-        for r in range(self.rows_):
-            for c in range(self.cols_ - 3):
-                if self.grid_[r][c] != 0 and all(
-                        self.grid_[r][c + i] == self.grid_[r][c]
-                        for i in range(4)):
-                    return self.grid_[r][c]
-
-        for c in range(self.cols_):
-            for r in range(self.rows_ - 3):
-                if self.grid_[r][c] != 0 and all(
-                        self.grid_[r + i][c] == self.grid_[r][c]
-                        for i in range(4)):
-                    return self.grid_[r][c]
-
-        for r in range(self.rows_ - 3):
-            for c in range(self.cols_ - 3):
-                if self.grid_[r][c] != 0 and all(
-                        self.grid_[r + i][c + i] == self.grid_[r][c]
-                        for i in range(4)):
-                    return self.grid_[r][c]
-
-        for r in range(3, self.rows_):
-            for c in range(self.cols_ - 3):
-                if self.grid_[r][c] != 0 and all(
-                        self.grid_[r - i][c + i] == self.grid_[r][c]
-                        for i in range(4)):
-                    return self.grid_[r][c]
-
-        return 0  # No winner yet
+        return self.winner_
 
     def get_winner(self) -> int:
         """Get the winner of the game.
@@ -148,7 +536,7 @@ class Board:
         Returns:
             int: The player number (1 or 2) if there is a winner, 0 otherwise.
         """
-        return self.check_winner()
+        return self.winner_
 
     def get_current_player(self) -> int:
         """Get the current player to move.
@@ -176,8 +564,8 @@ class Board:
                    2: self.players[1].symbol_}
         rows = [" | ".join(symbols[cell] for cell in row)
                 for row in self.grid_]
-        rows.append("--+---+---+---+---+---+--")
-        rows.append("0 | 1 | 2 | 3 | 4 | 5 | 6")
+        rows.append("+".join(["--"] + ["---"] * (self.cols_ - 2) + ["--"]))
+        rows.append(" | ".join(str(col % 10) for col in range(self.cols_)))
         name = self.players[self.current_player_ - 1].name_
         symbol = self.players[self.current_player_ - 1].symbol_
         if not self.is_game_over():
@@ -188,5 +576,40 @@ class Board:
         return "\n".join(rows)
 
 
+def encode_positions(boards) -> bytes:
+    """Encode positions as concatenated binary records.
+
+    Args:
+        boards (list[Board]): The boards, all of one size.
+    Returns:
+        bytes: One record per board, see Board.to_bytes.
+    """
+    return b"".join(board.to_bytes() for board in boards)
+
+
+def decode_positions(data, rows=6, cols=7, connect=4,
+                     board_class=Board) -> list:
+    """Decode concatenated binary position records.
+
+    Args:
+        data (bytes): The records, see encode_positions.
+        rows (int): Number of rows of the boards.
+        cols (int): Number of columns of the boards.
+        connect (int): Number of aligned discs needed to win.
+        board_class (type): Board implementation to create.
+    Returns:
+        list[Board]: One board per record, without history.
+    Raises:
+        ValueError: If the data is not made of valid records.
+    """
+    if len(data) % POSITION_BYTES:
+        raise ValueError(f"The data is not made of {POSITION_BYTES}-byte "
+                         f"records.")
+    view = memoryview(data)
+    return [board_class.from_bytes(view[offset:offset + POSITION_BYTES],
+                                   rows, cols, connect)
+            for offset in range(0, len(data), POSITION_BYTES)]
+
+
 if __name__ == "__main__":  # pragma: no cover
     print("This is the Board module.")
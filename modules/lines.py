@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lines module for py-four-in-a-row:
+A Python implementation of the classic Four in a Row game.
+
+This module defines the LineTable class, the index of all winning
+lines of a board size, i.e. all horizontal, vertical and diagonal
+windows of connect cells. Tables are built once per
+(rows, cols, connect) and cached by line_table().
+
+Cells are numbered column by column from the bottom, so the cell of
+the disc at height h in column c is c * rows + h. Bitboards (see
+BitBoard) use (rows + 1) bits per column instead, the table holds the
+shifts finding their lines as well.
+"""
+import functools
+
+
+class LineTable:
+    """Index of the winning lines of a board size."""
+
+    __slots__ = ("rows_", "cols_", "connect_", "lines_", "coords_",
+                 "cell_lines_", "grid_lines_", "shift_steps_", "top_bits_")
+
+    def __init__(self, rows, cols, connect=4):
+        """Build the index of all lines of connect cells.
+
+        Prefer line_table(), which caches the index per board size.
+
+        Args:
+            rows (int): Number of rows of the board.
+            cols (int): Number of columns of the board.
+            connect (int): Number of aligned discs needed to win.
+        """
+        self.rows_ = rows
+        self.cols_ = cols
+        self.connect_ = connect
+        lines = []
+        for col in range(cols):
+            for height in range(rows):
+                # Horizontal, vertical, and both diagonal directions
+                for d_col, d_height in ((1, 0), (0, 1), (1, 1), (1, -1)):
+                    end_col = col + (connect - 1) * d_col
+                    end_height = height + (connect - 1) * d_height
+                    if end_col < cols and 0 <= end_height < rows:
+                        lines.append(tuple(
+                            (col + i * d_col) * rows + height + i * d_height
+                            for i in range(connect)))
+        cell_lines = [[] for _ in range(rows * cols)]
+        for index, line in enumerate(lines):
+            for cell in line:
+                cell_lines[cell].append(index)
+        # Lines as tuples of cells
+        self.lines_ = tuple(lines)
+        # Lines as tuples of (row, col) grid coordinates, row 0 on top
+        self.coords_ = tuple(tuple((rows - 1 - cell % rows, cell // rows)
+                                   for cell in line) for line in lines)
+        # Indices of the lines through each cell
+        self.cell_lines_ = tuple(tuple(indices) for indices in cell_lines)
+        # Grid coordinates of the lines through each grid cell
+        self.grid_lines_ = tuple(
+            tuple(tuple(self.coords_[index]
+                        for index in cell_lines[col * rows + rows - 1 - row])
+                  for col in range(cols))
+            for row in range(rows))
+        # Bitboard shifts per direction: ANDing a mask with itself
+        # shifted by each step leaves a bit per run of connect discs
+        stride = rows + 1
+        steps = []
+        length = 1
+        while 2 * length <= connect:
+            steps.append(length)
+            length *= 2
+        if length < connect:
+            steps.append(connect - length)
+        self.shift_steps_ = tuple(
+            tuple(step * shift for step in steps)
+            for shift in (1, stride, stride + 1, stride - 1))
+        # Bitboard index of the sentinel bit above each column
+        self.top_bits_ = tuple(col * stride + rows for col in range(cols))
+
+    def __len__(self):
+        """Number of lines on the board."""
+        return len(self.lines_)
+
+    def __copy__(self):
+        """Tables are read-only, copies share them."""
+        return self
+
+    def __deepcopy__(self, memo):
+        """Tables are read-only, copies share them."""
+        return self
+
+
+def line_table(rows, cols, connect=4) -> LineTable:
+    """Get the cached line index of a board size.
+
+    Args:
+        rows (int): Number of rows of the board.
+        cols (int): Number of columns of the board.
+        connect (int): Number of aligned discs needed to win.
+    Returns:
+        LineTable: The shared, read-only line index.
+    """
+    # Pass all arguments positionally, so they form one cache key
+    return _cached_line_table(rows, cols, connect)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_line_table(rows, cols, connect) -> LineTable:
+    """Build the line index of a board size once."""
+    return LineTable(rows, cols, connect)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("This is the Lines module.")
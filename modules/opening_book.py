@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Opening book module for py-four-in-a-row:
+A Python implementation of the classic Four in a Row game.
+
+This module builds opening books offline and reads them back. A book
+holds the best move and score of every position up to a number of
+plies, found by AiPlayerSolver. It is stored as a binary file:
+
+- a 12-byte header: magic b"C4OB", format version, rows, cols,
+  connect and the number of records,
+- the records sorted by position key, each an 18-byte record of the
+  canonical key (see Board.get_symmetric_key) as 16 big-endian bytes,
+  the move and the score (signed bytes, the score from the view of the
+  player to move).
+
+A position and its mirror image share one record, its move given for
+the position of the canonical key and mirrored back on lookup.
+
+OpeningBook maps the file into memory and finds positions by binary
+search, so opening a book costs neither load time nor memory per
+process beyond the pages actually read.
+
+Usage:
+    python -m modules.opening_book --output BOOK [--plies N]
+        [--time-limit-ms MS] [--workers N] [--rows R] [--cols C]
+        [--connect N]
+"""
+import argparse
+import contextlib
+import io
+import mmap
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from engines.ai_player_solver import AiPlayerSolver
+from modules.bitboard import BitBoard
+
+MAGIC = b"C4OB"
+VERSION = 2
+HEADER = struct.Struct("<4sBBBBI")
+RECORD = struct.Struct(">16sbb")
+KEY_BYTES = 16
+
+
+def _key_bytes(key) -> bytes:
+    """Encode a position key as sortable bytes.
+    Args:
+        key (int): The position key.
+    Returns:
+        bytes: The key as 16 big-endian bytes.
+    """
+    return key.to_bytes(KEY_BYTES, "big")
+
+
+def opening_positions(plies, rows=6, cols=7, connect=4) -> list:
+    """List the undecided positions up to a number of plies.
+
+    Args:
+        plies (int): Maximum number of moves played.
+        rows (int): Number of rows of the board.
+        cols (int): Number of columns of the board.
+        connect (int): Number of aligned discs needed to win.
+    Returns:
+        list[list[int]]: The moves leading to each position, one move
+            order per position and its mirror image, ordered by ply.
+    """
+    board = BitBoard(rows=rows, cols=cols, connect=connect)
+    positions = [[]]
+    seen = {board.get_canonical_key()}
+    frontier = [[]]
+    for _ in range(plies):
+        next_frontier = []
+        for moves in frontier:
+            for move in moves:
+                board.play_move(move)
+            for col in board.get_legal_moves():
+                board.play_move(col)
+                key = board.get_canonical_key()
+                if key not in seen and not board.is_game_over():
+                    seen.add(key)
+                    next_frontier.append(moves + [col])
+                board.undo_move()
+            for _ in moves:
+                board.undo_move()
+        positions.extend(next_frontier)
+        frontier = next_frontier
+    return positions
+
+
+def _solve_position(args) -> tuple:
+    """Find the best move of a position, possibly in a worker process.
+    Args:
+        args (tuple): Rows, columns, connect length, moves played and
+            the time limit in milliseconds.
+    Returns:
+        tuple: (key, move, score) of the position, the key and move for
+            the position of the canonical key.
+    """
+    rows, cols, connect, moves, time_limit_ms = args
+    board = BitBoard(rows=rows, cols=cols, connect=connect)
+    for move in moves:
+        board.play_move(move)
+    with contextlib.redirect_stdout(io.StringIO()):
+        solver = AiPlayerSolver(time_limit_ms=time_limit_ms)
+    move = solver.solve(board)
+    key, mirrored = board.get_symmetric_key()
+    return key, board.mirror_move(move) if mirrored else move, \
+        solver.score_
+
+
+def build_book(path, plies, time_limit_ms=1000, rows=6, cols=7, connect=4,
+               workers=None) -> int:
+    """Build an opening book and write it to a file.
+
+    Every undecided position up to the given number of plies is
+    searched by AiPlayerSolver; the searches are spread over a
+    process pool.
+
+    Args:
+        path (str): Path of the book file to write.
+        plies (int): Maximum number of moves played in book positions.
+        time_limit_ms (float): Search time per position in milliseconds.
+            None solves every position exactly.
+        rows (int): Number of rows of the board.
+        cols (int): Number of columns of the board.
+        connect (int): Number of aligned discs needed to win.
+        workers (int): Number of worker processes, None for one per CPU.
+    Returns:
+        int: Number of positions in the book.
+    """
+    if 2 * cols * (rows + 1) > 8 * KEY_BYTES:
+        raise ValueError(f"A {rows}x{cols} board does not fit "
+                         "into the book keys.")
+    tasks = [(rows, cols, connect, moves, time_limit_ms)
+             for moves in opening_positions(plies, rows, cols, connect)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        entries = list(executor.map(_solve_position, tasks))
+    write_book(path, entries, rows, cols, connect)
+    return len(entries)
+
+
+def write_book(path, entries, rows=6, cols=7, connect=4):
+    """Write book entries to a file, sorted by key.
+
+    Args:
+        path (str): Path of the book file to write.
+        entries (list[tuple]): (key, move, score) per position.
+        rows (int): Number of rows of the board.
+        cols (int): Number of columns of the board.
+        connect (int): Number of aligned discs needed to win.
+    """
+    entries = sorted(entries)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, rows, cols, connect,
+                               len(entries)))
+        for key, move, score in entries:
+            file.write(RECORD.pack(_key_bytes(key), move, score))
+
+
+class OpeningBook:
+    """Read-only opening book file, memory-mapped."""
+
+    def __init__(self, path):
+        """Open a book file.
+
+        Args:
+            path (str): Path of the book file.
+        """
+        self.path_ = path
+        with open(path, "rb") as file:
+            self.data_ = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.rows_, self.cols_, self.connect_, \
+            self.count_ = HEADER.unpack_from(self.data_)
+        if magic != MAGIC or version != VERSION or \
+                len(self.data_) != HEADER.size + self.count_ * RECORD.size:
+            self.data_.close()
+            raise ValueError(f"Not an opening book file: {path}")
+
+    def lookup(self, board):
+        """Find the book entry of the position on a board.
+
+        Args:
+            board (Board): The game board.
+        Returns:
+            tuple: (move, score) of the position, or None if the position
+                or the board size is not in the book.
+        """
+        if (board.rows_, board.cols_, board.connect_) != \
+                (self.rows_, self.cols_, self.connect_):
+            return None
+        canonical_key, mirrored = board.get_symmetric_key()
+        key = _key_bytes(canonical_key)
+        data = self.data_
+        low, high = 0, self.count_
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * RECORD.size
+            probe = data[offset:offset + KEY_BYTES]
+            if probe < key:
+                low = middle + 1
+            elif probe > key:
+                high = middle
+            else:
+                _, move, score = RECORD.unpack_from(data, offset)
+                return board.mirror_move(move) if mirrored else move, score
+        return None
+
+    def close(self):
+        """Unmap the book file."""
+        self.data_.close()
+
+    def __len__(self):
+        """Number of positions in the book."""
+        return self.count_
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv=None) -> int:
+    """Build an opening book from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Build an opening book by solver searches.")
+    parser.add_argument("--output", required=True,
+                        help="path of the book file to write")
+    parser.add_argument("--plies", type=int, default=4,
+                        help="maximum number of moves in book positions")
+    parser.add_argument("--time-limit-ms", type=float, default=1000,
+                        help="search time per position in milliseconds")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes (default: CPUs)")
+    parser.add_argument("--rows", type=int, default=6)
+    parser.add_argument("--cols", type=int, default=7)
+    parser.add_argument("--connect", type=int, default=4)
+    args = parser.parse_args(argv)
+    count = build_book(args.output, args.plies, args.time_limit_ms,
+                       args.rows, args.cols, args.connect, args.workers)
+    print(f"Wrote {count} positions to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
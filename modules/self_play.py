@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Self-play module for py-four-in-a-row:
+A Python implementation of the classic Four in a Row game.
+
+This module plays headless games between two player configurations,
+spread over a process pool, and aggregates the results. A player
+configuration (spec) is a tuple (player_class, kwargs); symbol and
+player_id are filled in per game.
+
+Usage:
+    python -m modules.self_play [--games N] [--workers N]
+        [--player-a SPEC] [--player-b SPEC]
+
+    SPEC is "random", "mcts[:SIMULATIONS]", "mcts_tt[:SIMULATIONS]"
+    or "solver[:MILLISECONDS]".
+"""
+import argparse
+import contextlib
+import inspect
+import io
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from engines.ai_player_random import AiPlayerRandom
+from engines.ai_player_solver import AiPlayerSolver
+from engines.ai_player_uct_mcts import AiPlayerUctMcts
+from engines.ai_player_uct_mcts_tt import AiPlayerUctMctsTT
+from modules.board import Board
+
+ENGINES = {
+    "random": AiPlayerRandom,
+    "mcts": AiPlayerUctMcts,
+    "mcts_tt": AiPlayerUctMctsTT,
+    "solver": AiPlayerSolver,
+}
+
+# Keyword argument set by the number of a spec, if not "simulations"
+BUDGET_ARGS = {
+    "solver": "time_limit_ms",
+}
+
+
+def make_player(spec, player_id, seed=None):
+    """Create a player from its spec.
+
+    Args:
+        spec (tuple): (player_class, kwargs) of the player.
+        player_id (int): The ID assigned to the player (1 or 2).
+        seed (int): Seed passed to players accepting a `seed` argument,
+            unless the spec sets one.
+    Returns:
+        AbstractPlayer: The new player.
+    """
+    player_class, kwargs = spec
+    kwargs = dict(kwargs)
+    if seed is not None and "seed" not in kwargs and \
+            "seed" in inspect.signature(player_class).parameters:
+        kwargs["seed"] = seed
+    kwargs.setdefault("name", f"{player_class.__name__} {player_id}")
+    return player_class(symbol="X" if player_id == 1 else "O",
+                        player_id=player_id, **kwargs)
+
+
+def play_game(players, board_class=Board) -> dict:
+    """Play one game without any user interaction.
+
+    A player returning an illegal move forfeits the game.
+
+    Args:
+        players (list[AbstractPlayer]): The two players, player 1 first.
+        board_class (type): Board implementation to play on.
+    Returns:
+        dict: The game record with keys "winner" (0 for a draw),
+            "length" (number of moves), "forfeit" (bool) and
+            "move_times" (seconds per move, one list per player).
+    """
+    board = board_class(current_player=1, players=players)
+    move_times = [[], []]
+    forfeit = False
+    winner = 0
+    while not board.is_game_over():
+        player = board.get_current_player()
+        start = time.perf_counter()
+        move = players[player - 1].get_move(board)
+        move_times[player - 1].append(time.perf_counter() - start)
+        if move not in board.get_legal_moves():
+            forfeit = True
+            winner = 2 if player == 1 else 1
+            break
+        board.play_move(move)
+    if not forfeit:
+        winner = board.get_winner()
+    return {"winner": winner, "length": board.ply_, "forfeit": forfeit,
+            "move_times": move_times}
+
+
+def _play_game_worker(args) -> dict:
+    """Play one silenced game between two specs, possibly in a worker process.
+
+    Args:
+        args (tuple): (spec_a, spec_b, a_first, board_class, seed).
+    Returns:
+        dict: The game record from the point of view of spec A, with
+            keys "result" (1 win, 0 draw, -1 loss of A), "a_first",
+            "length", "forfeit", "move_times_a" and "move_times_b".
+    """
+    spec_a, spec_b, a_first, board_class, seed = args
+    rng = random.Random(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        specs = [spec_a, spec_b] if a_first else [spec_b, spec_a]
+        players = [make_player(spec, player_id,
+                               rng.getrandbits(64) if seed is not None
+                               else None)
+                   for player_id, spec in enumerate(specs, start=1)]
+        try:
+            game = play_game(players, board_class)
+        finally:
+            for player in players:
+                player.reset()
+    a_id = 1 if a_first else 2
+    result = 0 if game["winner"] == 0 else \
+        1 if game["winner"] == a_id else -1
+    return {"result": result, "a_first": a_first,
+            "length": game["length"], "forfeit": game["forfeit"],
+            "move_times_a": game["move_times"][a_id - 1],
+            "move_times_b": game["move_times"][2 - a_id]}
+
+
+def summarize(games) -> dict:
+    """Aggregate game records of a match.
+
+    Args:
+        games (list[dict]): Game records as returned by _play_game_worker.
+    Returns:
+        dict: Aggregate counts and timings of the match.
+    """
+    lengths = [game["length"] for game in games]
+    times_a = [t for game in games for t in game["move_times_a"]]
+    times_b = [t for game in games for t in game["move_times_b"]]
+    return {
+        "games": len(games),
+        "a_wins": sum(game["result"] == 1 for game in games),
+        "draws": sum(game["result"] == 0 for game in games),
+        "a_losses": sum(game["result"] == -1 for game in games),
+        "forfeits": sum(game["forfeit"] for game in games),
+        "lengths": lengths,
+        "mean_length": statistics.fmean(lengths) if lengths else 0.0,
+        "mean_move_time_a": statistics.fmean(times_a) if times_a else 0.0,
+        "max_move_time_a": max(times_a, default=0.0),
+        "mean_move_time_b": statistics.fmean(times_b) if times_b else 0.0,
+        "max_move_time_b": max(times_b, default=0.0),
+    }
+
+
+def run_match(spec_a, spec_b, games=10, workers=None, board_class=Board,
+              alternate=True, seed=None) -> dict:
+    """Play a match of headless games between two player specs.
+
+    Args:
+        spec_a (tuple): (player_class, kwargs) of player A.
+        spec_b (tuple): (player_class, kwargs) of player B.
+        games (int): Number of games to play.
+        workers (int): Number of worker processes. 1 plays all games in
+            this process, None uses one process per CPU.
+        board_class (type): Board implementation to play on.
+        alternate (bool): Swap the first player every game. Otherwise
+            player A always moves first.
+        seed (int): Seed for a reproducible match. None is random.
+    Returns:
+        dict: Aggregate results from the point of view of player A,
+            see summarize.
+    """
+    rng = random.Random(seed)
+    tasks = [(spec_a, spec_b, not alternate or i % 2 == 0, board_class,
+              rng.getrandbits(64) if seed is not None else None)
+             for i in range(games)]
+    if workers == 1:
+        records = [_play_game_worker(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            records = list(executor.map(_play_game_worker, tasks))
+    return summarize(records)
+
+
+def parse_spec(text) -> tuple:
+    """Parse a command line player spec.
+
+    Args:
+        text (str): "ENGINE[:BUDGET]", ENGINE being a key of ENGINES.
+            BUDGET is the number of simulations, or the time limit in
+            milliseconds for engines in BUDGET_ARGS.
+    Returns:
+        tuple: (player_class, kwargs) of the player.
+    """
+    engine, _, budget = text.partition(":")
+    if engine not in ENGINES:
+        raise argparse.ArgumentTypeError(f"Unknown engine: {engine}")
+    kwargs = {BUDGET_ARGS.get(engine, "simulations"): int(budget)} \
+        if budget else {}
+    return ENGINES[engine], kwargs
+
+
+def main(argv=None) -> int:
+    """Run a self-play match and print the results."""
+    parser = argparse.ArgumentParser(
+        description="Play headless self-play games between two engines.")
+    parser.add_argument("--games", type=int, default=10,
+                        help="number of games to play")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes (default: CPUs)")
+    parser.add_argument("--player-a", type=parse_spec, default="mcts",
+                        help="spec of player A (default: mcts)")
+    parser.add_argument("--player-b", type=parse_spec, default="random",
+                        help="spec of player B (default: random)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for a reproducible match")
+    args = parser.parse_args(argv)
+    results = run_match(args.player_a, args.player_b, games=args.games,
+                        workers=args.workers, seed=args.seed)
+    print(f"Games: {results['games']}  A wins: {results['a_wins']}  "
+          f"Draws: {results['draws']}  A losses: {results['a_losses']}  "
+          f"Forfeits: {results['forfeits']}")
+    print(f"Mean game length: {results['mean_length']:.1f} moves")
+    print(f"Move time A: mean {results['mean_move_time_a'] * 1e3:.1f} ms, "
+          f"max {results['max_move_time_a'] * 1e3:.1f} ms")
+    print(f"Move time B: mean {results['mean_move_time_b'] * 1e3:.1f} ms, "
+          f"max {results['max_move_time_b'] * 1e3:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Transposition table module for py-four-in-a-row:
+A Python implementation of the classic Four in a Row game.
+
+This module defines the TranspositionTable class, a bounded map from
+position keys (see Board.get_key) to search entries. The table has a
+fixed number of slots; a key maps to one slot and a replacement policy
+decides whether a new entry may evict the slot's occupant.
+
+Position keys are structured bit patterns (one bit per disc), so they
+are mixed before picking a slot.
+
+Entries are stamped with the generation of the table, see
+new_generation, so entries of past searches no longer used give way to
+new ones whatever their priority.
+"""
+
+REPLACE_ALWAYS = "always"
+REPLACE_PRIORITY = "priority"
+
+_MASK64 = (1 << 64) - 1
+
+
+def slot_of(key, capacity) -> int:
+    """Map a position key to a slot of a table.
+
+    The key is folded into 64 bits chunk by chunk, each step mixed
+    by the SplitMix64 finalizer, so every bit of the key affects
+    every bit of the slot.
+
+    Args:
+        key (int): The position key.
+        capacity (int): Number of slots of the table.
+    Returns:
+        int: The slot index.
+    """
+    mixed = 0
+    while True:
+        mixed ^= key & _MASK64
+        mixed = (mixed ^ mixed >> 30) * 0xBF58476D1CE4E5B9 & _MASK64
+        mixed = (mixed ^ mixed >> 27) * 0x94D049BB133111EB & _MASK64
+        mixed ^= mixed >> 31
+        key >>= 64
+        if not key:
+            return mixed % capacity
+
+
+class TranspositionTable:
+    """Bounded transposition table with a replacement policy."""
+
+    def __init__(self, capacity=1 << 16, replacement=REPLACE_ALWAYS,
+                 priority=None):
+        """Initialize an empty table.
+
+        Args:
+            capacity (int): Number of slots, i.e. maximum number of entries.
+            replacement (str): Replacement policy when a slot is taken by
+                another key. REPLACE_ALWAYS evicts the occupant,
+                REPLACE_PRIORITY evicts it only if the new entry's priority
+                is at least the occupant's current priority, or if the
+                occupant is from an older generation.
+            priority (callable): Maps an entry value to its priority,
+                e.g. search depth or visit count. Required for
+                REPLACE_PRIORITY.
+        """
+        if capacity < 1:
+            raise ValueError(f"Invalid capacity: {capacity}")
+        if replacement not in (REPLACE_ALWAYS, REPLACE_PRIORITY):
+            raise ValueError(f"Unknown replacement policy: {replacement}")
+        if replacement == REPLACE_PRIORITY and priority is None:
+            raise ValueError("Replacement policy 'priority' "
+                             "needs a priority function.")
+        self.capacity_ = capacity
+        self.replacement_ = replacement
+        self.priority_ = priority
+        self.keys_ = [None] * capacity
+        self.values_ = [None] * capacity
+        self.generations_ = [0] * capacity
+        self.generation_ = 0
+        self.count_ = 0
+
+    def new_generation(self):
+        """Start a new generation of entries, e.g. for a new search.
+
+        Entries stored or looked up from now on belong to the new
+        generation. Older entries stay available, but any new entry may
+        evict them.
+        """
+        self.generation_ += 1
+
+    def lookup(self, key):
+        """Look up the entry stored for a position key.
+
+        Args:
+            key (int): The position key.
+        Returns:
+            object: The stored entry value, or None if not stored.
+        """
+        slot = slot_of(key, self.capacity_)
+        if self.keys_[slot] == key:
+            self.generations_[slot] = self.generation_
+            return self.values_[slot]
+        return None
+
+    def store(self, key, value) -> bool:
+        """Store an entry for a position key.
+
+        An entry for the same key is always overwritten. An entry for
+        another key in the same slot is evicted according to the
+        replacement policy.
+
+        Args:
+            key (int): The position key.
+            value (object): The entry value.
+        Returns:
+            bool: True if the entry was stored, False if it was rejected.
+        """
+        slot = slot_of(key, self.capacity_)
+        if self._rejects(slot, key, value):
+            return False
+        if self.keys_[slot] is None:
+            self.count_ += 1
+        self.keys_[slot] = key
+        self.values_[slot] = value
+        self.generations_[slot] = self.generation_
+        return True
+
+    def accepts(self, key, value) -> bool:
+        """Check whether store would keep an entry, without storing it.
+        Args:
+            key (int): The position key.
+            value (object): The entry value.
+        Returns:
+            bool: True if the entry would be stored.
+        """
+        return not self._rejects(slot_of(key, self.capacity_), key, value)
+
+    def _rejects(self, slot, key, value) -> bool:
+        """Check whether the replacement policy keeps the slot's occupant.
+        Args:
+            slot (int): The slot of the key.
+            key (int): The position key.
+            value (object): The entry value.
+        Returns:
+            bool: True if the occupant is kept and the entry rejected.
+        """
+        occupant = self.keys_[slot]
+        return occupant is not None and occupant != key and \
+            self.replacement_ == REPLACE_PRIORITY and \
+            self.generations_[slot] == self.generation_ and \
+            self.priority_(value) < self.priority_(self.values_[slot])
+
+    def clear(self):
+        """Remove all entries from the table."""
+        self.keys_ = [None] * self.capacity_
+        self.values_ = [None] * self.capacity_
+        self.generations_ = [0] * self.capacity_
+        self.count_ = 0
+
+    def __len__(self):
+        """Number of entries stored in the table."""
+        return self.count_
+
+    def __contains__(self, key):
+        """Check whether an entry is stored for the position key."""
+        return self.keys_[slot_of(key, self.capacity_)] == key
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("This is the TranspositionTable module.")
@@ -45,10 +45,17 @@ def setup_players() -> list[AbstractPlayer]:
     return [player1, player2]
 
 
-def game_loop(setup=setup_players) -> tuple[int, list[AbstractPlayer]]:
-    """Main game loop for py-four-in-a-row."""
+def game_loop(setup=setup_players,
+              board_class=Board) -> tuple[int, list[AbstractPlayer]]:
+    """Main game loop for py-four-in-a-row.
+
+    Args:
+        setup (callable): Returns the list of the two players.
+        board_class (type): Board implementation to play on,
+            e.g. Board or BitBoard.
+    """
     players: list[AbstractPlayer] = setup()
-    board: Board = Board(current_player=1, players=players)
+    board: Board = board_class(current_player=1, players=players)
     print(board)
 
     end_of_game: bool = False
@@ -66,6 +73,9 @@ def game_loop(setup=setup_players) -> tuple[int, list[AbstractPlayer]]:
         print(board)
         winner: int = board.check_winner()
         end_of_game = winner != 0 or board.is_full()
+    # Stop background work such as pondering and worker pools
+    for player in players:
+        player.reset()
     print("Game over!")
     return winner, players
 
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_ai_player_book module is testing functions of ai_player_book.
+"""
+import pickle
+from engines.ai_player_book import AiPlayerBook
+from engines.ai_player_random import AiPlayerRandom
+from modules.board import Board
+from modules.opening_book import write_book
+
+
+def make_book(tmp_path):
+    """Write a book holding the empty board and the center opening.
+
+    Args:
+        tmp_path (pathlib.Path): Directory of the book file.
+    Returns:
+        pathlib.Path: Path of the book file.
+    """
+    board = Board()
+    entries = [(board.get_key(), 3, 1)]
+    board.play_move(3)
+    entries.append((board.get_key(), 2, -1))
+    path = tmp_path / "book.bin"
+    write_book(path, entries)
+    return path
+
+
+def test_ai_player_book_plays_book_moves(tmp_path):
+    """Test AiPlayerBook plays from the book, then from its engine.
+
+    Given an AiPlayerBook with a book of two positions
+    When get_move is called on book positions
+    Then it should play the book moves and report their scores
+    When get_move is called out of book
+    Then the engine should select the move
+    """
+    engine = AiPlayerRandom(player_id=1)
+    player = AiPlayerBook(engine, make_book(tmp_path), player_id=1)
+    assert player.name_ == "Random"
+    board = Board()
+    assert player.get_move(board) == 3
+    assert player.get_most_likely_variant() == [3]
+    assert player.get_likelihood_for_win() == 1.0
+    board.play_move(3)
+    assert player.get_move(board) == 2
+    assert player.get_likelihood_for_win() == 0.0
+    board.play_move(2)
+    assert player.get_move(board) in board.get_legal_moves()
+    assert player.get_most_likely_variant() == []
+    assert player.get_likelihood_for_win() == 0.0
+    player.set_player_id(2)
+    assert engine.player_id_ == 2
+
+
+def test_ai_player_book_pickles_without_map(tmp_path):
+    """Test AiPlayerBook can be pickled while its book is mapped.
+
+    Given an AiPlayerBook which has read its book
+    When it is pickled and unpickled
+    Then the copy should map the book again on its first move
+    """
+    player = AiPlayerBook(AiPlayerRandom(), make_book(tmp_path))
+    player.get_move(Board())
+    copy = pickle.loads(pickle.dumps(player))
+    assert copy.book_ is None
+    assert copy.get_move(Board()) == 3
+    copy.reset()
+    assert copy.last_entry_ is None
@@ -94,3 +94,20 @@ def test_ai_player_random_multiple_instances():
     assert player2.player_id_ == 2
     assert player1 is not player2
     assert player1.get_move != player2.get_move
+
+
+def test_ai_player_random_seeded_is_reproducible():
+    """Test seeded AiPlayerRandom players repeat their moves.
+
+    Given two AiPlayerRandom with the same seed
+    When both play a sequence of moves
+    Then they should select the same moves
+    """
+    players = [AiPlayerRandom(seed=4), AiPlayerRandom(seed=4)]
+    moves = []
+    for player in players:
+        board = Board()
+        while not board.is_game_over():
+            board.play_move(player.get_move(board))
+        moves.append(board.moves_)
+    assert moves[0] == moves[1]
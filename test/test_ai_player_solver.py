@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_ai_player_solver module is testing functions of ai_player_solver.
+"""
+import random
+import time
+from engines.ai_player_solver import AiPlayerSolver
+from modules.board import Board
+
+
+def minimax(board) -> int:
+    """Score a position by plain minimax, without pruning or table.
+
+    Args:
+        board (Board): An undecided position, restored on return.
+    Returns:
+        int: The score from the view of the player to move.
+    """
+    best = None
+    for move in board.get_legal_moves():
+        board.play_move(move)
+        if board.get_winner():
+            score = board.rows_ * board.cols_ + 1 - board.ply_
+        elif board.is_game_over():
+            score = 0
+        else:
+            score = -minimax(board)
+        board.undo_move()
+        if best is None or score > best:
+            best = score
+    return best
+
+
+def test_ai_player_solver():
+    """Test AiPlayerSolver initialization.
+
+    Given no parameters
+    When AiPlayerSolver is initialized
+    Then it should have a time limit and no result yet
+    """
+    player = AiPlayerSolver()
+    assert player.name_ == "Solver"
+    assert player.time_limit_ms_ == 1000
+    assert player.max_depth_ is None
+    assert player.get_most_likely_variant() == []
+    assert player.get_likelihood_for_win() == 0.5
+
+
+def test_ai_player_solver_immediate_win():
+    """Test AiPlayerSolver takes an immediate win.
+
+    Given three discs of player 1 in a column
+    When get_move is called for player 1
+    Then it should complete the column and report a proven win
+    """
+    board: Board = Board()
+    for move in [0, 1, 0, 1, 0, 1]:
+        board.play_move(move)
+    player = AiPlayerSolver(player_id=1)
+    assert player.get_move(board) == 0
+    assert player.exact_
+    assert player.score_ == 42 + 1 - 7
+    assert player.get_most_likely_variant() == [0]
+    assert player.get_likelihood_for_win() == 1.0
+
+
+def test_ai_player_solver_blocks_and_sees_loss():
+    """Test AiPlayerSolver blocks, and knows a lost position.
+
+    Given player 1 with three discs in the bottom row and one open end
+    When get_move is called for player 2
+    Then it should block the open end
+    Given player 1 with an open three
+    Then player 2 should know the position is lost
+    """
+    board: Board = Board()
+    for move in [0, 6, 1, 6, 2]:
+        board.play_move(move)
+    player = AiPlayerSolver(player_id=2, max_depth=4)
+    assert player.get_move(board) == 3
+    board = Board()
+    for move in [3, 3, 4, 4, 5]:
+        board.play_move(move)
+    assert player.solve(board) in board.get_legal_moves()
+    assert player.exact_
+    assert player.score_ < 0
+    assert player.get_likelihood_for_win() == 0.0
+    variant = player.get_most_likely_variant()
+    for move in variant:
+        board.play_move(move)
+    assert board.get_winner() == 1
+
+
+def test_ai_player_solver_matches_minimax():
+    """Test AiPlayerSolver scores late positions exactly.
+
+    Given random positions with few empty cells left
+    When they are solved
+    Then the score should equal the plain minimax score
+    And the selected move should achieve it
+    """
+    rng = random.Random(11)
+    player = AiPlayerSolver(time_limit_ms=None)
+    solved = 0
+    while solved < 6:
+        board: Board = Board()
+        for _ in range(34):
+            board.play_move(rng.choice(board.get_legal_moves()))
+            if board.is_game_over():
+                break
+        if board.is_game_over():
+            continue
+        solved += 1
+        expected = minimax(board)
+        move = player.solve(board)
+        assert player.exact_
+        assert player.score_ == expected
+        board.play_move(move)
+        if board.get_winner():
+            assert expected == 42 + 1 - board.ply_
+        elif not board.is_game_over():
+            assert -minimax(board) == expected
+
+
+def test_ai_player_solver_small_board_draw():
+    """Test AiPlayerSolver solves a small board from the start.
+
+    Given an empty 4x4 board
+    When it is solved without time limit
+    Then it should be a proven draw
+    """
+    player = AiPlayerSolver(time_limit_ms=None)
+    assert player.solve(Board(rows=4, cols=4)) in range(4)
+    assert player.exact_
+    assert player.score_ == 0
+    assert player.get_likelihood_for_win() == 0.5
+    player.reset()
+    assert player.table_ is None
+
+
+def test_ai_player_solver_time_limit():
+    """Test AiPlayerSolver returns the deepest completed iteration.
+
+    Given the empty 6x7 board and a time limit of 100 ms
+    When get_move is called
+    Then it should return a legal move in time
+    And the search should not be exact
+    """
+    player = AiPlayerSolver(time_limit_ms=100)
+    start = time.perf_counter()
+    move = player.get_move(Board())
+    assert time.perf_counter() - start < 1.0
+    assert move in range(7)
+    assert 1 <= player.depth_ < 42
+    assert not player.exact_
+    assert player.get_most_likely_variant()[0] == move
+
+
+def test_ai_player_solver_game_over():
+    """Test AiPlayerSolver on a finished game.
+
+    Given a won board
+    When solve is called
+    Then it should return -1
+    """
+    board: Board = Board()
+    for move in [0, 1, 0, 1, 0, 1, 0]:
+        board.play_move(move)
+    assert AiPlayerSolver().solve(board) == -1
+
+
+def test_ai_player_solver_board_without_history():
+    """Test AiPlayerSolver on boards with no or a truncated history.
+
+    Given a decoded board with column 3 full
+    When solve is called
+    Then it should return a legal move
+    Given a won board keeping only two moves of history
+    When solve is called
+    Then it should return -1
+    """
+    board = Board.from_bytes(Board.from_moves("333333").to_bytes())
+    assert AiPlayerSolver(max_depth=4).solve(board) in \
+        board.get_legal_moves()
+    board = Board.from_moves("0101010").clone(history_limit=2)
+    assert AiPlayerSolver().solve(board) == -1
+
+
+def test_ai_player_solver_ages_table_entries():
+    """Test each search starts a new table generation.
+
+    Given an AiPlayerSolver
+    When two positions are solved
+    Then each search should start a new generation of the table
+    And the entries of the first search not reached by the second
+    should be older
+    """
+    player = AiPlayerSolver(max_depth=4)
+    player.solve(Board.from_moves("33"))
+    player.solve(Board.from_moves("00"))
+    table = player.table_
+    assert table.generation_ == 2
+    generations = {table.generations_[slot]
+                   for slot, key in enumerate(table.keys_) if key is not None}
+    assert generations == {1, 2}
@@ -3,7 +3,15 @@
 """
 test_ai_player_uct_mcts module is testing functions of ai_player_uct_mcts.
 """
-from engines.ai_player_uct_mcts import AiPlayerUctMcts
+import pickle
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from engines.ai_player_uct_mcts import AiPlayerUctMcts, Node
+from engines.rollout_policies import RandomRollout, ThreatRollout
+from modules.bitboard import BitBoard
 from modules.board import Board
 
 
@@ -24,7 +32,7 @@ def test_ai_player_uct_mcts():
 def test_get_likelihood_for_win_returns_zero():
     """Test get_likelihood_for_win returns 0.0.
 
-    Given an AiPlayerUctMcts
+    Given an AiPlayerUctMcts which has not searched yet
     When get_likelihood_for_win is called
     Then it should return 0.0
     """
@@ -35,7 +43,7 @@ def test_get_likelihood_for_win_returns_zero():
 def test_get_most_likely_variant_returns_empty():
     """Test get_most_likely_variant returns an empty list.
 
-    Given an AiPlayerUctMcts
+    Given an AiPlayerUctMcts which has not searched yet
     When get_most_likely_variant is called
     Then it should return an empty list
     """
@@ -95,6 +103,21 @@ def test_ai_player_uct_mcts_play_move():
     class MockGameState:
         """A mock game state for testing."""
 
+        rows_ = 6
+        cols_ = 7
+        connect_ = 4
+        history_ = []
+        moves_ = []
+        ply_ = 0
+
+        def get_key(self):
+            """Get the key of the position."""
+            return 0
+
+        def get_current_player(self):
+            """Get the current player to move."""
+            return 1
+
         def get_legal_moves(self):
             """Get a list of all legal moves."""
             return [0, 1, 2, 3, 4, 5, 6]
@@ -103,6 +126,15 @@ def test_ai_player_uct_mcts_play_move():
             """Play a move in the game state."""
             print(f"Playing: {move=}")
 
+        def undo_move(self):
+            """Undo the last move in the game state."""
+            print("Undoing last move")
+
+        def clone(self, history_limit=None):
+            """Clone the game state."""
+            print(f"Cloning: {history_limit=}")
+            return self
+
         def is_game_over(self):
             """Check if the game is over."""
             return True
@@ -111,6 +143,10 @@ def test_ai_player_uct_mcts_play_move():
             """Get the winner of the game."""
             return None
 
+        def is_symmetric(self):
+            """Check whether the position equals its mirror image."""
+            return False
+
     state = MockGameState()
     move = player.get_move(state)
     assert move in state.get_legal_moves()
@@ -236,3 +272,663 @@ def test_ai_player_uct_mcts_find_winning_move() -> None:
     # Now player 1 can win by playing in column 2
     move = player.get_move(board)
     assert move == 2  # Expecting the winning move preparation
+
+
+def test_ai_player_uct_mcts_leaves_board_unchanged() -> None:
+    """Test AiPlayerUctMcts does not modify the given board.
+
+    Given an AiPlayerUctMcts and a game state
+    When get_move is called
+    Then the board should hold the same position as before
+    """
+    player = AiPlayerUctMcts(player_id=1, simulations=100)
+    board: Board = Board()
+    for move in [3, 3, 2]:
+        board.play_move(move)
+    grid = [row[:] for row in board.grid_]
+    history = list(board.history_)
+    player.get_move(board)
+    assert board.grid_ == grid
+    assert board.history_ == history
+    assert board.get_current_player() == 2
+
+
+def test_ai_player_uct_mcts_rollout_policy() -> None:
+    """Test AiPlayerUctMcts with a custom rollout policy.
+
+    Given an AiPlayerUctMcts using random rollouts
+    Given an immediate winning move possible
+    When get_move is called
+    Then it should return the winning move
+    """
+    player = AiPlayerUctMcts(player_id=1, simulations=300, seed=1,
+                             rollout_policy=RandomRollout())
+    assert isinstance(AiPlayerUctMcts().rollout_policy_, ThreatRollout)
+    board: Board = Board()
+    for move in [0, 0, 1, 1, 2, 2]:
+        board.play_move(move)
+    assert player.get_move(board) == 3
+
+
+def test_ai_player_uct_mcts_root_parallel_finds_win(capsys) -> None:
+    """Test root-parallel AiPlayerUctMcts finds an immediate win.
+
+    Given an AiPlayerUctMcts with two workers
+    Given an immediate winning move possible
+    When get_move is called
+    Then it should return the winning move
+    And the workers should stop once the win is proven
+    Given a position where the opponent threatens to win
+    Then the merged visit counts should cover all simulations
+    """
+    player = AiPlayerUctMcts(player_id=1, simulations=300, workers=2,
+                             seed=7)
+    board: Board = Board()
+    for move in [0, 0, 1, 1, 2, 2]:
+        board.play_move(move)
+    try:
+        move = player.get_move(board)
+        out = capsys.readouterr().out
+        board = Board()
+        for other in [0, 6, 1, 6, 2]:
+            board.play_move(other)
+        player.set_player_id(2)
+        block = player.get_move(board)
+    finally:
+        player.reset()
+    assert move == 3
+    visits = re.findall(r"\[move \d: (\d+)\]", out)
+    assert 0 < sum(int(v) for v in visits) < 300
+    assert block == 3
+    visits = re.findall(r"\[move \d: (\d+)\]", capsys.readouterr().out)
+    assert sum(int(v) for v in visits) == 300
+
+
+def test_ai_player_uct_mcts_seeded_is_reproducible(capsys) -> None:
+    """Test seeded AiPlayerUctMcts searches are reproducible.
+
+    Given two AiPlayerUctMcts with the same seed
+    When get_move is called on the same position, serial and parallel
+    Then both players should report the same visit counts
+    """
+    board: Board = Board()
+    for move in [3, 3, 2]:
+        board.play_move(move)
+    for workers in [1, 2]:
+        outputs = []
+        for _ in range(2):
+            player = AiPlayerUctMcts(player_id=2, simulations=200,
+                                     workers=workers, seed=123)
+            try:
+                player.get_move(board)
+            finally:
+                player.reset()
+            outputs.append(capsys.readouterr().out.split("thinking...")[1])
+        assert outputs[0] == outputs[1]
+
+
+def test_ai_player_uct_mcts_pickles_without_pool() -> None:
+    """Test AiPlayerUctMcts can be pickled while it owns a worker pool.
+
+    Given an AiPlayerUctMcts with a worker pool
+    When it is pickled and unpickled
+    Then the copy should have no worker pool
+    """
+    player = AiPlayerUctMcts(workers=2, seed=1)
+    player.executor_ = ProcessPoolExecutor(max_workers=1)
+    try:
+        copy = pickle.loads(pickle.dumps(player))
+    finally:
+        player.reset()
+    assert copy.executor_ is None
+    assert copy.workers_ == 2
+    assert player.executor_ is None
+
+
+def test_ai_player_uct_mcts_requires_budget() -> None:
+    """Test AiPlayerUctMcts needs a simulation cap or a time limit.
+
+    Given neither simulations nor time_limit_ms
+    When AiPlayerUctMcts is initialized
+    Then it should raise a ValueError
+    """
+    with pytest.raises(ValueError):
+        AiPlayerUctMcts(simulations=None)
+
+
+def test_ai_player_uct_mcts_time_limit() -> None:
+    """Test AiPlayerUctMcts respects its time budget.
+
+    Given an AiPlayerUctMcts with a time limit and no simulation cap
+    When get_move is called on an open position
+    Then it should return a legal move within the time budget
+    """
+    player = AiPlayerUctMcts(player_id=1, simulations=None,
+                             time_limit_ms=200, seed=3)
+    board: Board = Board()
+    start = time.perf_counter()
+    move = player.get_move(board)
+    elapsed = time.perf_counter() - start
+    assert move in board.get_legal_moves()
+    assert elapsed < 1.0
+
+
+def test_ai_player_uct_mcts_stops_early_when_decided() -> None:
+    """Test AiPlayerUctMcts stops once the best move is decided.
+
+    Given an AiPlayerUctMcts with a simulation cap
+    Given a position where only one move does not lose at once
+    When _search is called with early stopping
+    Then it should stop before the cap
+    And the most visited move can no longer be overtaken
+    """
+    player = AiPlayerUctMcts(player_id=2, simulations=2000, seed=5)
+    board: Board = Board()
+    for move in [0, 6, 1, 6, 2]:
+        board.play_move(move)
+    # pylint: disable=protected-access
+    root = player._search(board.clone(), 2000, random.Random(5),
+                          early_stop=True)
+    visits = sorted((child.visits_ for child in root.children_),
+                    reverse=True)
+    assert root.visits_ < 2000
+    assert visits[0] - visits[1] > 2000 - root.visits_
+    assert max(root.children_, key=lambda c: c.visits_).move_ == 3
+
+
+def test_ai_player_uct_mcts_reuses_subtree() -> None:
+    """Test AiPlayerUctMcts keeps its tree between moves.
+
+    Given an AiPlayerUctMcts that searched a position
+    When the player's move and an opponent reply are played
+    And get_move is called again
+    Then the search should continue from the matching subtree
+    """
+    player = AiPlayerUctMcts(player_id=1, simulations=500, seed=11)
+    board: Board = Board()
+    move = player.get_move(board)
+    board.play_move(move)
+    subtree = next(child for child in player.root_.children_
+                   if child.move_ == move).children_[0]
+    reply = subtree.move_
+    kept_visits = subtree.visits_
+    board.play_move(reply)
+    player.get_move(board)
+    assert player.root_ is subtree
+    assert player.root_.parent_ is None
+    assert player.root_.visits_ > kept_visits
+
+
+def test_ai_player_uct_mcts_discards_unrelated_tree() -> None:
+    """Test AiPlayerUctMcts starts a new tree for an unrelated position.
+
+    Given an AiPlayerUctMcts that searched a position
+    When get_move is called on a position not following from it
+    Or reset is called
+    Then the kept tree should not be reused
+    """
+    player = AiPlayerUctMcts(player_id=1, simulations=100, seed=13)
+    board: Board = Board()
+    board.play_move(3)
+    player.get_move(board)
+    first_root = player.root_
+    other: Board = Board()
+    other.play_move(2)
+    player.get_move(other)
+    assert player.root_ is not first_root
+    assert player.root_.visits_ <= 100
+    player.reset()
+    assert player.root_ is None
+
+
+def test_ai_player_uct_mcts_discards_tree_of_other_decoded_board() -> None:
+    """Test AiPlayerUctMcts checks the position before reusing its tree.
+
+    Given an AiPlayerUctMcts that searched a board without history
+    When get_move is called on another board without history
+    Then the kept tree should not be reused
+    And the search should only report legal moves
+    """
+    player = AiPlayerUctMcts(player_id=1, simulations=100, seed=13)
+    first = Board.from_bytes(Board.from_moves("33").to_bytes())
+    player.get_move(first)
+    first_root = player.root_
+    other = Board.from_bytes(Board.from_moves("000000111111").to_bytes())
+    player.get_move(other)
+    assert player.root_ is not first_root
+    assert {child.move_ for child in player.root_.children_} <= \
+        set(other.get_legal_moves())
+
+
+def test_ai_player_uct_mcts_compact_tree_matches_nodes() -> None:
+    """Test the array-backed tree gives the same search as Node objects.
+
+    Given an AiPlayerUctMcts with and without compact_tree
+    When both search the same position with the same seed
+    Then the root statistics should be equal
+    And the compact player should find an immediate win
+    """
+    player = AiPlayerUctMcts(player_id=2, simulations=500)
+    compact = AiPlayerUctMcts(player_id=2, simulations=500,
+                              compact_tree=True)
+    board: Board = Board()
+    for move in [3, 3, 2, 4]:
+        board.play_move(move)
+    # pylint: disable=protected-access
+    stats = player._search_stats(board.clone(0), 500, random.Random(5))
+    assert compact._search_stats(board.clone(0), 500,
+                                 random.Random(5)) == stats
+    board = Board()
+    for move in [0, 0, 1, 1, 2, 2]:
+        board.play_move(move)
+    compact.set_player_id(1)
+    assert compact.get_move(board) == 3
+
+
+def test_ai_player_uct_mcts_batch_rollout() -> None:
+    """Test AiPlayerUctMcts with leaf-parallel batch rollouts.
+
+    Given AiPlayerUctMcts with a BatchRollout, with and without compact_tree
+    When it searches a position where the opponent threatens to win
+    Then each simulation should count a batch of playouts
+    And the player should block the threat
+    """
+    pytest.importorskip("numpy")
+    # pylint: disable=import-outside-toplevel
+    from engines.batch_rollout import BatchRollout
+    board: Board = Board()
+    for move in [0, 6, 1, 6, 2]:
+        board.play_move(move)
+    for compact_tree in (False, True):
+        player = AiPlayerUctMcts(
+            player_id=2, simulations=100, seed=3, compact_tree=compact_tree,
+            batch_rollout=BatchRollout(playouts=16))
+        # pylint: disable=protected-access
+        stats = player._search_stats(board.clone(0), 50, random.Random(4))
+        assert sum(visits for visits, _, _ in stats.values()) == 50 * 16
+        assert player.get_move(board) == 3
+
+
+def test_ai_player_uct_mcts_solver_proves_win() -> None:
+    """Test AiPlayerUctMcts proves wins and stops searching.
+
+    Given a position with an immediate win, with and without compact_tree
+    When the position is searched
+    Then the search should stop as soon as the root is proven
+    And the winning move should be marked as a proven win
+    """
+    board: Board = Board()
+    for move in [0, 0, 1, 1, 2, 2]:
+        board.play_move(move)
+    for compact_tree in (False, True):
+        player = AiPlayerUctMcts(player_id=1, simulations=1000,
+                                 compact_tree=compact_tree)
+        # pylint: disable=protected-access
+        stats = player._search_stats(board.clone(0), 1000, random.Random(2))
+        assert stats[3][2] == 1
+        assert sum(visits for visits, _, _ in stats.values()) <= 7
+
+
+def test_ai_player_uct_mcts_solver_avoids_proven_loss() -> None:
+    """Test AiPlayerUctMcts proves losing moves and skips them.
+
+    Given a position where all but one move lose at once
+    When the position is searched
+    Then every other move should be a proven loss, found by expanding
+    at most all replies once
+    And the blocking move should be played
+    """
+    player = AiPlayerUctMcts(player_id=2, simulations=500, seed=9)
+    board: Board = Board()
+    for move in [0, 6, 1, 6, 2]:
+        board.play_move(move)
+    # pylint: disable=protected-access
+    stats = player._search_stats(board.clone(0), 500, random.Random(9))
+    for move, (visits, _, proven) in stats.items():
+        if move != 3:
+            assert proven == -1
+            assert visits <= 1 + 7
+    assert stats[3][2] != -1
+    assert player.get_move(board) == 3
+
+
+def test_ai_player_uct_mcts_analyze(capsys) -> None:
+    """Test the analysis API reports the search without printing.
+
+    Given a position with an immediate win, with and without compact_tree
+    When the position is analyzed
+    Then nothing should be printed
+    And the winning move should be the best move with a proven win
+    And the variant and likelihood should answer from the analysis
+    """
+    board: Board = Board()
+    for move in [0, 0, 1, 1, 2, 2]:
+        board.play_move(move)
+    for compact_tree in (False, True):
+        player = AiPlayerUctMcts(player_id=1, simulations=200, seed=1,
+                                 compact_tree=compact_tree)
+        capsys.readouterr()
+        analysis = player.analyze(board)
+        assert not capsys.readouterr().out
+        assert analysis["player"] == 1
+        assert analysis["best_move"] == 3
+        assert analysis["moves"][3]["proven"] == 1
+        assert analysis["win_probability"] == 1.0
+        assert analysis["variant"] == [3]
+        assert set(analysis["moves"]) <= set(board.get_legal_moves())
+        assert player.get_most_likely_variant() == [3]
+        assert player.get_likelihood_for_win() == 1.0
+        # From the opponent's view the position is lost
+        player.set_player_id(2)
+        assert player.get_likelihood_for_win() == 0.0
+
+
+def test_ai_player_uct_mcts_analyze_decoded_board() -> None:
+    """Test searching a board without history.
+
+    Given a decoded position with columns 0 and 1 full
+    When it is analyzed on a BitBoard, serially and with two workers
+    Then only the legal columns should be searched
+    """
+    board = Board.from_bytes(Board.from_moves("000000111111").to_bytes())
+    for workers in (1, 2):
+        player = AiPlayerUctMcts(simulations=100, seed=1,
+                                 board_class=BitBoard, workers=workers)
+        try:
+            analysis = player.analyze(board)
+        finally:
+            player.reset()
+        assert set(analysis["moves"]) <= {2, 3, 4, 5, 6}
+        assert analysis["best_move"] in analysis["moves"]
+        assert 0 < sum(stats["visits"]
+                       for stats in analysis["moves"].values()) <= 100
+
+
+def test_ai_player_uct_mcts_analyze_budget() -> None:
+    """Test the analysis API takes its own budget.
+
+    Given an AiPlayerUctMcts with a budget of 1000 simulations
+    When a position is analyzed with 50 simulations
+    Then 50 simulations should be counted at the root
+    And the variant should follow the most visited children
+    And the win rates and probability should lie in [0, 1]
+    """
+    player = AiPlayerUctMcts(simulations=1000, seed=4, reuse_tree=False)
+    board: Board = Board()
+    board.play_move(0)
+    analysis = player.analyze(board, simulations=50)
+    moves = analysis["moves"]
+    assert sum(stats["visits"] for stats in moves.values()) == 50
+    best_move = max(moves, key=lambda m: moves[m]["visits"])
+    assert analysis["best_move"] == best_move
+    assert analysis["variant"][0] == best_move
+    assert len(analysis["variant"]) > 1
+    assert all(0.0 <= stats["win_rate"] <= 1.0 for stats in moves.values())
+    assert analysis["win_probability"] == moves[best_move]["win_rate"]
+
+
+def test_ai_player_uct_mcts_get_move_keeps_analysis(capsys) -> None:
+    """Test get_move answers the analysis methods from its search.
+
+    Given an AiPlayerUctMcts
+    When it selects a move
+    Then the variant should start with the selected move
+    And the likelihood should be the win rate of the printed best move
+    And reset should drop the analysis
+    """
+    player = AiPlayerUctMcts(simulations=100, seed=2)
+    move = player.get_move(Board())
+    capsys.readouterr()
+    assert player.get_most_likely_variant()[0] == move
+    assert player.get_likelihood_for_win() == \
+        player.analysis_["moves"][move]["win_rate"]
+    player.reset()
+    assert not player.get_most_likely_variant()
+    assert player.get_likelihood_for_win() == 0.0
+
+
+def test_ai_player_uct_mcts_prunes_mirrored_root_moves() -> None:
+    """Test mirrored moves of a symmetric root are searched once.
+
+    Given a symmetric and an asymmetric position, with and without
+    compact_tree
+    When the positions are searched
+    Then only the moves up to the middle column of the symmetric
+    position should be expanded
+    And all moves of the asymmetric position should be expanded
+    """
+    for compact_tree in (False, True):
+        player = AiPlayerUctMcts(simulations=200, compact_tree=compact_tree)
+        # pylint: disable=protected-access
+        stats = player._search_stats(Board.from_moves("33"), 200,
+                                     random.Random(3))
+        assert set(stats) == {0, 1, 2, 3}
+        stats = player._search_stats(Board.from_moves("32"), 200,
+                                     random.Random(3))
+        assert set(stats) == set(range(7))
+
+
+def test_ai_player_uct_mcts_analyze_reports_mirrored_moves() -> None:
+    """Test the analysis of a symmetric position covers every column.
+
+    Given the empty board, searched with fresh and with kept trees
+    When it is analyzed
+    Then every column should be reported
+    And mirrored columns should share their statistics
+    """
+    player = AiPlayerUctMcts(simulations=100, seed=2)
+    board = Board()
+    first = player.analyze(board)
+    board.play_move(3)
+    board.play_move(3)
+    kept = player.analyze(board)
+    for analysis in (first, kept):
+        assert set(analysis["moves"]) == set(range(7))
+    for move in range(4, 7):
+        assert first["moves"][move] == first["moves"][6 - move]
+
+
+def test_ai_player_uct_mcts_reused_symmetric_root_all_proven() -> None:
+    """Test a kept symmetric root left with proven children only.
+
+    Given a kept root of a symmetric position whose moves left of the
+    middle are expanded and proven, and whose mirrored moves are untried
+    When the search continues from it
+    Then the mirrored moves should be pruned and the root proven
+    Instead of selecting among no unproven children
+    """
+    state = Board.from_moves("33")
+    root = Node(state)
+    root.untried_mask(state)
+    for move in range(4):
+        state.play_move(move)
+        child = root.add_child(move, state)
+        state.undo_move()
+        child.update(0)
+        child.proven_ = -1
+        root.update(1)
+    player = AiPlayerUctMcts(seed=1)
+    assert player._search(state, 10, random.Random(1), root=root) is root
+    assert root.untried_ == 0
+    assert root.proven_ == 1
+    assert root.visits_ == 4
+
+
+def test_node_update_proof() -> None:
+    """Test proven values propagate from children to their parent.
+
+    Given a node with children of known values
+    When update_proof is called
+    Then a winning child should prove a loss for the parent's mover
+    And fully proven children should give the negated best value
+    """
+    board: Board = Board()
+    root = Node(board)
+    children = []
+    for move in root.untried_moves(board):
+        board.play_move(move)
+        children.append(root.add_child(move, board))
+        board.undo_move()
+    assert not root.update_proof()
+    for child in children:
+        child.proven_ = -1
+    children[0].proven_ = 0
+    assert root.update_proof()
+    assert root.proven_ == 0
+    children[1].proven_ = 1
+    root.proven_ = None
+    assert root.update_proof()
+    assert root.proven_ == -1
+
+
+def test_node_expands_lazily() -> None:
+    """Test nodes generate their untried moves on first expansion.
+
+    Given a board counting calls of get_legal_moves
+    When child nodes are created
+    Then the legal moves should not be generated
+    When the untried moves of a node are asked twice
+    Then they should be generated once, as a bitmask of columns
+    And expanding a child should clear its bit
+    """
+    class CountingBoard(Board):
+        """Board counting the legal move generations."""
+
+        __slots__ = ("calls_",)
+
+        def get_legal_moves(self):
+            self.calls_ += 1
+            return super().get_legal_moves()
+
+    board = CountingBoard()
+    board.calls_ = 0
+    root = Node(board)
+    board.play_move(3)
+    child = root.add_child(3, board)
+    assert board.calls_ == 0
+    assert child.untried_ is None
+    assert child.untried_moves(board) == list(range(7))
+    assert child.untried_mask(board) == 0b1111111
+    assert board.calls_ == 1
+    board.play_move(0)
+    child.add_child(0, board)
+    assert child.untried_mask(board) == 0b1111110
+    assert board.calls_ == 1
+
+
+def test_node_records_terminal_status_at_creation() -> None:
+    """Test terminal children are proven when they are created.
+
+    Given positions ending in a win and in a draw
+    When a child node is created for the last move
+    Then the win should be proven for the mover and the draw as a draw
+    And the nodes should have no untried moves
+    """
+    board: Board = Board.from_moves("010101")
+    root = Node(board)
+    board.play_move(0)
+    win = root.add_child(0, board)
+    assert win.proven_ == 1
+    assert win.untried_ == 0
+    draw_moves = [0, 1, 0, 1, 0, 1, 2, 3, 2, 3, 2, 3, 4, 5, 4, 5, 4, 5,
+                  1, 0, 1, 0, 1, 0, 3, 2, 3, 2, 3, 2, 5, 4, 5, 4, 5, 4,
+                  6, 6, 6, 6, 6]
+    board = Board.from_moves(draw_moves)
+    assert not board.is_game_over()
+    root = Node(board)
+    board.play_move(6)
+    draw = root.add_child(6, board)
+    assert board.is_full() and board.get_winner() == 0
+    assert draw.proven_ == 0
+
+
+def test_ai_player_uct_mcts_ponders_on_opponent_time(capsys) -> None:
+    """Test AiPlayerUctMcts keeps searching during the opponent's turn.
+
+    Given an AiPlayerUctMcts with pondering
+    When get_move returns
+    Then the subtree of its move should grow in the background
+    And the next get_move should continue from the pondered subtree
+    """
+    player = AiPlayerUctMcts(player_id=1, simulations=200, seed=17,
+                             ponder=True, ponder_simulations=300)
+    board: Board = Board()
+    try:
+        move = player.get_move(board)
+        # The visits printed before pondering started
+        visits = int(re.search(rf"\[move {move}: (\d+)\]",
+                               capsys.readouterr().out).group(1))
+        child = next(child for child in player.root_.children_
+                     if child.move_ == move)
+        player.ponder_thread_.join(timeout=30)
+        assert child.visits_ == visits + 300
+        board.play_move(move)
+        reply = max(child.children_, key=lambda c: c.visits_)
+        pondered = reply.visits_
+        board.play_move(reply.move_)
+        player.get_move(board)
+        assert player.root_ is reply
+        assert reply.visits_ > pondered
+    finally:
+        player.reset()
+    assert player.ponder_thread_ is None
+
+
+def test_ai_player_uct_mcts_ponder_time_limit() -> None:
+    """Test pondering of a time-limited player ends on its own.
+
+    Given an AiPlayerUctMcts pondering with a time limit and no
+    simulation cap
+    When get_move returns
+    Then the pondering thread should end within the time limit
+    """
+    player = AiPlayerUctMcts(player_id=1, simulations=None,
+                             time_limit_ms=100, seed=19, ponder=True)
+    try:
+        player.get_move(Board())
+        thread = player.ponder_thread_
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+    finally:
+        player.reset()
+
+
+def test_ai_player_uct_mcts_stop_pondering() -> None:
+    """Test pondering stops on request, and needs tree reuse.
+
+    Given an AiPlayerUctMcts pondering without a simulation cap
+    When stop_pondering is called, or the player is pickled
+    Then the thread should end, and the copy should not ponder
+    Given pondering with a compact tree or root-parallel workers
+    Then a ValueError should be raised
+    """
+    player = AiPlayerUctMcts(player_id=1, simulations=None,
+                             time_limit_ms=50, seed=19, ponder=True,
+                             ponder_time_limit_ms=60_000)
+    player.get_move(Board())
+    thread = player.ponder_thread_
+    assert thread.is_alive()
+    copy = pickle.loads(pickle.dumps(player))
+    assert copy.ponder_thread_ is None
+    player.stop_pondering()
+    assert not thread.is_alive()
+    assert player.ponder_thread_ is None
+    with pytest.raises(ValueError):
+        AiPlayerUctMcts(ponder=True, compact_tree=True)
+    with pytest.raises(ValueError):
+        AiPlayerUctMcts(ponder=True, workers=2)
+
+
+def test_ai_player_uct_mcts_ponder_finished_game(capsys) -> None:
+    """Test pondering is skipped when there is no move to ponder on.
+
+    Given a pondering AiPlayerUctMcts
+    When get_move is called on a finished game
+    Then it should return None without starting a thread
+    """
+    player = AiPlayerUctMcts(player_id=2, simulations=50, seed=23,
+                             ponder=True)
+    board = Board.from_moves("0101010")
+    assert player.get_move(board) is None
+    assert "Done" in capsys.readouterr().out
+    assert player.ponder_thread_ is None
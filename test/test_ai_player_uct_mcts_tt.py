@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_ai_player_uct_mcts_tt module is testing functions of
+ai_player_uct_mcts_tt.
+"""
+from engines.ai_player_uct_mcts_tt import AiPlayerUctMctsTT
+from modules.bitboard import BitBoard
+from modules.board import Board
+from modules.transposition_table import REPLACE_ALWAYS
+
+
+def test_ai_player_uct_mcts_tt_defaults():
+    """Test AiPlayerUctMctsTT initialization.
+
+    Given no parameters
+    When AiPlayerUctMctsTT is initialized
+    Then it should have default name and an empty table
+    """
+    player = AiPlayerUctMctsTT()
+    assert player.name_ == "UCT_MCTS_TT"
+    assert len(player.table_) == 0
+
+
+def test_ai_player_uct_mcts_tt_immediate_block() -> None:
+    """Test AiPlayerUctMctsTT blocks an immediate win of the opponent.
+
+    Given an AiPlayerUctMctsTT and a game state
+    Given an immediate winning move possible for the opponent
+    When get_move is called
+    Then it should return the blocking move
+    """
+    player = AiPlayerUctMctsTT(player_id=2, symbol="O", seed=1)
+    board: Board = Board()
+    for move in [0, 1, 1, 2, 2, 4, 2, 4, 3, 3, 3]:
+        board.play_move(move)
+    assert player.get_move(board) == 3
+
+
+def test_ai_player_uct_mcts_tt_shares_transpositions() -> None:
+    """Test statistics are shared between move orders.
+
+    Given an AiPlayerUctMctsTT that searched the empty board
+    When a position is reached by two different move orders
+    Then both should find the same table entry
+    And the mirrored position should share it
+    """
+    player = AiPlayerUctMctsTT(player_id=1, simulations=3000, seed=2,
+                               board_class=BitBoard)
+    board: Board = Board()
+    player.get_move(board)
+    first: Board = Board()
+    second: Board = Board()
+    for move in [3, 2, 4]:
+        first.play_move(move)
+    for move in [4, 2, 3]:
+        second.play_move(move)
+    mirror = Board.from_moves([3, 4, 2])
+    entry = player.table_.lookup(first.get_canonical_key())
+    assert entry is not None
+    assert entry is player.table_.lookup(second.get_canonical_key())
+    assert entry is player.table_.lookup(mirror.get_canonical_key())
+
+
+def test_ai_player_uct_mcts_tt_keeps_table_until_reset() -> None:
+    """Test the table is kept between moves and cleared by reset.
+
+    Given an AiPlayerUctMctsTT with a bounded table
+    When get_move is called twice
+    Then the table should keep growing within its capacity
+    When reset is called
+    Then the table should be empty
+    """
+    player = AiPlayerUctMctsTT(player_id=1, simulations=300, seed=3,
+                               tt_capacity=256, replacement=REPLACE_ALWAYS)
+    board: Board = Board()
+    board.play_move(player.get_move(board))
+    size = len(player.table_)
+    board.play_move(3)
+    player.get_move(board)
+    assert size <= len(player.table_) <= 256
+    player.reset()
+    assert len(player.table_) == 0
+
+
+def test_ai_player_uct_mcts_tt_root_parallel() -> None:
+    """Test AiPlayerUctMctsTT in root-parallel mode.
+
+    Given an AiPlayerUctMctsTT with two workers
+    Given an immediate winning move possible
+    When get_move is called
+    Then it should return a legal move
+    """
+    player = AiPlayerUctMctsTT(player_id=1, simulations=200, workers=2,
+                               seed=4)
+    board: Board = Board()
+    for move in [0, 0, 1, 1, 2, 2]:
+        board.play_move(move)
+    try:
+        move = player.get_move(board)
+    finally:
+        player.reset()
+    assert move in board.get_legal_moves()
+
+
+def test_ai_player_uct_mcts_tt_analyze() -> None:
+    """Test the analysis API of AiPlayerUctMctsTT.
+
+    Given an AiPlayerUctMctsTT
+    When the opening position is analyzed
+    Then the variant should follow the most visited positions in the table
+    And the likelihood should be the win rate of the best move
+    """
+    player = AiPlayerUctMctsTT(simulations=300, seed=6)
+    board: Board = Board()
+    analysis = player.analyze(board)
+    moves = analysis["moves"]
+    assert analysis["variant"][0] == analysis["best_move"]
+    assert len(analysis["variant"]) > 1
+    for move in analysis["variant"]:
+        assert board.is_legal_move(move)
+        board.play_move(move)
+    assert player.get_likelihood_for_win() == \
+        moves[analysis["best_move"]]["win_rate"]
+
+
+def test_ai_player_uct_mcts_tt_prunes_mirrored_root_moves() -> None:
+    """Test mirrored moves of a symmetric root are searched once.
+
+    Given an AiPlayerUctMctsTT
+    When the empty board is analyzed
+    Then only the moves up to the middle column should be searched
+    And the analysis should report every column, mirrored columns
+    sharing their statistics
+    """
+    player = AiPlayerUctMctsTT(simulations=200, seed=5)
+    board = Board()
+    analysis = player.analyze(board)
+    # pylint: disable=protected-access
+    assert set(player._child_stats(board)) == {0, 1, 2, 3}
+    assert set(analysis["moves"]) == set(range(7))
+    for move in range(4, 7):
+        assert analysis["moves"][move] == analysis["moves"][6 - move]
+    assert analysis["best_move"] <= 3
+
+
+def test_ai_player_uct_mcts_tt_small_table() -> None:
+    """Test the search keeps going deeper when the table is full.
+
+    Given an AiPlayerUctMctsTT with a table of 64 entries
+    When a position is analyzed with many more simulations
+    Then the table should fill up
+    And the root moves should be visited by most simulations
+    """
+    player = AiPlayerUctMctsTT(simulations=2000, tt_capacity=64, seed=1)
+    analysis = player.analyze(Board.from_moves("3322"))
+    visits = sorted((stats["visits"] for stats in analysis["moves"].values()),
+                    reverse=True)
+    assert len(player.table_) == 64
+    assert sum(visits) > 1000
+    assert visits[1] > 100
+    assert analysis["moves"][analysis["best_move"]]["visits"] == visits[0]
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_analysis_server module is testing the socket analysis server.
+"""
+import asyncio
+import os
+import tempfile
+import pytest
+from engines.ai_player_solver import AiPlayerSolver
+from engines.ai_player_uct_mcts import AiPlayerUctMcts
+from engines.ai_player_uct_mcts_tt import AiPlayerUctMctsTT
+from modules.analysis_server import (AnalysisServer, analyze_remote, main,
+                                     parse_request)
+
+MCTS = (AiPlayerUctMcts, {"simulations": 50, "seed": 1})
+
+
+def test_parse_request():
+    """Test request lines are parsed.
+
+    Given JSON requests and compact move strings
+    When they are parsed
+    Then the moves, id and budgets should be found
+    And invalid lines and budgets should raise ValueError
+    """
+    assert parse_request(b"334\n") == {"id": "334", "moves": [3, 3, 4],
+                                       "simulations": None,
+                                       "time_limit_ms": None}
+    assert parse_request('{"id": 5, "moves": "12", "simulations": 9}') == \
+        {"id": 5, "moves": [1, 2], "simulations": 9, "time_limit_ms": None}
+    assert parse_request('{"moves": [], "time_limit_ms": 5}')["moves"] == []
+    assert parse_request('{"moves": [], "time_limit_ms": 2.5}')[
+        "time_limit_ms"] == 2.5
+    for line in ["3a", '{"id": 1}', '{"moves": [1.5]}', "{",
+                 '{"moves": [3], "simulations": "x"}',
+                 '{"moves": [3], "simulations": -1}',
+                 '{"moves": [3], "simulations": 1.5}',
+                 '{"moves": [3], "simulations": true}',
+                 '{"moves": [3], "time_limit_ms": "5"}',
+                 '{"moves": [3], "time_limit_ms": -5}']:
+        with pytest.raises(ValueError):
+            parse_request(line)
+
+
+def test_analysis_server_rejects_engines_without_analysis():
+    """Test the engine must provide an analysis.
+
+    Given the solver engine
+    When a server is created for it
+    Then ValueError should be raised
+    """
+    with pytest.raises(ValueError):
+        AnalysisServer((AiPlayerSolver, {}))
+
+
+def test_analysis_server_pipelined_unix_socket():
+    """Test pipelined requests over a Unix socket.
+
+    Given a server analyzing in a thread, listening on a Unix socket
+    When a client sends several requests without waiting
+    Then each request should be answered once, with its id
+    And an immediate win should be found
+    And illegal moves should be answered by an error
+    And a position asked again should come from the cache
+    """
+    async def run():
+        server = AnalysisServer(MCTS, workers=0)
+        path = os.path.join(tempfile.mkdtemp(), "analysis.sock")
+        await server.start(path)
+        try:
+            answers = await analyze_remote(
+                ["001122", {"id": 7, "moves": [3], "simulations": 20},
+                 "0000000", "001122"], path=path)
+            again = await analyze_remote(["001122"], path=path)
+        finally:
+            await server.close()
+        return answers, again
+
+    answers, again = asyncio.run(run())
+    assert sorted(str(answer["id"]) for answer in answers) == \
+        ["0000000", "001122", "001122", "7"]
+    wins = [answer for answer in answers if answer["id"] == "001122"]
+    assert all(answer["best_move"] == 3 for answer in wins)
+    assert all(answer["win_probability"] == 1.0 for answer in wins)
+    assert wins[0]["moves"]["3"]["proven"] == 1
+    assert sorted(answer["cached"] for answer in wins) == [False, True]
+    other = next(answer for answer in answers if answer["id"] == 7)
+    assert other["player"] == 2
+    # The position is symmetric: mirrored columns share their statistics
+    assert sorted(other["moves"]) == [str(move) for move in range(7)]
+    assert sum(other["moves"][str(move)]["visits"] for move in range(4)) == 20
+    assert other["variant"][0] == other["best_move"]
+    error = next(answer for answer in answers if answer["id"] == "0000000")
+    assert "Illegal move" in error["error"]
+    assert again[0]["cached"]
+
+
+def test_analysis_server_answers_failed_evaluations():
+    """Test every request is answered, even if its evaluation fails.
+
+    Given a server whose evaluation raises an unexpected error
+    When a client sends an invalid budget and a failing request
+    Then both should be answered by an error
+    And the connection should keep serving requests
+    """
+    async def run():
+        server = AnalysisServer(MCTS, workers=0, max_pending=1)
+        evaluate = server.evaluate
+
+        async def failing(request):
+            if request["id"] == "fail":
+                raise RuntimeError("engine crashed")
+            return await evaluate(request)
+
+        server.evaluate = failing
+        path = os.path.join(tempfile.mkdtemp(), "analysis.sock")
+        await server.start(path)
+        try:
+            return await asyncio.wait_for(analyze_remote(
+                [{"id": 1, "moves": [3], "simulations": "x"},
+                 {"id": "fail", "moves": [3]}, "33"], path=path), 30)
+        finally:
+            await server.close()
+
+    answers = asyncio.run(run())
+    assert [answer["id"] for answer in answers] == [None, "fail", "33"]
+    assert "simulations" in answers[0]["error"]
+    assert answers[1]["error"] == "RuntimeError: engine crashed"
+    assert answers[2]["best_move"] in range(7)
+
+
+def test_analysis_server_answers_overlong_lines():
+    """Test a line longer than the reader limit is answered.
+
+    Given a server on a Unix socket
+    When a client sends lines of 100 and 200 kB before a short request
+    Then each long line should be answered by one error
+    And the short request should still be analyzed
+    """
+    async def run():
+        server = AnalysisServer(MCTS, workers=0, cache_size=0)
+        path = os.path.join(tempfile.mkdtemp(), "analysis.sock")
+        await server.start(path)
+        try:
+            return await asyncio.wait_for(analyze_remote(
+                ["3" * 100_000, "3" * 200_000, "33"], path=path), 30)
+        finally:
+            await server.close()
+
+    answers = asyncio.run(run())
+    assert answers[:2] == [{"id": None, "error": "Request line too long."}] * 2
+    assert answers[2]["id"] == "33"
+    assert answers[2]["best_move"] in range(7)
+
+
+def test_analysis_server_tcp_worker_process():
+    """Test a server with a worker process on a TCP socket.
+
+    Given a server with a warm AiPlayerUctMctsTT in a worker process
+    When a client asks for two positions
+    Then both should be answered by the worker's engine
+    """
+    async def run():
+        server = AnalysisServer((AiPlayerUctMctsTT, {"simulations": 30}),
+                                workers=1, cache_size=0)
+        host, port = await server.start(port=0)
+        try:
+            return await analyze_remote(["33", "33"], host=host, port=port)
+        finally:
+            await server.close()
+
+    answers = asyncio.run(run())
+    assert len(answers) == 2
+    for answer in answers:
+        assert answer["id"] == "33"
+        assert not answer["cached"]
+        assert answer["player"] == 1
+        assert str(answer["best_move"]) in answer["moves"]
+
+
+def test_main_requires_an_address():
+    """Test the command line needs a socket.
+
+    Given no --socket and no --port option
+    When main is called
+    Then the parser should exit with an error
+    """
+    with pytest.raises(SystemExit):
+        main([])
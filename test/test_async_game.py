@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_async_game module is testing the asyncio game loop.
+"""
+import asyncio
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from engines.ai_player_random import AiPlayerRandom
+from engines.async_player import AsyncPlayer, ExecutorPlayer, QueuePlayer
+from modules.async_game import play_game_async, play_games, run_games
+from modules.bitboard import BitBoard
+from modules.board import Board
+
+
+class SlowRandomPlayer(AsyncPlayer):
+    """Player waiting without blocking before a random move."""
+
+    def __init__(self, seed, delay=0.0, player_id=1):
+        super().__init__("Slow", "X", player_id=player_id)
+        self.rng_ = random.Random(seed)
+        self.delay_ = delay
+
+    async def get_move(self, board) -> int:
+        await asyncio.sleep(self.delay_)
+        return self.rng_.choice(board.get_legal_moves())
+
+
+class IllegalPlayer(AsyncPlayer):
+    """Player always returning an illegal move."""
+
+    async def get_move(self, board) -> int:
+        return -1
+
+
+def test_play_game_async_finishes():
+    """Test a game between two asynchronous players.
+
+    Given two random players
+    When the game is played
+    Then it should end with a legal record
+    """
+    players = [SlowRandomPlayer(1), SlowRandomPlayer(2, player_id=2)]
+    record = asyncio.run(play_game_async(players, BitBoard))
+    board: Board = Board()
+    for move in record["moves"]:
+        board.play_move(move)
+    assert board.is_game_over()
+    assert record["winner"] == board.get_winner()
+    assert not record["forfeit"]
+
+
+def test_play_game_async_forfeit():
+    """Test an illegal move forfeits the game.
+
+    Given a player returning an illegal move
+    When the game is played
+    Then the opponent should win by forfeit
+    """
+    players = [IllegalPlayer("A", "X"), SlowRandomPlayer(3, player_id=2)]
+    record = asyncio.run(play_game_async(players))
+    assert record == {"winner": 2, "moves": [], "forfeit": True}
+
+
+def test_run_games_multiplexes_waiting_players():
+    """Test waiting players do not block other games.
+
+    Given 40 games of players waiting 5 ms per move
+    When they are played concurrently
+    Then all should finish in far less time than one after another
+    """
+    pairings = [[SlowRandomPlayer(seed, 0.005),
+                 SlowRandomPlayer(seed + 1000, 0.005, player_id=2)]
+                for seed in range(40)]
+    start = time.perf_counter()
+    records = play_games(pairings)
+    elapsed = time.perf_counter() - start
+    moves = sum(len(record["moves"]) for record in records)
+    assert len(records) == 40
+    assert elapsed < moves * 0.005 / 4
+
+
+def test_run_games_with_queue_player():
+    """Test a game against a player fed from a queue.
+
+    Given a QueuePlayer fed by another task
+    When a limited number of games run concurrently
+    Then the queued moves should be played
+    """
+    async def session():
+        remote = QueuePlayer(player_id=2)
+        games = asyncio.create_task(run_games(
+            [[SlowRandomPlayer(5), remote],
+             [SlowRandomPlayer(6), SlowRandomPlayer(7, player_id=2)]],
+            max_concurrent=1))
+        for _ in range(21):
+            for move in range(7):
+                await remote.queue_.put(move)
+        return await games
+
+    records = asyncio.run(session())
+    assert records[0]["moves"][1] in range(7)
+    assert all(record["moves"] for record in records)
+
+
+def test_play_games_with_process_pool():
+    """Test games between players running in a process pool.
+
+    Given ExecutorPlayers sharing a process pool
+    When games are played concurrently
+    Then every game should finish with a legal record
+    """
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        pairings = [[ExecutorPlayer(AiPlayerRandom(), executor),
+                     ExecutorPlayer(AiPlayerRandom(player_id=2), executor)]
+                    for _ in range(2)]
+        records = play_games(pairings)
+    for record in records:
+        board: Board = Board()
+        for move in record["moves"]:
+            board.play_move(move)
+        assert board.is_game_over()
+        assert not record["forfeit"]
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_async_player module is testing the asynchronous player adapters.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from engines.ai_player_random import AiPlayerRandom
+from engines.ai_player_uct_mcts import AiPlayerUctMcts
+from engines.async_player import ExecutorPlayer, QueuePlayer
+from modules.board import Board
+
+
+def test_executor_player_runs_engine():
+    """Test ExecutorPlayer awaits a synchronous engine.
+
+    Given an ExecutorPlayer wrapping an MCTS engine in a thread pool
+    When get_move is awaited on a position with an immediate win
+    Then it should return the winning move
+    And the board should be unchanged
+    """
+    board: Board = Board()
+    for move in [0, 0, 1, 1, 2, 2]:
+        board.play_move(move)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        player = ExecutorPlayer(AiPlayerUctMcts(player_id=1, seed=1,
+                                                simulations=200), executor)
+        assert asyncio.run(player.get_move(board)) == 3
+    assert player.name_ == "UCT_MCTS"
+    assert board.ply_ == 6
+    player.set_player_id(2)
+    assert player.player_.player_id_ == 2
+    player.reset()
+    assert player.player_.root_ is None
+
+
+def test_executor_player_process_pool():
+    """Test ExecutorPlayer with a process pool.
+
+    Given an ExecutorPlayer sharing a process pool
+    When get_move is awaited
+    Then a pickled copy of the engine should select a legal move
+    """
+    board: Board = Board()
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        player = ExecutorPlayer(AiPlayerRandom(), executor)
+        assert asyncio.run(player.get_move(board)) in range(7)
+
+
+def test_queue_player_skips_illegal_moves():
+    """Test QueuePlayer awaits legal moves from its queue.
+
+    Given a QueuePlayer with an illegal and a legal move queued
+    When get_move is awaited
+    Then the illegal move should be dropped
+    """
+    board: Board = Board()
+    for _ in range(6):
+        board.play_move(0)
+
+    async def feed_and_move():
+        player = QueuePlayer()
+        await player.queue_.put(0)
+        await player.queue_.put(9)
+        await player.queue_.put(4)
+        return await player.get_move(board)
+
+    assert asyncio.run(feed_and_move()) == 4
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_batch_rollout module is testing the NumPy batch rollouts.
+"""
+import random
+import pytest
+from modules.bitboard import BitBoard
+from modules.board import Board
+
+np = pytest.importorskip("numpy")
+# pylint: disable=wrong-import-position
+from engines.batch_rollout import BatchRollout  # noqa: E402
+
+
+def test_batch_rollout_counts_all_playouts() -> None:
+    """Test every playout ends in a win or a draw.
+
+    Given a BatchRollout of 50 playouts
+    When it runs from the empty board
+    Then the counts should sum up to 50
+    And the board should be unchanged
+    """
+    board: Board = Board()
+    counts = BatchRollout(playouts=50).run(board, random.Random(1))
+    assert set(counts) == {0, 1, 2}
+    assert sum(counts.values()) == 50
+    assert board.ply_ == 0
+    assert board.get_legal_moves() == list(range(7))
+
+
+def test_batch_rollout_is_seeded() -> None:
+    """Test batch rollouts are reproducible from the seed.
+
+    Given two random generators with the same seed
+    When the same position is played out with each
+    Then the counts should be equal
+    """
+    board: BitBoard = BitBoard()
+    board.play_move(3)
+    rollout = BatchRollout(playouts=40, guided=False)
+    assert rollout.run(board, random.Random(7)) == \
+        rollout.run(board, random.Random(7))
+
+
+def test_batch_rollout_finished_game() -> None:
+    """Test a decided position counts all playouts for the winner.
+
+    Given a board won by player 1
+    When it is played out
+    Then all playouts should be won by player 1
+    """
+    board: Board = Board()
+    for move in [0, 1, 0, 1, 0, 1, 0]:
+        board.play_move(move)
+    assert BatchRollout(playouts=8).run(board) == {0: 0, 1: 8, 2: 0}
+
+
+def test_batch_rollout_guided_wins_and_blocks() -> None:
+    """Test guided playouts win and block immediate threats.
+
+    Given player 1 with an open three in the bottom row
+    When guided playouts run
+    Then player 1 should win all playouts, as both ends cannot be blocked
+    Given player 1 with three discs in a row and one open end
+    Then player 2 should block it in every playout
+    """
+    board: Board = Board()
+    for move in [3, 3, 4, 4, 5]:
+        board.play_move(move)
+    assert BatchRollout(playouts=32).run(board, random.Random(2)) == \
+        {0: 0, 1: 32, 2: 0}
+    board = Board()
+    for move in [0, 6, 1, 6, 2]:
+        board.play_move(move)
+    counts = BatchRollout(playouts=32).run(board, random.Random(2))
+    assert counts[1] < 32
+
+
+def test_batch_rollout_fills_the_board() -> None:
+    """Test playouts of a drawn position fill the board.
+
+    Given a position where every continuation is a draw
+    When it is played out
+    Then all playouts should be draws
+    """
+    board: Board = Board()
+    for move in [4, 5, 6, 6, 2, 5, 0, 1, 6, 0, 2, 2, 1, 3, 1, 4, 6, 4, 5,
+                 4, 2, 2, 0, 6, 1, 0, 4, 5, 3, 3, 3, 4, 3, 6, 3, 1, 0, 0, 5]:
+        board.play_move(move)
+    assert board.get_legal_moves() == [1, 2, 5]
+    assert BatchRollout(playouts=16).run(board, random.Random(3)) == \
+        {0: 16, 1: 0, 2: 0}
+
+
+def test_batch_rollout_has_line_connect_n() -> None:
+    """Test the vectorized line check for all directions and lengths.
+
+    Given masks with aligned discs on a 6x7 board
+    When _has_line checks them for connect four and five
+    Then exactly the lines of the needed length should be found
+    """
+    stride = 7
+    vertical = 0b1111
+    horizontal = sum(1 << (col * stride) for col in range(4))
+    diagonal = sum(1 << (col * stride + col) for col in range(4))
+    anti = sum(1 << (col * stride + 3 - col) for col in range(4))
+    broken = sum(1 << (col * stride) for col in (0, 1, 2, 4))
+    masks = np.array([vertical, horizontal, diagonal, anti, broken],
+                     dtype=np.uint64)
+    # pylint: disable=protected-access
+    assert BatchRollout._has_line(masks, stride, 4).tolist() == \
+        [True, True, True, True, False]
+    assert not BatchRollout._has_line(masks, stride, 5).any()
+
+
+def test_batch_rollout_rejects_large_boards() -> None:
+    """Test boards beyond 64-bit masks are rejected.
+
+    Given a 9x9 board
+    When it is played out
+    Then a ValueError should be raised
+    """
+    with pytest.raises(ValueError):
+        BatchRollout().run(Board(rows=9, cols=9))
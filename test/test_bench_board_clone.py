@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_bench_board_clone module is testing the clone microbenchmark.
+"""
+from benchmarks.bench_board_clone import make_board, run
+from modules.bitboard import BitBoard
+
+
+def test_make_board_shares_players_with_clone():
+    """Test the benchmark position and its clone.
+
+    Given the benchmark midgame board
+    When it is cloned
+    Then the clone should share the players and hold the same grid
+    """
+    board = make_board(BitBoard)
+    clone = board.clone()
+    assert clone.players is board.players
+    assert clone.grid_ == board.grid_
+
+
+def test_run_reports_all_variants():
+    """Test the microbenchmark reports every variant.
+
+    Given a small number of copies
+    When run is called
+    Then it should report a positive time for each variant
+    """
+    results = run(number=10)
+    assert len(results) == 6
+    assert all(usec > 0 for usec in results.values())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_bench_suite module is testing the benchmark suite.
+"""
+import json
+from benchmarks.bench_suite import compare, main, make_positions, np, run
+from modules.bitboard import BitBoard
+
+
+def test_make_positions_is_fixed():
+    """Test the benchmark positions are reproducible.
+
+    Given the default seed
+    When make_positions is called twice
+    Then both calls should return the same undecided positions
+    """
+    first = make_positions(BitBoard, count=8)
+    second = make_positions(BitBoard, count=8)
+    assert [board.history_ for board in first] == \
+        [board.history_ for board in second]
+    assert not any(board.is_game_over() for board in first)
+
+
+def test_run_reports_all_metrics():
+    """Test the suite reports every metric.
+
+    Given a small scale
+    When run is called
+    Then it should report a positive value for each metric
+    And the batch rollout rate with NumPy installed
+    """
+    results = run(scale=0.01)
+    assert len(results["metrics"]) == (11 if np is None else 12)
+    assert all(value > 0 for value in results["metrics"].values())
+    assert results["environment"]["scale"] == 0.01
+
+
+def test_compare_detects_regressions():
+    """Test comparing results against a baseline.
+
+    Given a baseline and results with a slower rate and more memory
+    When compare is called
+    Then both metrics should be reported, but not changes within
+    the threshold nor improvements
+    """
+    baseline = {"metrics": {"Board.play_undo_per_sec": 1000.0,
+                            "rollouts.RandomRollout_per_sec": 1000.0,
+                            "mcts.simulations_per_sec": 1000.0,
+                            "mcts.peak_memory_kib": 100.0,
+                            "removed.metric": 1.0}}
+    results = {"metrics": {"Board.play_undo_per_sec": 500.0,
+                           "rollouts.RandomRollout_per_sec": 950.0,
+                           "mcts.simulations_per_sec": 2000.0,
+                           "mcts.peak_memory_kib": 150.0}}
+    regressions = compare(results, baseline, threshold=0.1)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("Board.play_undo_per_sec")
+    assert regressions[1].startswith("mcts.peak_memory_kib")
+    assert compare(results, results) == []
+
+
+def test_main_saves_and_compares(tmp_path, capsys):
+    """Test the command line entry point.
+
+    Given a baseline that is out of reach
+    When main is called with an output and that baseline
+    Then it should write the results and report the regressions
+    """
+    output = tmp_path / "results.json"
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(
+        {"metrics": {"rollouts.ThreatRollout_per_sec": 1e12}}),
+        encoding="utf-8")
+    assert main(["--scale", "0.01", "--output", str(output)]) == 0
+    assert "rollouts.ThreatRollout_per_sec" in json.loads(
+        output.read_text(encoding="utf-8"))["metrics"]
+    assert main(["--scale", "0.01", "--baseline", str(baseline)]) == 1
+    assert "REGRESSION rollouts.ThreatRollout_per_sec" in \
+        capsys.readouterr().out
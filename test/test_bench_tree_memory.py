@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_bench_tree_memory module is testing the tree memory benchmark.
+"""
+from benchmarks.bench_tree_memory import build_nodes, build_store, run
+
+
+def test_trees_have_the_same_shape():
+    """Test both benchmark trees have the same shape.
+
+    Given the same number of nodes
+    When a Node tree and a TreeStore are built
+    Then the root children should match
+    """
+    root = build_nodes(50)
+    tree = build_store(50)
+    assert [child.move_ for child in root.children_] == \
+        [tree.move_[child] for child in tree.children(0)]
+    assert len(tree) == 50
+
+
+def test_run_reports_store_is_smaller():
+    """Test the memory benchmark.
+
+    Given a small tree size
+    When run is called
+    Then the TreeStore should use less memory per node than Node
+    """
+    results = run(sizes=(2000,))
+    assert results["TreeStore.2000"] < results["Node.2000"]
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_bitboard module is testing the BitBoard class of py-four-in-a-row.
+"""
+import random
+from engines.ai_player_random import AiPlayerRandom
+from engines.ai_player_uct_mcts import AiPlayerUctMcts
+from modules.bitboard import BitBoard
+from modules.board import Board
+from py_four_in_a_row import game_loop
+
+
+def test_bitboard_matches_board_on_random_games():
+    """Test BitBoard agrees with Board during random games.
+
+    Given a Board and a BitBoard
+    When the same random moves are played and undone on both
+    Then grid, cells, legal moves, winner and current player should match
+    """
+    rng = random.Random(42)
+    for _ in range(50):
+        board = Board()
+        bitboard = BitBoard()
+        while not board.is_game_over():
+            move = rng.choice(board.get_legal_moves())
+            board.play_move(move)
+            bitboard.play_move(move)
+            assert bitboard.grid_ == board.grid_
+            assert bitboard.get_cells() == board.get_cells()
+            assert bitboard.get_legal_moves() == board.get_legal_moves()
+            assert bitboard.check_winner() == board.check_winner()
+            assert bitboard.get_current_player() == \
+                board.get_current_player()
+            assert bitboard.is_game_over() == board.is_game_over()
+        assert bitboard.history_ == board.history_
+        while board.undo_move():
+            assert bitboard.undo_move()
+            assert bitboard.grid_ == board.grid_
+            assert bitboard.last_move_ == board.last_move_
+        assert not bitboard.undo_move()
+
+
+def test_bitboard_from_board():
+    """Test converting a Board into a BitBoard.
+
+    Given a Board with some moves played
+    When BitBoard.from_board is called
+    Then the BitBoard should hold the same position
+    """
+    board = Board(current_player=2)
+    for move in [3, 3, 2, 4]:
+        board.play_move(move)
+    bitboard = BitBoard.from_board(board)
+    assert bitboard.grid_ == board.grid_
+    assert bitboard.get_current_player() == board.get_current_player()
+    assert bitboard.history_ == board.history_
+
+
+def test_game_loop_with_bitboard():
+    """Test game_loop can be played on a BitBoard.
+
+    Given two random players
+    When game_loop is called with board_class BitBoard
+    Then the game should finish with any result
+    """
+
+    def dummy_setup_players():
+        return [AiPlayerRandom(name="Maria", symbol="X", player_id=1),
+                AiPlayerRandom(name="Robbie", symbol="O", player_id=2)]
+    winner, players = game_loop(setup=dummy_setup_players,
+                                board_class=BitBoard)
+    assert winner in [0, 1, 2]
+    assert len(players) == 2
+
+
+def test_ai_player_uct_mcts_searches_on_bitboard():
+    """Test AiPlayerUctMcts can search on a BitBoard.
+
+    Given an AiPlayerUctMcts using BitBoard for its search
+    Given an immediate winning move possible on a Board
+    When get_move is called
+    Then it should find the winning move
+    """
+    player = AiPlayerUctMcts(player_id=1, simulations=200,
+                             board_class=BitBoard)
+    board = Board()
+    for move in [0, 0, 1, 1, 2, 2]:
+        board.play_move(move)
+    assert player.get_move(board) == 3
+
+
+def test_bitboard_key_matches_board_key():
+    """Test BitBoard and Board produce the same position keys.
+
+    Given a Board and a BitBoard
+    When the same random moves are played and undone on both
+    Then both boards should report the same key at every step
+    """
+    rng = random.Random(7)
+    board = Board()
+    bitboard = BitBoard()
+    keys = [board.get_key()]
+    while not board.is_game_over():
+        move = rng.choice(board.get_legal_moves())
+        board.play_move(move)
+        bitboard.play_move(move)
+        assert bitboard.get_key() == board.get_key()
+        keys.append(board.get_key())
+    assert len(set(keys)) == len(keys)
+    while board.undo_move():
+        bitboard.undo_move()
+        keys.pop()
+        assert board.get_key() == keys[-1]
+        assert bitboard.get_key() == keys[-1]
+
+
+def test_bitboard_matches_board_connect_five():
+    """Test BitBoard agrees with Board on a connect-5 variant.
+
+    Given a Board and a BitBoard with 8 rows, 9 columns and connect 5
+    When the same random moves are played on both
+    Then the winner should match after every move
+    """
+    rng = random.Random(5)
+    for _ in range(30):
+        board = Board(rows=8, cols=9, connect=5)
+        bitboard = BitBoard(rows=8, cols=9, connect=5)
+        while not board.is_game_over():
+            move = rng.choice(board.get_legal_moves())
+            board.play_move(move)
+            bitboard.play_move(move)
+            assert bitboard.check_winner() == board.check_winner()
+
+
+def test_bitboard_matches_board_connect_three():
+    """Test BitBoard agrees with Board on a connect-3 variant.
+
+    Given a Board and a BitBoard with 5 rows, 6 columns and connect 3
+    When the same random moves are played on both
+    Then the winner and the cells should match after every move
+    """
+    rng = random.Random(3)
+    for _ in range(30):
+        board = Board(rows=5, cols=6, connect=3)
+        bitboard = BitBoard(rows=5, cols=6, connect=3)
+        while not board.is_game_over():
+            move = rng.choice(board.get_legal_moves())
+            board.play_move(move)
+            bitboard.play_move(move)
+            assert bitboard.check_winner() == board.check_winner()
+            assert bitboard.get_cells() == board.get_cells()
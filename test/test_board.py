@@ -3,16 +3,23 @@
 """
 test_board module is testing the Board class of py-four-in-a-row.
 """
+import copy
+import sys
+import tracemalloc
 import unittest
-from modules.board import Board
+from modules.bitboard import BitBoard
+from modules.board import (POSITION_BYTES, Board, decode_positions,
+                           encode_positions)
 
 
 class TestBoard(unittest.TestCase):
     """Unit tests for the Board class."""
 
+    board_class = Board
+
     def setUp(self):
         """Fixture setup before each test method."""
-        self.board = Board()
+        self.board = self.board_class()
 
     def test_initialization(self):
         """Test board initialization.
@@ -178,7 +185,7 @@ class TestBoard(unittest.TestCase):
         When repr is called
         Then it should return the correct string of the empty board
         """
-        board = Board(current_player=1)
+        board = self.board_class(current_player=1)
         board.players = [
             type("Player", (), {"name_": "Player 1", "symbol_": "X"}),
             type("Player", (), {"name_": "Player 2", "symbol_": "O"})
@@ -197,7 +204,7 @@ class TestBoard(unittest.TestCase):
         When repr is called
         Then it should include the current player information
         """
-        board = Board(current_player=1)
+        board = self.board_class(current_player=1)
         board.players = [
             type("Player", (), {"name_": "Player 1", "symbol_": "X"}),
             type("Player", (), {"name_": "Player 2", "symbol_": "O"})
@@ -215,7 +222,7 @@ class TestBoard(unittest.TestCase):
         When repr is called
         Then it should not include the current player information
         """
-        board = Board(current_player=1)
+        board = self.board_class(current_player=1)
         board.players = [
             type("Player", (), {"name_": "Player 1", "symbol_": "X"}),
             type("Player", (), {"name_": "Player 2", "symbol_": "O"})
@@ -241,7 +248,7 @@ class TestBoard(unittest.TestCase):
         When repr is called
         Then it should return the correct string representation of the board
         """
-        board = Board()
+        board = self.board_class()
         board.players = [
             type("Player", (), {"name_": "Player 1", "symbol_": "X"}),
             type("Player", (), {"name_": "Player 2", "symbol_": "O"})
@@ -450,6 +457,218 @@ class TestBoard(unittest.TestCase):
                 self.board.play_move(col)  # Player 2
         self.assertEqual(self.board.get_winner(), 1)
 
+    def test_check_winner_disc_in_middle_of_line(self):
+        """Test a winning disc placed in the middle of a line.
+
+        Given a Board instance with discs in columns 0, 1 and 3
+        When the gap in column 2 is filled
+        Then check_winner should return that player's number
+        """
+        for col in [0, 0, 1, 1, 3, 3]:
+            self.board.play_move(col)
+        self.assertEqual(self.board.check_winner(), 0)
+        self.board.play_move(2)
+        self.assertEqual(self.board.check_winner(), 1)
+
+    def test_undo_winning_move_clears_winner(self):
+        """Test that undoing the winning move clears the cached winner.
+
+        Given a Board instance where the game is won
+        When undo_move is called
+        Then there should be no winner and legal moves again
+        """
+        for col in [0, 0, 1, 1, 2, 2, 3]:
+            self.board.play_move(col)
+        self.assertEqual(self.board.get_winner(), 1)
+        self.assertTrue(self.board.is_game_over())
+        self.board.undo_move()
+        self.assertEqual(self.board.get_winner(), 0)
+        self.assertFalse(self.board.is_game_over())
+        self.assertEqual(self.board.get_legal_moves(), [0, 1, 2, 3, 4, 5, 6])
+
+    def test_winner_kept_when_playing_on(self):
+        """Test that the first winner is kept when moves are played on.
+
+        Given a Board instance where player 1 has won
+        When further moves are played and undone
+        Then the winner should stay player 1
+        """
+        for col in [0, 0, 1, 1, 2, 2, 3]:
+            self.board.play_move(col)
+        self.board.play_move(3)
+        self.assertEqual(self.board.check_winner(), 1)
+        self.board.undo_move()
+        self.assertEqual(self.board.check_winner(), 1)
+
+    def test_clone(self):
+        """Test cloning the board.
+
+        Given a Board instance with some moves played
+        When clone is called
+        Then the clone should hold the same position
+        And moves on the clone should not affect the original board
+        And players should be shared by reference
+        """
+        self.board.players = [
+            type("Player", (), {"name_": "Player 1", "symbol_": "X"}),
+            type("Player", (), {"name_": "Player 2", "symbol_": "O"})
+        ]
+        for col in [3, 3, 2]:
+            self.board.play_move(col)
+        clone = self.board.clone()
+        self.assertIsNot(clone, self.board)
+        self.assertIs(clone.players, self.board.players)
+        self.assertEqual(clone.grid_, self.board.grid_)
+        self.assertEqual(clone.history_, self.board.history_)
+        self.assertEqual(clone.get_current_player(), 2)
+        clone.play_move(4)
+        self.assertEqual(self.board.grid_[5][4], 0)
+        self.assertEqual(len(self.board.history_), 3)
+        clone.undo_move()
+        clone.undo_move()
+        self.assertEqual(clone.grid_[5][2], 0)
+        self.assertEqual(self.board.grid_[5][2], 1)
+
+    def test_clone_history_limit(self):
+        """Test cloning the board with a bounded history.
+
+        Given a Board instance with some moves played
+        When clone is called with a history limit
+        Then the clone should keep only the most recent moves
+        And only these moves can be undone
+        """
+        for col in [0, 1, 2, 3, 4]:
+            self.board.play_move(col)
+        clone = self.board.clone(history_limit=2)
+        self.assertEqual(clone.history_, self.board.history_[-2:])
+        self.assertTrue(clone.undo_move())
+        self.assertTrue(clone.undo_move())
+        self.assertFalse(clone.undo_move())
+        self.assertEqual(clone.grid_[5][:3], [1, 2, 1])
+        empty_history = self.board.clone(history_limit=0)
+        self.assertEqual(empty_history.history_, [])
+        self.assertEqual(empty_history.grid_, self.board.grid_)
+        self.assertFalse(empty_history.is_full())
+
+    def test_clone_keeps_winner(self):
+        """Test that a clone keeps the winner of the position.
+
+        Given a Board instance where the game is won
+        When clone is called without history
+        Then the clone should report the same winner
+        """
+        for col in [0, 0, 1, 1, 2, 2, 3]:
+            self.board.play_move(col)
+        clone = self.board.clone(history_limit=0)
+        self.assertEqual(clone.get_winner(), 1)
+        self.assertEqual(clone.get_legal_moves(), [])
+
+    def test_get_key_transposition(self):
+        """Test that transposed move orders give the same key.
+
+        Given two Board instances
+        When the same discs are played in a different order
+        Then both boards should have the same key
+        And a different position should have a different key
+        """
+        other = self.board_class()
+        for col in [0, 1, 2, 3]:
+            self.board.play_move(col)
+        for col in [2, 3, 0, 1]:
+            other.play_move(col)
+        self.assertEqual(self.board.get_key(), other.get_key())
+        other.undo_move()
+        other.play_move(4)
+        self.assertNotEqual(self.board.get_key(), other.get_key())
+        self.assertEqual(self.board.clone().get_key(), self.board.get_key())
+
+    def test_connect_five_on_large_board(self):
+        """Test a connect-5 variant on an 8x9 board.
+
+        Given a Board with 8 rows, 9 columns and connect 5
+        When four discs are aligned
+        Then there should be no winner yet
+        When the fifth disc is added on a diagonal
+        Then the player should win
+        """
+        board = self.board_class(rows=8, cols=9, connect=5)
+        for col in [0, 8, 1, 8, 2, 8, 3, 7]:
+            board.play_move(col)
+        self.assertEqual(board.check_winner(), 0)
+        board.reset()
+        # Player 1 builds the diagonal (0,0) .. (4,4)
+        for col in [0, 1, 1, 2, 2, 3, 2, 3, 3, 4, 3, 4, 4, 8, 4]:
+            board.play_move(col)
+            self.assertEqual(board.check_winner(), 0)
+        board.play_move(8)
+        board.play_move(4)
+        self.assertEqual(board.check_winner(), 1)
+        self.assertEqual(self.board_class.from_board(board).connect_, 5)
+        self.assertEqual(board.clone().connect_, 5)
+
+    def test_board_repr_footer_follows_columns(self):
+        """Test the column footer of the string representation.
+
+        Given a Board with 9 columns
+        When repr is called
+        Then the footer should label all 9 columns
+        """
+        board = self.board_class(rows=2, cols=9, connect=5)
+        board.players = [
+            type("Player", (), {"name_": "Player 1", "symbol_": "X"}),
+            type("Player", (), {"name_": "Player 2", "symbol_": "O"})
+        ]
+        lines = repr(board).split("\n")
+        self.assertEqual(lines[2], "--+---+---+---+---+---+---+---+--")
+        self.assertEqual(lines[3], "0 | 1 | 2 | 3 | 4 | 5 | 6 | 7 | 8")
+        self.assertEqual(len(lines[0]), len(lines[3]))
+
+    def test_play_move_allocations(self):
+        """Test play_move does not allocate a record per move.
+
+        Given a Board instance whose move list has been grown once
+        When 20 moves are played under tracemalloc
+        Then the board module should hold only a few new memory blocks
+        """
+        moves = [3, 3, 2, 4, 2, 2, 4, 1, 5, 3, 6, 0, 0, 1, 1, 5, 6, 6, 0, 1]
+        for col in moves:
+            self.board.play_move(col)
+        while self.board.undo_move():
+            pass
+        module = tracemalloc.Filter(
+            True, sys.modules[self.board_class.__module__].__file__)
+        tracemalloc.start()
+        try:
+            # Drain the interpreter's free lists, so that any new record
+            # would be a fresh, traced allocation
+            hoard = [{"row": i, "col": i, "player": i} for i in range(200)]
+            before = tracemalloc.take_snapshot().filter_traces([module])
+            for col in moves:
+                self.board.play_move(col)
+            after = tracemalloc.take_snapshot().filter_traces([module])
+        finally:
+            tracemalloc.stop()
+        del hoard
+        blocks = sum(stat.count_diff
+                     for stat in after.compare_to(before, "filename"))
+        # Only the position key and counters may grow into new objects
+        self.assertLessEqual(blocks, 3)
+        self.assertEqual(len(self.board.history_), len(moves))
+
+    def test_board_uses_slots(self):
+        """Test boards have no per-instance attribute dict.
+
+        Given a Board instance
+        When it is inspected and deep-copied
+        Then it should have no __dict__ and share the line index
+        """
+        self.assertFalse(hasattr(self.board, "__dict__"))
+        self.board.play_move(3)
+        board = copy.deepcopy(self.board)
+        self.assertIs(board.lines_, self.board.lines_)
+        self.assertEqual(board.history_, self.board.history_)
+        self.assertEqual(board.get_key(), self.board.get_key())
+
     def test_get_current_player(self):
         """Test get_current_player method.
 
@@ -463,6 +682,181 @@ class TestBoard(unittest.TestCase):
         self.board.play_move(1)
         self.assertEqual(self.board.get_current_player(), 1)
 
+    def test_move_string_round_trip(self):
+        """Test move strings.
+
+        Given a Board with some moves played
+        When it is encoded with to_moves and decoded with from_moves
+        Then the same position and history should be restored
+        And illegal or unknown moves should raise ValueError
+        """
+        for col in [3, 3, 2, 4, 6]:
+            self.board.play_move(col)
+        self.assertEqual(self.board.to_moves(), "33246")
+        board = self.board_class.from_moves("33246")
+        self.assertEqual(board.get_key(), self.board.get_key())
+        self.assertEqual(board.history_, self.board.history_)
+        self.assertEqual(
+            self.board_class.from_moves([3, 3, 2, 4, 6]).to_moves(), "33246")
+        wide = self.board_class.from_moves("ab", rows=4, cols=12)
+        self.assertEqual(wide.moves_, [10, 11])
+        for moves in ["7", "x", "0000000", [-1]]:
+            with self.assertRaises(ValueError):
+                self.board_class.from_moves(moves)
+        with self.assertRaises(ValueError):
+            self.board.clone(history_limit=2).to_moves()
+
+    def test_binary_round_trip(self):
+        """Test binary position records.
+
+        Given positions with and without a winner
+        When they are encoded with to_bytes and decoded with from_bytes
+        Then the decoded board should hold the same position
+        And it should have no history
+        """
+        for moves in ["", "3", "332244", "0011223"]:
+            board = self.board_class.from_moves(moves)
+            data = board.to_bytes()
+            self.assertEqual(len(data), POSITION_BYTES)
+            decoded = self.board_class.from_bytes(data)
+            self.assertEqual(decoded.get_key(), board.get_key())
+            self.assertEqual(decoded.grid_, board.grid_)
+            self.assertEqual(decoded.get_current_player(),
+                             board.get_current_player())
+            self.assertEqual(decoded.get_winner(), board.get_winner())
+            self.assertEqual(decoded.get_legal_moves(),
+                             board.get_legal_moves())
+            self.assertFalse(decoded.undo_move())
+        self.assertLess(self.board_class.from_moves("0").to_bytes(),
+                        self.board_class.from_moves("1").to_bytes())
+
+    def test_from_bytes_rejects_invalid_records(self):
+        """Test invalid binary records.
+
+        Given records of floating discs, wrong disc counts, overlapping
+        discs, a wrong length, or a board too large for a record
+        When they are decoded
+        Then ValueError should be raised
+        """
+        half = 7 * 7
+        for key in [0b10, 1 << half, 0b11, 1 | 1 << half]:
+            with self.assertRaises(ValueError):
+                self.board_class.from_bytes(key.to_bytes(16, "big"))
+        with self.assertRaises(ValueError):
+            self.board_class.from_bytes(b"\0" * 8)
+        with self.assertRaises(ValueError):
+            self.board_class.from_bytes(b"\0" * 16, rows=8, cols=9)
+        with self.assertRaises(ValueError):
+            self.board_class(rows=8, cols=9).to_bytes()
+
+    def test_from_key_player_to_move(self):
+        """Test boards created from a position key.
+
+        Given the key of a position
+        When a board is created from it, with and without a player to move
+        Then it should hold the position, without history
+        And a player to move contradicting the disc counts should raise
+        ValueError
+        """
+        board = self.board_class.from_moves("334")
+        rebuilt = self.board_class.from_key(board.get_key())
+        self.assertEqual(rebuilt.grid_, board.grid_)
+        self.assertEqual(rebuilt.get_current_player(), 2)
+        self.assertFalse(rebuilt.undo_move())
+        even = self.board_class.from_moves("33").get_key()
+        self.assertEqual(self.board_class.from_key(
+            even, current_player=2).get_current_player(), 2)
+        with self.assertRaises(ValueError):
+            self.board_class.from_key(board.get_key(), current_player=1)
+        with self.assertRaises(ValueError):
+            self.board_class.from_key(-1)
+
+    def test_from_board_without_history(self):
+        """Test converting boards with a truncated or no history.
+
+        Given a decoded board and a clone keeping two moves
+        When they are converted with from_board
+        Then the new boards should hold the same positions
+        And only the known moves should be undoable
+        """
+        decoded = Board.from_bytes(
+            Board.from_moves("000000111111").to_bytes())
+        converted = self.board_class.from_board(decoded)
+        self.assertEqual(converted.get_key(), decoded.get_key())
+        self.assertEqual(converted.get_legal_moves(), [2, 3, 4, 5, 6])
+        self.assertFalse(converted.undo_move())
+        won = Board.from_moves("0101010").clone(history_limit=2)
+        converted = self.board_class.from_board(won)
+        self.assertEqual(converted.get_winner(), 1)
+        self.assertEqual(converted.get_current_player(), 2)
+        self.assertTrue(converted.undo_move())
+        self.assertEqual(converted.get_winner(), 0)
+        self.assertTrue(converted.undo_move())
+        self.assertFalse(converted.undo_move())
+        self.assertEqual(converted.ply_, 5)
+
+    def test_canonical_key_mirror(self):
+        """Test the canonical key of mirrored positions.
+
+        Given a position and its mirror image
+        When their keys are compared
+        Then the mirrored key of one should be the key of the other
+        And both should share the canonical key
+        """
+        board = self.board_class.from_moves("0126")
+        mirror = self.board_class.from_moves("6540")
+        self.assertNotEqual(board.get_key(), mirror.get_key())
+        self.assertEqual(board.get_mirrored_key(), mirror.get_key())
+        self.assertEqual(mirror.get_mirrored_key(), board.get_key())
+        self.assertEqual(board.get_canonical_key(),
+                         mirror.get_canonical_key())
+        symmetric = self.board_class.from_moves("33")
+        self.assertEqual(symmetric.get_mirrored_key(), symmetric.get_key())
+
+    def test_symmetric_key(self):
+        """Test the reflection reported with the canonical key.
+
+        Given a position, its mirror image and a symmetric position
+        When get_symmetric_key is called
+        Then exactly one of the mirror pair should be reflected
+        And moves should map back by mirror_move
+        """
+        board = self.board_class.from_moves("0")
+        mirror = self.board_class.from_moves("6")
+        self.assertEqual(board.get_symmetric_key(), (board.get_key(), False))
+        self.assertEqual(mirror.get_symmetric_key(), (board.get_key(), True))
+        self.assertEqual(mirror.mirror_move(1), 5)
+        self.assertEqual(mirror.mirror_move(3), 3)
+        self.assertFalse(board.is_symmetric())
+        self.assertTrue(self.board.is_symmetric())
+        self.assertEqual(self.board.get_symmetric_key(), (0, False))
+
+    def test_bulk_encode_decode(self):
+        """Test encoding lists of positions.
+
+        Given several boards
+        When they are encoded together and decoded again
+        Then the keys should be restored in order
+        And data of a partial record should raise ValueError
+        """
+        boards = [self.board_class.from_moves(moves)
+                  for moves in ["", "3", "34", "3456"]]
+        data = encode_positions(boards)
+        self.assertEqual(len(data), 4 * POSITION_BYTES)
+        decoded = decode_positions(data, board_class=self.board_class)
+        self.assertEqual([board.get_key() for board in decoded],
+                         [board.get_key() for board in boards])
+        self.assertTrue(all(isinstance(board, self.board_class)
+                            for board in decoded))
+        with self.assertRaises(ValueError):
+            decode_positions(data[:-1])
+
+
+class TestBitBoard(TestBoard):
+    """Unit tests for the BitBoard class, sharing the Board test cases."""
+
+    board_class = BitBoard
+
 
 if __name__ == "__main__":
     unittest.main()  # pragma: no cover
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_lines module is testing the winning-line index of py-four-in-a-row.
+"""
+from modules.lines import LineTable, line_table
+
+
+def test_line_table_standard_board():
+    """Test the winning lines of the standard board.
+
+    Given a 6x7 board
+    When line_table is called
+    Then it should hold the 69 lines of four
+    And each cell should be indexed by the lines through it
+    """
+    table = line_table(6, 7)
+    assert len(table) == 69
+    assert len(set(table.lines_)) == 69
+    assert all(len(line) == 4 for line in table.lines_)
+    # Bottom left corner: one horizontal, one vertical, one diagonal
+    assert len(table.cell_lines_[0]) == 3
+    # Center cells are part of the most lines
+    assert max(len(indices) for indices in table.cell_lines_) == 13
+    for cell, indices in enumerate(table.cell_lines_):
+        assert all(cell in table.lines_[index] for index in indices)
+
+
+def test_line_table_is_cached_per_size():
+    """Test the line index is built once per board size.
+
+    Given two calls with the same size and one with another connect
+    When line_table is called
+    Then the same size should share one table
+    """
+    assert line_table(6, 7) is line_table(6, 7, 4)
+    assert line_table(6, 7, 5) is not line_table(6, 7)
+
+
+def test_line_table_connect_five():
+    """Test the winning lines of a connect-5 variant.
+
+    Given an 8x9 board with connect 5
+    When a LineTable is built
+    Then it should count the horizontal, vertical and diagonal lines
+    """
+    table = LineTable(8, 9, 5)
+    horizontal = 8 * (9 - 4)
+    vertical = 9 * (8 - 4)
+    diagonal = 2 * (8 - 4) * (9 - 4)
+    assert len(table) == horizontal + vertical + diagonal
+    assert all(len(line) == 5 for line in table.lines_)
+
+
+def test_line_table_grid_coordinates():
+    """Test the grid coordinates of the lines.
+
+    Given the 6x7 line index
+    When looking up the lines through a grid cell
+    Then they should pass through that cell, row 0 being the top row
+    """
+    table = line_table(6, 7)
+    # The bottom row is row 5, the bottom left cell is cell 0
+    assert table.coords_[table.cell_lines_[0][0]][0] == (5, 0)
+    for row in range(6):
+        for col in range(7):
+            lines = table.grid_lines_[row][col]
+            assert lines
+            assert all((row, col) in line for line in lines)
+
+
+def test_line_table_bitboard_shifts():
+    """Test the bitboard shifts of the line index.
+
+    Given the 6x7 line index and a connect-5 one
+    When looking up the shifts per direction
+    Then each should double the run length, the last one completing it
+    And the top bits should be the sentinel bits above the columns
+    """
+    # Columns take 7 bits: vertical, horizontal and both diagonals
+    assert line_table(6, 7).shift_steps_ == \
+        ((1, 2), (7, 14), (8, 16), (6, 12))
+    assert line_table(6, 7, 5).shift_steps_[0] == (1, 2, 1)
+    assert line_table(6, 7, 3).shift_steps_[1] == (7, 7)
+    assert line_table(6, 7).top_bits_ == (6, 13, 20, 27, 34, 41, 48)
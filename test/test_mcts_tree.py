@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_mcts_tree module is testing the array-backed MCTS tree store.
+"""
+from engines.mcts_tree import NO_NODE, TreeStore
+
+
+def test_tree_store_links_children_in_order():
+    """Test adding nodes to the store.
+
+    Given a store with a root
+    When children are added
+    Then they should be listed in order of expansion
+    And their moves should no longer be untried at the parent
+    """
+    tree = TreeStore(capacity=2)
+    root = tree.add_node(NO_NODE, -1, [0, 2, 3])
+    assert tree.untried_moves(root) == [0, 2, 3]
+    first = tree.add_node(root, 3, [0, 1])
+    second = tree.add_node(root, 0, [])
+    grandchild = tree.add_node(first, 1, [0])
+    assert tree.children(root) == [first, second]
+    assert tree.children(first) == [grandchild]
+    assert tree.untried_moves(root) == [2]
+    assert tree.untried_moves(first) == [0]
+    assert tree.parent_[grandchild] == first
+    assert tree.move_[second] == 0
+    assert len(tree) == 4
+
+
+def test_tree_store_grows():
+    """Test the buffers grow beyond the preallocated capacity.
+
+    Given a store with capacity 1
+    When 100 nodes are added
+    Then all nodes should be stored and the capacity doubled as needed
+    """
+    tree = TreeStore(capacity=1)
+    root = tree.add_node(NO_NODE, -1, list(range(7)))
+    for index in range(1, 100):
+        tree.add_node((index - 1) // 7, (index - 1) % 7, list(range(7)))
+    assert len(tree) == 100
+    assert tree.capacity_ == 128
+    assert len(tree.children(root)) == 7
+    assert tree.nbytes() == 128 * (4 + 8 + 4 + 1 + 4 + 4 + 8 + 1)
+
+
+def test_tree_store_update_and_select():
+    """Test statistics and UCT selection.
+
+    Given a root with two visited children
+    When select_child is called
+    Then the child with the higher UCT value should be selected
+    """
+    tree = TreeStore()
+    root = tree.add_node(NO_NODE, -1, [0, 1])
+    weak = tree.add_node(root, 0, [])
+    strong = tree.add_node(root, 1, [])
+    for _ in range(10):
+        tree.update(root, 0)
+        tree.update(weak, 0)
+        tree.update(strong, 1)
+    assert tree.visits_[root] == 10
+    assert tree.wins_[strong] == 10
+    assert tree.select_child(root) == strong
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_opening_book module is testing the opening book builder and reader.
+"""
+import pytest
+from modules.bitboard import BitBoard
+from modules.board import Board
+from modules.opening_book import (HEADER, RECORD, OpeningBook, build_book,
+                                  main, opening_positions, write_book)
+
+
+def test_opening_positions_are_unique():
+    """Test the book positions are listed once per position.
+
+    Given the standard board
+    When the positions up to 2 plies are listed
+    Then transpositions and mirror images should be merged and decided
+    positions skipped
+    """
+    positions = opening_positions(2)
+    assert positions[0] == []
+    # 4 of 7 first moves are unique up to mirroring, 25 of 49 replies
+    assert len(positions) == 1 + 4 + 25
+    keys = set()
+    for moves in positions:
+        board = BitBoard()
+        for move in moves:
+            board.play_move(move)
+        keys.add(board.get_canonical_key())
+    assert len(keys) == len(positions)
+    # After 3 plies, (0, 1, 2) and (2, 1, 0) reach the same position
+    assert len(opening_positions(3)) < 1 + 4 + 25 + 7 * 25
+
+
+def test_write_and_lookup(tmp_path):
+    """Test book entries are found by binary search.
+
+    Given a book written from unsorted entries, the last move played as
+    the book move
+    When positions and their mirror images are looked up
+    Then stored positions should return their move and score
+    And mirror images should return the mirrored move
+    And other positions or board sizes should return None
+    """
+    entries = [(0, 0, 0)]
+    for moves in opening_positions(2)[1:]:
+        board = Board.from_moves(moves)
+        key, mirrored = board.get_symmetric_key()
+        entries.append((key, board.mirror_move(moves[-1]) if mirrored
+                        else moves[-1], -len(moves)))
+    path = tmp_path / "book.bin"
+    write_book(path, list(reversed(entries)))
+    assert path.stat().st_size == HEADER.size + len(entries) * RECORD.size
+    with OpeningBook(path) as book:
+        assert len(book) == len(entries)
+        assert book.lookup(Board()) == (0, 0)
+        for moves in [[4], [2], [4, 2], [2, 4], [6, 0], [3, 3]]:
+            assert book.lookup(Board.from_moves(moves)) == \
+                (moves[-1], -len(moves))
+        assert book.lookup(Board.from_moves([4, 2, 2])) is None
+        assert book.lookup(Board(rows=5)) is None
+
+
+def test_build_book_and_main(tmp_path, capsys):
+    """Test building a book with the solver.
+
+    Given a 4x5 board
+    When a book of 1 ply is built from the command line
+    Then each position up to mirroring should be written once
+    And each position should have a legal book move
+    """
+    path = tmp_path / "book.bin"
+    assert main(["--output", str(path), "--plies", "1", "--rows", "4",
+                 "--cols", "5", "--time-limit-ms", "20",
+                 "--workers", "1"]) == 0
+    assert "Wrote 4 positions" in capsys.readouterr().out
+    with OpeningBook(path) as book:
+        for moves in [[]] + [[col] for col in range(5)]:
+            board = Board.from_moves(moves, rows=4, cols=5)
+            move, _ = book.lookup(board)
+            assert board.is_legal_move(move)
+        # The mirrored position gets the mirrored move
+        left = book.lookup(Board.from_moves([0], rows=4, cols=5))
+        right = book.lookup(Board.from_moves([4], rows=4, cols=5))
+        assert right == (4 - left[0], left[1])
+
+
+def test_invalid_book(tmp_path):
+    """Test files which are not books are rejected.
+
+    Given a file with a wrong header, and a board too large for the keys
+    When it is opened, or a book is built
+    Then a ValueError should be raised
+    """
+    path = tmp_path / "book.bin"
+    path.write_bytes(b"not a book file")
+    with pytest.raises(ValueError):
+        OpeningBook(path)
+    with pytest.raises(ValueError):
+        build_book(path, 1, rows=9, cols=9)
@@ -103,3 +103,20 @@ def test_game_loop_draw():
     winner, players = game_loop(setup=dummy_setup_players)
     assert winner in [0, 1, 2]
     assert len(players) == 2
+
+
+def test_game_loop_stops_pondering():
+    """Test game_loop stops pondering players at the end of the game.
+
+    Given two pondering AiPlayerUctMcts without a pondering limit
+    When game_loop is called
+    Then no pondering thread should be left running
+    """
+
+    def pondering_setup_players():
+        return [AiPlayerUctMcts(name=name, symbol=symbol, player_id=i,
+                                simulations=20, seed=i, ponder=True,
+                                ponder_simulations=10 ** 9)
+                for i, name, symbol in [(1, "Hal", "X"), (2, "Eve", "O")]]
+    _, players = game_loop(setup=pondering_setup_players)
+    assert all(player.ponder_thread_ is None for player in players)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_rollout_policies module is testing the MCTS rollout policies.
+"""
+import random
+import pytest
+from engines.rollout_policies import (HeuristicRollout, RandomRollout,
+                                      ThreatRollout)
+from modules.bitboard import BitBoard
+from modules.board import Board
+
+POLICIES = [RandomRollout(), HeuristicRollout(), ThreatRollout()]
+
+
+def random_positions(board_class, count, seed):
+    """Create undecided positions by seeded random play.
+
+    Args:
+        board_class (type): Board implementation to create.
+        count (int): Number of positions.
+        seed (int): Seed of the random games.
+    Returns:
+        list[Board]: The positions.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = board_class()
+        for _ in range(rng.randrange(0, 30)):
+            board.play_move(rng.choice(board.get_legal_moves()))
+            if board.is_game_over():
+                break
+        if not board.is_game_over():
+            positions.append(board)
+    return positions
+
+
+@pytest.mark.parametrize("policy", POLICIES,
+                         ids=lambda policy: type(policy).__name__)
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_rollout_plays_to_the_end(policy, board_class):
+    """Test each policy plays out games.
+
+    Given a rollout policy and undecided positions
+    When rollout is called
+    Then the game should be over after the returned number of moves
+    """
+    rng = random.Random(3)
+    for board in random_positions(board_class, 10, seed=5):
+        plies_before = board.ply_
+        plies = policy.rollout(board, rng)
+        assert board.is_game_over()
+        assert board.ply_ == plies_before + plies
+    assert policy.rollout(board, rng) == 0
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_threat_rollout_matches_heuristic_rollout(board_class):
+    """Test ThreatRollout selects the same moves as HeuristicRollout.
+
+    Given undecided positions
+    When both policies play out each position with the same seed
+    Then both games should be identical
+    """
+    for board in random_positions(board_class, 100, seed=11):
+        copy = board.clone()
+        HeuristicRollout().rollout(board, random.Random(board.ply_))
+        ThreatRollout().rollout(copy, random.Random(copy.ply_))
+        assert copy.history_ == board.history_
+
+
+def test_threat_rollout_matches_heuristic_rollout_connect_five():
+    """Test ThreatRollout follows the connect length of the board.
+
+    Given undecided positions of a connect-5 variant
+    When both policies play out each position with the same seed
+    Then both games should be identical
+    """
+    rng = random.Random(13)
+    for _ in range(30):
+        board = BitBoard(rows=8, cols=9, connect=5)
+        for _ in range(rng.randrange(0, 30)):
+            board.play_move(rng.choice(board.get_legal_moves()))
+            if board.is_game_over():
+                break
+        if board.is_game_over():
+            continue
+        copy = board.clone()
+        HeuristicRollout().rollout(board, random.Random(board.ply_))
+        ThreatRollout().rollout(copy, random.Random(copy.ply_))
+        assert copy.history_ == board.history_
+
+
+def test_heuristic_select_move_restores_state():
+    """Test the rollout move selection leaves the state unchanged.
+
+    Given a game state with an immediate threat for the opponent
+    When select_move is called
+    Then it should return the blocking move
+    And the state should hold the same position as before
+    """
+    board: Board = Board()
+    for move in [0, 6, 1, 6, 2]:
+        board.play_move(move)
+    grid = [row[:] for row in board.grid_]
+    move = HeuristicRollout.select_move(
+        board, board.get_legal_moves(), board.get_current_player())
+    assert move == 3
+    assert board.grid_ == grid
+    assert len(board.history_) == 5
+
+
+def test_threat_rollout_wins_and_blocks():
+    """Test ThreatRollout wins first, and blocks otherwise.
+
+    Given a position where both players threaten to win
+    When the player to move rolls out
+    Then the first move should be the own win
+    Given a position where only the opponent threatens to win
+    Then the first move should block it
+    """
+    board: Board = Board()
+    for move in [0, 6, 1, 6, 2, 6]:
+        board.play_move(move)
+    ThreatRollout().rollout(board)
+    assert board.history_[6]["col"] == 3
+    assert board.get_winner() == 1
+    board = Board()
+    for move in [0, 6, 1, 6, 2]:
+        board.play_move(move)
+    ThreatRollout().rollout(board, random.Random(1))
+    assert board.history_[5]["col"] == 3
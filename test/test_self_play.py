@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_self_play module is testing the headless self-play runner.
+"""
+import argparse
+import random
+import pytest
+from engines.ai_player_random import AiPlayerRandom
+from engines.ai_player_solver import AiPlayerSolver
+from engines.ai_player_uct_mcts import AiPlayerUctMcts
+from modules.bitboard import BitBoard
+from modules.self_play import (main, make_player, parse_spec, play_game,
+                               run_match)
+
+RANDOM = (AiPlayerRandom, {})
+MCTS = (AiPlayerUctMcts, {"simulations": 200})
+
+
+class UnseededPlayer(AiPlayerRandom):
+    """Player not accepting a seed."""
+
+    def __init__(self, name="Unseeded", symbol="X", player_id=1):
+        super().__init__(name, symbol, player_id=player_id)
+
+
+class IllegalPlayer(AiPlayerRandom):
+    """Player always returning an illegal move."""
+
+    def get_move(self, board) -> int:
+        return -1
+
+
+def test_make_player_seeds_players_accepting_a_seed():
+    """Test players are created from specs.
+
+    Given a spec of a player accepting a seed and one that does not
+    When make_player is called with a seed
+    Then the seed should only be passed where it is accepted
+    """
+    mcts = make_player((AiPlayerUctMcts, {"simulations": 5}), 2, seed=9)
+    assert mcts.player_id_ == 2
+    assert mcts.symbol_ == "O"
+    assert mcts.simulations_ == 5
+    assert make_player((UnseededPlayer, {}), 1, seed=9).player_id_ == 1
+
+
+def test_play_game_is_silent(capsys):
+    """Test a headless game.
+
+    Given two random players
+    When play_game is called
+    Then the game should finish with one timing per move
+    """
+    players = [AiPlayerRandom(player_id=1), AiPlayerRandom(player_id=2)]
+    capsys.readouterr()
+    game = play_game(players, BitBoard)
+    assert capsys.readouterr().out == ""
+    assert game["winner"] in [0, 1, 2]
+    assert not game["forfeit"]
+    assert sum(len(times) for times in game["move_times"]) == game["length"]
+
+
+def test_play_game_illegal_move_forfeits():
+    """Test an illegal move loses the game.
+
+    Given a player returning illegal moves
+    When play_game is called
+    Then the opponent should win by forfeit
+    """
+    players = [IllegalPlayer(player_id=1), AiPlayerRandom(player_id=2)]
+    game = play_game(players)
+    assert game == {"winner": 2, "length": 0, "forfeit": True,
+                    "move_times": [game["move_times"][0], []]}
+
+
+def test_run_match_serial_is_silent_and_reproducible(capsys):
+    """Test a match played in this process.
+
+    Given two random player specs and a seed
+    When run_match is called twice with one worker
+    Then both matches should give the same results without output
+    And the global random state should be unchanged
+    """
+    state = random.getstate()
+    results = run_match(RANDOM, RANDOM, games=6, workers=1, seed=5)
+    assert capsys.readouterr().out == ""
+    assert random.getstate() == state
+    again = run_match(RANDOM, RANDOM, games=6, workers=1, seed=5)
+    assert results["lengths"] == again["lengths"]
+    assert results["games"] == 6
+    assert results["a_wins"] + results["draws"] + results["a_losses"] == 6
+    assert len(results["lengths"]) == 6
+
+
+def test_run_match_process_pool():
+    """Test a match spread over worker processes.
+
+    Given an MCTS spec against a random spec
+    When run_match is called with two workers
+    Then the MCTS player should not lose
+    """
+    results = run_match(MCTS, RANDOM, games=4, workers=2, seed=1)
+    assert results["games"] == 4
+    assert results["a_wins"] >= 3
+    assert results["mean_move_time_a"] > results["mean_move_time_b"]
+
+
+def test_parse_spec():
+    """Test parsing of command line player specs.
+
+    Given engine specs with and without a budget
+    When parse_spec is called
+    Then it should return the player class and kwargs
+    """
+    assert parse_spec("random") == (AiPlayerRandom, {})
+    assert parse_spec("mcts:50") == (AiPlayerUctMcts, {"simulations": 50})
+    assert parse_spec("solver:200") == (AiPlayerSolver,
+                                        {"time_limit_ms": 200})
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_spec("alphazero")
+
+
+def test_main_prints_summary(capsys):
+    """Test the command line entry point.
+
+    Given a short match between random players
+    When main is called
+    Then it should print the summary
+    """
+    assert main(["--games", "2", "--workers", "1",
+                 "--player-a", "random", "--seed", "1"]) == 0
+    assert "Games: 2" in capsys.readouterr().out
+
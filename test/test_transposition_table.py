@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_transposition_table module is testing the TranspositionTable class
+of py-four-in-a-row.
+"""
+from operator import itemgetter
+import pytest
+from modules.transposition_table import (REPLACE_ALWAYS, REPLACE_PRIORITY,
+                                         TranspositionTable, slot_of)
+
+
+def colliding_keys(capacity, count=2):
+    """Find position keys mapping to the same slot.
+
+    Args:
+        capacity (int): Number of slots of the table.
+        count (int): Number of keys to find.
+    Returns:
+        list[int]: Keys sharing slot 0.
+    """
+    return [key for key in range(1, 1000 * capacity)
+            if slot_of(key, capacity) == 0][:count]
+
+
+def test_store_and_lookup():
+    """Test storing and looking up entries.
+
+    Given an empty table
+    When entries are stored
+    Then they should be found by their key
+    And unknown keys should not be found
+    """
+    table = TranspositionTable(capacity=64)
+    assert table.store(1 << 70, "a")
+    assert table.store(5, "b")
+    assert table.lookup(1 << 70) == "a"
+    assert table.lookup(5) == "b"
+    assert table.lookup(6) is None
+    assert 5 in table
+    assert 6 not in table
+    assert len(table) == 2
+
+
+def test_overwrite_same_key():
+    """Test storing an entry for a key already stored.
+
+    Given a table with an entry
+    When another entry is stored for the same key
+    Then it should overwrite the entry without growing the table
+    """
+    table = TranspositionTable(capacity=8, replacement=REPLACE_PRIORITY,
+                               priority=itemgetter(0))
+    table.store(42, (5, "deep"))
+    assert table.store(42, (1, "shallow"))
+    assert table.lookup(42) == (1, "shallow")
+    assert len(table) == 1
+
+
+def test_replace_always():
+    """Test the always-replace policy.
+
+    Given a table with policy REPLACE_ALWAYS
+    When a key mapping to a taken slot is stored
+    Then the occupant should be evicted
+    """
+    first, second = colliding_keys(16)
+    table = TranspositionTable(capacity=16, replacement=REPLACE_ALWAYS)
+    table.store(first, "first")
+    assert table.store(second, "second")
+    assert table.lookup(first) is None
+    assert table.lookup(second) == "second"
+    assert len(table) == 1
+
+
+def test_replace_priority():
+    """Test the priority replacement policy.
+
+    Given a table with policy REPLACE_PRIORITY
+    When a key mapping to a taken slot is stored
+    Then the occupant should be evicted only by a higher or equal priority
+    """
+    first, second = colliding_keys(16)
+    table = TranspositionTable(capacity=16, replacement=REPLACE_PRIORITY,
+                               priority=itemgetter(0))
+    table.store(first, [10, "first"])
+    assert not table.store(second, [3, "second"])
+    assert table.lookup(first) == [10, "first"]
+    assert table.store(second, [10, "second"])
+    assert table.lookup(second) == [10, "second"]
+
+
+def test_replace_priority_older_generation():
+    """Test entries of an older generation give way.
+
+    Given a table with policy REPLACE_PRIORITY and a stored entry
+    When a new generation is started
+    Then an entry of lower priority should only be accepted if the
+    occupant was not looked up in the new generation
+    """
+    first, second, third = colliding_keys(16, 3)
+    table = TranspositionTable(capacity=16, replacement=REPLACE_PRIORITY,
+                               priority=itemgetter(0))
+    table.store(first, [10, "first"])
+    assert not table.accepts(second, [3, "second"])
+    table.new_generation()
+    assert table.lookup(first) == [10, "first"]
+    assert not table.store(second, [3, "second"])
+    table.new_generation()
+    assert table.accepts(second, [3, "second"])
+    assert table.store(second, [3, "second"])
+    assert table.lookup(first) is None
+    assert not table.store(third, [2, "third"])
+    assert len(table) == 1
+
+
+def test_capacity_bound_and_clear():
+    """Test the table never holds more entries than its capacity.
+
+    Given a small table
+    When many entries are stored
+    Then its size should stay within the capacity
+    And clear should remove all entries
+    """
+    table = TranspositionTable(capacity=32)
+    for key in range(1000):
+        table.store(key << 50, key)
+    assert len(table) <= 32
+    table.clear()
+    assert len(table) == 0
+    assert table.lookup(999 << 50) is None
+
+
+def test_invalid_configuration():
+    """Test invalid table configurations are rejected.
+
+    Given an invalid capacity, policy or missing priority function
+    When TranspositionTable is initialized
+    Then it should raise a ValueError
+    """
+    with pytest.raises(ValueError):
+        TranspositionTable(capacity=0)
+    with pytest.raises(ValueError):
+        TranspositionTable(replacement="random")
+    with pytest.raises(ValueError):
+        TranspositionTable(replacement=REPLACE_PRIORITY)